@@ -16,9 +16,15 @@ def create_app():
          resources={r"/*": {
              "origins": ["http://localhost:3000"],
              "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-             "allow_headers": ["Content-Type", "Authorization"],
+             "allow_headers": [
+                 "Content-Type", "Authorization", "If-None-Match", "If-Match",
+                 "X-Primary-Until"
+             ],
              "supports_credentials": True,
-             "expose_headers": ["Content-Type", "Authorization"],
+             "expose_headers": [
+                 "Content-Type", "Authorization", "ETag", "X-Changes-Cursor",
+                 "X-Primary-Until", "X-Query-Count"
+             ],
              "max_age": 3600
          }})
 
@@ -27,10 +33,37 @@ def create_app():
     app.config["ERROR_404_HELP"] = False
     app.url_map.strict_slashes = False  # Evita redirects por trailing slash
 
+    from src.utils.db_pool import engine_options, init_db_pool
+    from src.utils.read_replicas import init_read_replicas
+
+    # Un SQLALCHEMY_ENGINE_OPTIONS explícito en la config tiene prioridad
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    init_read_replicas(app)
     db.init_app(app)
+    init_db_pool(app)
     Migrate(app, db)
     JWTManager(app)
 
+    from src.utils.card_boards import init_card_board_sync
+    from src.utils.board_versions import init_board_versions
+    from src.utils.board_cache import init_board_cache
+    from src.utils.change_tracking import init_change_tracking
+    from src.utils.permissions import init_permission_cache
+    from src.utils.soft_delete import init_soft_delete
+    from src.utils.metrics import init_metrics
+    from src.utils.query_budget import init_query_debug
+    from src.cli import register_commands
+
+    init_card_board_sync()
+    init_board_versions()
+    init_board_cache(app)
+    init_change_tracking()
+    init_permission_cache(app)
+    init_soft_delete()
+    init_metrics(app)
+    init_query_debug(app)
+    register_commands(app)
+
     # Inicializar API con documentación Swagger
     api = Api(
         app,
@@ -54,17 +87,21 @@ def create_app():
     from src.routes.boards import boards_ns
     from src.routes.lists import lists_ns
     from src.routes.cards import cards_ns
+    from src.routes.deletions import deletions_ns
+    from src.routes.clones import clones_ns
 
     api.add_namespace(auth_ns, path="/auth")
     api.add_namespace(boards_ns, path="/boards")
     api.add_namespace(lists_ns, path="/lists")
     api.add_namespace(cards_ns, path="/cards")
+    api.add_namespace(deletions_ns, path="/deletions")
+    api.add_namespace(clones_ns, path="/clones")
 
     # Manejar explícitamente las peticiones OPTIONS (preflight)
     @app.after_request
     def after_request(response):
         response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,If-None-Match,If-Match,X-Primary-Until')
         response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS,PATCH')
         response.headers.add('Access-Control-Allow-Credentials', 'true')
         return response
@@ -81,4 +118,10 @@ app = create_app()
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5001)
+    # Servidor de desarrollo; en producción usar gunicorn (gunicorn.conf.py)
+    from src.utils.position_integrity import check_position_constraint
+
+    check_position_constraint(app)
+    app.run(
+        debug=app.config["FLASK_ENV"] == "development", host="0.0.0.0", port=5001
+    )
@@ -4,9 +4,86 @@ from datetime import timedelta
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///default.db")
+
+    # Pool de conexiones por proceso (solo Postgres, ver src/utils/db_pool.py).
+    # Con gunicorn gthread, DB_POOL_SIZE no debería ser menor que GUNICORN_THREADS
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Timeouts del servidor en milisegundos (0 los desactiva)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(
+        os.getenv("DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", "60000")
+    )
+
+    # Réplicas de lectura (URLs separadas por coma, ver src/db.py) y segundos que
+    # un cliente sigue leyendo del primario después de escribir
+    SQLALCHEMY_REPLICA_URIS = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+    # "session": conexión directa o PgBouncer en modo session.
+    # "transaction": PgBouncer en modo transaction (timeouts con SET LOCAL y sin
+    # prepared statements)
+    DB_POOLING_MODE = os.getenv("DB_POOLING_MODE", "session")
     SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
     FLASK_ENV = os.getenv("FLASK_ENV", "production")
 
+    # "dense": position se mantiene 0..n-1 renumerando hermanos en cada cambio.
+    # "rank": el orden lo define solo rank y cada movimiento escribe una sola fila.
+    # En Postgres, la migración e5b2c8a41f07 agrega UNIQUE (list_id, position),
+    # que solo vale en modo dense: para usar "rank" hay que borrar esa restricción
+    # (la app no arranca en modo rank si existe; ver check_position_constraint).
+    POSITION_MODE = os.getenv("POSITION_MODE", "dense")
+
+    # Reintentos de los cambios de orden que chocan con otro request concurrente
+    # (espera inicial en segundos; se duplica en cada intento hasta el máximo)
+    POSITION_RETRY_ATTEMPTS = int(os.getenv("POSITION_RETRY_ATTEMPTS", "5"))
+    POSITION_RETRY_BACKOFF = float(os.getenv("POSITION_RETRY_BACKOFF", "0.02"))
+    POSITION_RETRY_MAX_BACKOFF = float(os.getenv("POSITION_RETRY_MAX_BACKOFF", "0.5"))
+
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default-jwt-secret-key")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+
+    # Métricas Prometheus en GET /metrics. Con varios workers de gunicorn,
+    # definir también PROMETHEUS_MULTIPROC_DIR (ver gunicorn.conf.py). La ruta
+    # queda en el puerto público de la API: con METRICS_TOKEN solo responde a
+    # "Authorization: Bearer <token>"
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Solo desarrollo: header X-Query-Count y warning en el log cuando una misma
+    # sentencia se repite QUERY_REPEAT_THRESHOLD veces en un request (N+1)
+    QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() == "true"
+    QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+    # Cache en proceso de boards serializados (0 entradas lo desactiva)
+    BOARD_CACHE_MAX_ENTRIES = int(os.getenv("BOARD_CACHE_MAX_ENTRIES", "256"))
+    BOARD_CACHE_MAX_BYTES = int(os.getenv("BOARD_CACHE_MAX_BYTES", "67108864"))
+    BOARD_CACHE_TTL = int(os.getenv("BOARD_CACHE_TTL", "300"))
+
+    # Horas que se conservan los cambios de /boards/<id>/changes
+    BOARD_CHANGES_RETENTION_HOURS = int(
+        os.getenv("BOARD_CHANGES_RETENTION_HOURS", "72")
+    )
+
+    # Segundos que se cachean los permisos por (usuario, board) (0 lo desactiva)
+    PERMISSION_CACHE_TTL = int(os.getenv("PERMISSION_CACHE_TTL", "30"))
+
+    # Hilos del proceso para trabajos en segundo plano (borrados y clonados).
+    # Con 0 los borrados esperan a `flask deletions run` y los clonados corren
+    # dentro del request
+    BACKGROUND_WORKER_THREADS = int(os.getenv("BACKGROUND_WORKER_THREADS", "1"))
+
+    # Filas por transacción al purgar boards y listas eliminados
+    DELETION_BATCH_SIZE = int(os.getenv("DELETION_BATCH_SIZE", "1000"))
+
+    # Tarjetas a partir de las cuales un clonado corre en segundo plano
+    CLONE_SYNC_MAX_CARDS = int(os.getenv("CLONE_SYNC_MAX_CARDS", "2000"))
@@ -0,0 +1,92 @@
+"""
+Configuración de gunicorn para servir la API en producción.
+
+Uso (desde backend/):
+    gunicorn -c gunicorn.conf.py
+
+Todo se ajusta con variables de entorno GUNICORN_*. Con GUNICORN_THREADS > 1
+se usa el worker gthread (varios requests por proceso); con 1, el worker sync
+(un request por proceso). Ver la sección "Servidor de producción" del README.
+"""
+
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _reset_metrics_directory():
+    """
+    Vacía PROMETHEUS_MULTIPROC_DIR (métricas de una ejecución anterior). Corre
+    al leer esta configuración, antes de que preload_app importe la app y
+    prometheus_client cree sus archivos.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+
+_reset_metrics_directory()
+
+
+wsgi_app = "app:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5001")
+
+workers = _env_int("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int("GUNICORN_THREADS", 1)
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Conexiones HTTP keep-alive (solo gthread; sync cierra cada conexión)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# Reciclar cada worker tras max_requests (± jitter para no reiniciarlos juntos)
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# Un request colgado más de timeout segundos reinicia el worker. Al apagar
+# (SIGTERM) se dejan de aceptar conexiones y se esperan hasta graceful_timeout
+# segundos los requests en curso
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# Crear la app en el maestro: los workers la comparten copy-on-write
+preload_app = True
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    """En el maestro, con la app ya cargada y antes de crear los workers."""
+    from app import app
+    from src.utils.warmup import prepare_for_fork
+
+    prepare_for_fork(app)
+
+
+def post_worker_init(worker):
+    """En cada worker, antes de aceptar requests."""
+    from app import app
+    from src.utils.warmup import warm_up_worker
+
+    warm_up_worker(app, worker.cfg.threads)
+
+
+def child_exit(server, worker):
+    """En el maestro, cuando termina un worker: sus gauges dejan de sumarse."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    """En cada worker al apagarse, después de terminar sus requests."""
+    from src.utils.background import shutdown_background_jobs
+
+    shutdown_background_jobs()
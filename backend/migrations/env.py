@@ -45,6 +45,15 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Restricciones que las migraciones crean solo en algunos motores o modos y que
+# por eso no están en los modelos (ver e5b2c8a41f07)
+UNMANAGED_CONSTRAINTS = {'uq_cards_list_id_position'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == 'unique_constraint' and name in UNMANAGED_CONSTRAINTS)
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -93,6 +102,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
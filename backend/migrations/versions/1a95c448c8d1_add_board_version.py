@@ -0,0 +1,26 @@
+"""Add board version
+
+Revision ID: 1a95c448c8d1
+Revises: ff0f379768aa
+Create Date: 2026-10-17 10:03:18.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a95c448c8d1'
+down_revision = 'ff0f379768aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_column('version')
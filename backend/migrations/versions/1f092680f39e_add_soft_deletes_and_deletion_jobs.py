@@ -0,0 +1,60 @@
+"""Add soft deletes and deletion jobs
+
+Revision ID: 1f092680f39e
+Revises: ed5b3c4529f2
+Create Date: 2026-10-17 04:24:24.037993
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f092680f39e'
+down_revision = 'ed5b3c4529f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('deletion_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('board_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('total_lists', sa.Integer(), nullable=False),
+    sa.Column('deleted_lists', sa.Integer(), nullable=False),
+    sa.Column('total_cards', sa.Integer(), nullable=False),
+    sa.Column('deleted_cards', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('deletion_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_deletion_jobs_status', ['status'], unique=False)
+
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_lists_deleted_at', ['deleted_at'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'), sqlite_where=sa.text('deleted_at IS NOT NULL'))
+
+
+def downgrade():
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.drop_index('ix_lists_deleted_at')
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('deletion_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_deletion_jobs_status')
+
+    op.drop_table('deletion_jobs')
@@ -0,0 +1,39 @@
+"""Add board changes log
+
+Revision ID: 7c2e9d4b5a10
+Revises: 1a95c448c8d1
+Create Date: 2026-10-17 11:42:07.518334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9d4b5a10'
+down_revision = '1a95c448c8d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('board_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('board_id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('board_changes', schema=None) as batch_op:
+        batch_op.create_index('ix_board_changes_board_id_id', ['board_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_board_changes_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('board_changes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_board_changes_created_at'))
+        batch_op.drop_index('ix_board_changes_board_id_id')
+
+    op.drop_table('board_changes')
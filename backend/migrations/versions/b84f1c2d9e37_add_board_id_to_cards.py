@@ -0,0 +1,123 @@
+"""Add denormalized board_id to cards
+
+Revision ID: b84f1c2d9e37
+Revises: 7c2e9d4b5a10
+Create Date: 2026-10-17 13:05:51.204716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b84f1c2d9e37'
+down_revision = '7c2e9d4b5a10'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill_card_board_ids():
+    """
+    Copia lists.board_id a cards.board_id por rangos de id. En Postgres cada lote
+    se confirma por separado para no mantener bloqueada la tabla cards.
+    """
+    bind = op.get_bind()
+    cards = sa.table(
+        'cards',
+        sa.column('id', sa.Integer),
+        sa.column('list_id', sa.Integer),
+        sa.column('board_id', sa.Integer),
+    )
+    lists = sa.table(
+        'lists', sa.column('id', sa.Integer), sa.column('board_id', sa.Integer)
+    )
+    list_board = (
+        sa.select(lists.c.board_id)
+        .where(lists.c.id == cards.c.list_id)
+        .scalar_subquery()
+    )
+
+    max_id = bind.execute(sa.select(sa.func.max(cards.c.id))).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+        statement = (
+            cards.update()
+            .where(
+                cards.c.id >= start,
+                cards.c.id < start + BACKFILL_BATCH_SIZE,
+                cards.c.board_id.is_(None),
+            )
+            .values(board_id=list_board)
+        )
+        if bind.dialect.name == 'postgresql':
+            with op.get_context().autocommit_block():
+                bind.execute(statement)
+        else:
+            bind.execute(statement)
+
+
+def upgrade_postgresql():
+    """
+    En Postgres ningún paso recorre cards con la tabla bloqueada: la FK y el
+    NOT NULL se agregan como constraints NOT VALID (solo controlan filas
+    nuevas) y se validan después, con un lock que permite escrituras.
+    SET NOT NULL aprovecha el CHECK ya validado y no vuelve a recorrer la
+    tabla. El índice se construye con CREATE INDEX CONCURRENTLY. Cada paso se
+    confirma por separado para no retener el lock de ADD COLUMN.
+    """
+    with op.get_context().autocommit_block():
+        op.add_column('cards', sa.Column('board_id', sa.Integer(), nullable=True))
+        op.execute(
+            'ALTER TABLE cards ADD CONSTRAINT fk_cards_board_id_boards '
+            'FOREIGN KEY (board_id) REFERENCES boards (id) NOT VALID'
+        )
+
+    backfill_card_board_ids()
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            'ALTER TABLE cards ADD CONSTRAINT ck_cards_board_id_not_null '
+            'CHECK (board_id IS NOT NULL) NOT VALID'
+        )
+        op.execute('ALTER TABLE cards VALIDATE CONSTRAINT ck_cards_board_id_not_null')
+        op.execute('ALTER TABLE cards ALTER COLUMN board_id SET NOT NULL')
+        op.execute('ALTER TABLE cards DROP CONSTRAINT ck_cards_board_id_not_null')
+        op.execute('ALTER TABLE cards VALIDATE CONSTRAINT fk_cards_board_id_boards')
+        op.create_index(
+            'ix_cards_board_id_rank', 'cards', ['board_id', 'rank'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        upgrade_postgresql()
+        return
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('board_id', sa.Integer(), nullable=True))
+
+    backfill_card_board_ids()
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.alter_column('board_id',
+               existing_type=sa.Integer(),
+               nullable=False)
+        batch_op.create_index('ix_cards_board_id_rank', ['board_id', 'rank'], unique=False)
+        batch_op.create_foreign_key('fk_cards_board_id_boards', 'boards', ['board_id'], ['id'])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_cards_board_id_rank', table_name='cards',
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_cards_board_id_boards', type_='foreignkey')
+        if op.get_bind().dialect.name != 'postgresql':
+            batch_op.drop_index('ix_cards_board_id_rank')
+        batch_op.drop_column('board_id')
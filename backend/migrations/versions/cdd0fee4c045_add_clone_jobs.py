@@ -0,0 +1,47 @@
+"""Add clone jobs
+
+Revision ID: cdd0fee4c045
+Revises: 1f092680f39e
+Create Date: 2026-10-17 04:30:02.163842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cdd0fee4c045'
+down_revision = '1f092680f39e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('clone_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=16), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.Column('board_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by', sa.Integer(), nullable=False),
+    sa.Column('include_archived', sa.Boolean(), nullable=False),
+    sa.Column('include_descriptions', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('copied_lists', sa.Integer(), nullable=False),
+    sa.Column('copied_cards', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('clone_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_clone_jobs_status', ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('clone_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_clone_jobs_status')
+
+    op.drop_table('clone_jobs')
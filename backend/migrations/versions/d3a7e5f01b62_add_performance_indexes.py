@@ -0,0 +1,63 @@
+"""Add performance indexes
+
+Revision ID: d3a7e5f01b62
+Revises: b84f1c2d9e37
+Create Date: 2026-10-17 14:21:36.870142
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7e5f01b62'
+down_revision = 'b84f1c2d9e37'
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas, condición del índice parcial)
+INDEXES = [
+    ('ix_boards_owner_id', 'boards', ['owner_id'], None),
+    ('ix_board_members_user_id_board_id', 'board_members', ['user_id', 'board_id'], None),
+    ('ix_lists_board_id_position', 'lists', ['board_id', 'position'], None),
+    ('ix_cards_list_id_position', 'cards', ['list_id', 'position'], None),
+    ('ix_cards_active_board_id_due_date', 'cards', ['board_id', 'due_date'], 'archived'),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción y
+        # no bloquea las escrituras mientras se construye el índice
+        with op.get_context().autocommit_block():
+            for name, table, columns, partial in INDEXES:
+                op.create_index(
+                    name, table, columns, unique=False,
+                    postgresql_concurrently=True,
+                    postgresql_where=sa.text('NOT archived') if partial else None,
+                    if_not_exists=True,
+                )
+        return
+
+    for name, table, columns, partial in INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(
+                name, columns, unique=False,
+                sqlite_where=sa.text('archived = 0') if partial else None,
+            )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, columns, partial in reversed(INDEXES):
+                op.drop_index(
+                    name, table_name=table, postgresql_concurrently=True, if_exists=True
+                )
+        return
+
+    for name, table, columns, partial in reversed(INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
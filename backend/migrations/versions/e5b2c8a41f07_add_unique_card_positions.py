@@ -0,0 +1,50 @@
+"""Add deferrable unique constraint on card positions
+
+Revision ID: e5b2c8a41f07
+Revises: d3a7e5f01b62
+Create Date: 2026-10-17 18:02:11.415930
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c8a41f07'
+down_revision = 'd3a7e5f01b62'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT = 'uq_cards_list_id_position'
+
+
+def upgrade():
+    # Solo Postgres soporta UNIQUE diferible (los corrimientos de posición
+    # duplican valores dentro del UPDATE). El modo rank no mantiene posiciones
+    # únicas: la app no arranca en ese modo mientras exista la restricción
+    # (ver check_position_constraint en src/utils/position_integrity.py)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Dejar las posiciones densas según rank antes de exigir unicidad
+    op.execute(
+        """
+        UPDATE cards SET position = ordered.new_position
+        FROM (
+            SELECT id,
+                   row_number() OVER (PARTITION BY list_id ORDER BY rank, id) - 1
+                       AS new_position
+            FROM cards
+        ) AS ordered
+        WHERE cards.id = ordered.id AND cards.position <> ordered.new_position
+        """
+    )
+    op.create_unique_constraint(
+        CONSTRAINT, 'cards', ['list_id', 'position'],
+        deferrable=True, initially='DEFERRED',
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f'ALTER TABLE cards DROP CONSTRAINT IF EXISTS {CONSTRAINT}')
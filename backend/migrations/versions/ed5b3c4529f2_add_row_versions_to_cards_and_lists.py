@@ -0,0 +1,32 @@
+"""Add row versions to cards and lists
+
+Revision ID: ed5b3c4529f2
+Revises: e5b2c8a41f07
+Create Date: 2026-10-17 04:18:10.679967
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ed5b3c4529f2'
+down_revision = 'e5b2c8a41f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,78 @@
+"""Add rank ordering keys to cards and lists
+
+Revision ID: ff0f379768aa
+Revises: 3356cc780a77
+Create Date: 2026-10-17 09:12:40.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ff0f379768aa'
+down_revision = '3356cc780a77'
+branch_labels = None
+depends_on = None
+
+
+# Las claves del backfill son 1000001i, 1000002i, ...: mismo largo (el orden de
+# strings es el numérico), sin ceros al final y con lugar antes y después. La
+# migración no usa src.utils.ranks para no cambiar si cambia el código de la app
+RANK_BASE = 1000000
+RANK_SUFFIX = 'i'
+
+
+def backfill_ranks(table_name, parent_column):
+    """
+    Asigna a cada fila una clave según su lugar en el padre por (position, id),
+    con un único UPDATE ... FROM sobre row_number().
+    """
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column(parent_column, sa.Integer),
+        sa.column('position', sa.Integer),
+        sa.column('rank', sa.String),
+    )
+    ordered = sa.select(
+        table.c.id,
+        sa.func.row_number()
+        .over(
+            partition_by=table.c[parent_column],
+            order_by=(table.c.position, table.c.id),
+        )
+        .label('row_number'),
+    ).subquery()
+    rank = sa.cast(RANK_BASE + ordered.c.row_number, sa.String) + RANK_SUFFIX
+    op.execute(table.update().where(table.c.id == ordered.c.id).values(rank=rank))
+
+
+def upgrade():
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rank', sa.String(length=64), nullable=True))
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rank', sa.String(length=64), nullable=True))
+
+    backfill_ranks('lists', 'board_id')
+    backfill_ranks('cards', 'list_id')
+
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.alter_column('rank',
+               existing_type=sa.String(length=64),
+               nullable=False)
+        batch_op.create_index('ix_lists_board_id_rank', ['board_id', 'rank'], unique=False)
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.alter_column('rank',
+               existing_type=sa.String(length=64),
+               nullable=False)
+        batch_op.create_index('ix_cards_list_id_rank', ['list_id', 'rank'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_list_id_rank')
+        batch_op.drop_column('rank')
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.drop_index('ix_lists_board_id_rank')
+        batch_op.drop_column('rank')
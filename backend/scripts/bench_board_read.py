@@ -0,0 +1,117 @@
+"""
+Benchmark del camino de lectura de boards: ORM + to_dict contra Core + filas.
+
+Arma un board con muchas cards y mide latencia y pico de memoria (tracemalloc)
+de serializar todas sus listas y cards con cada camino.
+
+Uso (desde backend/):
+    python scripts/bench_board_read.py
+    python scripts/bench_board_read.py --cards 20000 --lists 20 --runs 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app import create_app  # noqa: E402
+from src.db import db  # noqa: E402
+from src.models import Board, Card, List, User  # noqa: E402
+from src.utils.board_reader import read_board_lists  # noqa: E402
+from src.utils.ranks import spread_ranks  # noqa: E402
+
+
+def seed_board(card_count, list_count):
+    user = User(username="bench", email="bench@example.com")
+    user.set_password("benchmark")
+    board = Board(title="Bench", owner=user)
+    db.session.add_all([user, board])
+    db.session.flush()
+
+    list_ranks = spread_ranks(list_count)
+    lists = [
+        List(title=f"List {i}", board_id=board.id, position=i, rank=list_ranks[i])
+        for i in range(list_count)
+    ]
+    db.session.add_all(lists)
+    db.session.flush()
+
+    per_list = card_count // list_count
+    card_ranks = spread_ranks(per_list)
+    rows = [
+        {
+            "title": f"Card {lst.id}-{i}",
+            "description": "Lorem ipsum dolor sit amet " * 8,
+            "list_id": lst.id,
+            "board_id": board.id,
+            "position": i,
+            "rank": card_ranks[i],
+            "archived": False,
+        }
+        for lst in lists
+        for i in range(per_list)
+    ]
+    db.session.execute(Card.__table__.insert(), rows)
+    db.session.commit()
+    return board.id
+
+
+def orm_path(board_id):
+    lists = (
+        List.query.filter_by(board_id=board_id)
+        .options(selectinload(List.cards))
+        .order_by(List.rank, List.id)
+        .all()
+    )
+    return [lst.to_dict(include_cards=True) for lst in lists]
+
+
+def core_path(board_id):
+    return read_board_lists(board_id)
+
+
+def measure(fn, board_id, runs):
+    timings = []
+    peak = 0
+    for _ in range(runs):
+        db.session.remove()
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(board_id)
+        timings.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=20000)
+    parser.add_argument("--lists", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        board_id = seed_board(args.cards, args.lists)
+
+        db.session.remove()
+        assert orm_path(board_id) == core_path(board_id), "los caminos difieren"
+
+        print(f"{args.cards} cards en {args.lists} listas, mediana de {args.runs}")
+        print(f"{'camino':<16}{'ms':>10}{'pico MiB':>12}")
+        for label, fn in (("ORM + to_dict", orm_path), ("Core + filas", core_path)):
+            elapsed, peak = measure(fn, board_id, args.runs)
+            print(f"{label:<16}{elapsed:>10.1f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark de los helpers de posiciones.
+
+Cuenta las sentencias SQL que emite cada helper de src/utils/position_helpers.py
+sobre listas de distinto tamaño. Con los UPDATE en bloque el número de sentencias
+debe mantenerse constante sin importar cuántas cards tenga la lista.
+
+Uso (desde backend/):
+    python scripts/bench_positions.py
+    DATABASE_URL=postgresql://... python scripts/bench_positions.py 10 1000 10000
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from src.db import db  # noqa: E402
+from src.models import Board, Card, List, User  # noqa: E402
+from src.utils.ranks import spread_ranks  # noqa: E402
+from src.utils.position_helpers import (  # noqa: E402
+    adjust_positions_on_insert,
+    compact_positions_on_delete,
+    reorder_on_move,
+)
+
+DEFAULT_SIZES = [10, 100, 1000, 2000]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def seed_list(size):
+    user = User(username=f"bench{size}", email=f"bench{size}@example.com")
+    user.set_password("benchmark")
+    board = Board(title=f"Bench {size}", owner=user)
+    lst = List(title="Bench", board=board, position=0, rank=spread_ranks(1)[0])
+    db.session.add_all([user, board, lst])
+    db.session.flush()
+    db.session.execute(
+        Card.__table__.insert(),
+        [
+            {
+                "title": f"card {i}",
+                "list_id": lst.id,
+                "board_id": board.id,
+                "position": i,
+                "rank": rank,
+                "archived": False,
+            }
+            for i, rank in enumerate(spread_ranks(size))
+        ],
+    )
+    db.session.commit()
+    return lst
+
+
+def measure(label, size, fn):
+    with StatementCounter(db.engine) as counter:
+        start = time.perf_counter()
+        fn()
+        db.session.commit()
+        elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<28}{size:>8}{counter.count:>12}{elapsed:>12.1f}")
+
+
+def run(sizes):
+    print(f"{'operación':<28}{'cards':>8}{'sentencias':>12}{'ms':>12}")
+    for size in sizes:
+        lst = seed_list(size)
+        list_id = lst.id
+
+        measure(
+            "insert al inicio",
+            size,
+            lambda: adjust_positions_on_insert(Card, "list_id", list_id, 0),
+        )
+        measure(
+            "delete al inicio",
+            size,
+            lambda: compact_positions_on_delete(Card, "list_id", list_id, 0),
+        )
+
+        card = Card.query.filter_by(list_id=list_id).order_by(Card.position).first()
+        last = size - 1
+
+        def move_to_end():
+            reorder_on_move(
+                Card, "list_id", card, list_id, card.position, list_id, last
+            )
+            card.position = last
+
+        measure("mover primera al final", size, move_to_end)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        run(sizes)
@@ -0,0 +1,136 @@
+"""
+Benchmark de throughput contra un servidor en marcha (gunicorn o app.py).
+
+Crea por la API un usuario con un board de prueba y luego varios clientes
+concurrentes piden el mismo endpoint durante unos segundos, cada uno con su
+propia conexión keep-alive. Reporta requests por segundo, latencias (p50, p95 y
+p99) y errores. Sirve para comparar modelos de worker con la misma base.
+
+Uso (desde backend/, con el servidor ya levantado):
+    GUNICORN_WORKERS=4 gunicorn -c gunicorn.conf.py &
+    python scripts/bench_server.py --url http://localhost:5001 --clients 16
+    python scripts/bench_server.py --endpoint lists --seconds 20
+"""
+
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+ENDPOINTS = {
+    "snapshot": "/boards/{board_id}/snapshot",
+    "lists": "/boards/{board_id}/lists",
+    "boards": "/boards/",
+    "health": "/health",
+}
+
+
+class Client:
+    """Conexión HTTP keep-alive con el token del usuario de prueba."""
+
+    def __init__(self, url, token=None):
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port)
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def request(self, method, path, body=None):
+        payload = json.dumps(body) if body is not None else None
+        try:
+            self.connection.request(method, path, payload, self.headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # El worker sync cierra la conexión después de cada respuesta
+            self.connection.close()
+            self.connection.request(method, path, payload, self.headers)
+            response = self.connection.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else None
+
+
+def seed(url, lists, cards):
+    """Registra un usuario y arma un board con lists x cards tarjetas."""
+    name = f"bench{os.getpid()}{int(time.time())}"
+    client = Client(url)
+    credentials = {"email": f"{name}@example.com", "password": "benchmark"}
+    client.request("POST", "/auth/register", {"username": name, **credentials})
+    _, body = client.request("POST", "/auth/login", credentials)
+    token = body["access_token"]
+
+    client = Client(url, token)
+    _, board = client.request("POST", "/boards/", {"title": "Bench"})
+    for i in range(lists):
+        _, lst = client.request(
+            "POST", "/lists/", {"title": f"List {i}", "board_id": board["id"]}
+        )
+        for j in range(cards):
+            client.request(
+                "POST", f"/lists/{lst['id']}/cards", {"title": f"Card {i}-{j}"}
+            )
+    return token, board["id"]
+
+
+def run_client(url, token, path, deadline, latencies, errors):
+    client = Client(url, token)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            status, _ = client.request("GET", path)
+        except (http.client.HTTPException, OSError):
+            status = None
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(status)
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5001")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="snapshot")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--lists", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args()
+
+    token, board_id = seed(args.url, args.lists, args.cards)
+    path = ENDPOINTS[args.endpoint].format(board_id=board_id)
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(args.url, token, path, deadline, latencies, errors),
+        )
+        for _ in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    print(f"GET {path} con {args.clients} clientes durante {args.seconds:g}s")
+    print(f"  Requests/s: {len(latencies) / args.seconds:.1f}")
+    if latencies:
+        print(
+            "  Latencia p50/p95/p99: "
+            + " / ".join(
+                f"{percentile(latencies, q) * 1000:.1f} ms" for q in (0.5, 0.95, 0.99)
+            )
+        )
+    print(f"  Errores: {len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Comprueba comportamientos de la API que ya se rompieron alguna vez.
+
+Cada caso recrea la base en memoria con dos usuarios: "owner" (dueño de los
+boards A y B) y "intruder" (dueño del board X, sin acceso a A ni B). Cada board
+tiene dos listas con una card cada una. El caso llama a la API con el test
+client y falla si el resultado no es el esperado. Sale con código 1 si algún
+caso falla.
+
+Uso (desde backend/):
+    python scripts/check_api_regressions.py
+    POSITION_MODE=rank python scripts/check_api_regressions.py
+"""
+
+import os
+import sys
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ["BACKGROUND_WORKER_THREADS"] = "0"
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from src.db import db  # noqa: E402
+from src.models import Board, Card, List, User  # noqa: E402
+from src.routes import cards as card_routes  # noqa: E402
+from src.utils.board_cache import board_cache  # noqa: E402
+from src.utils.permissions import permission_cache  # noqa: E402
+from src.utils.position_helpers import PositionConflict  # noqa: E402
+from src.utils.ranks import spread_ranks  # noqa: E402
+
+
+def seed():
+    """Crea usuarios, boards, listas y cards; retorna sus ids."""
+    owner = User(username="owner", email="owner@example.com", password_hash="x")
+    intruder = User(
+        username="intruder", email="intruder@example.com", password_hash="x"
+    )
+    db.session.add_all([owner, intruder])
+    db.session.flush()
+
+    ids = {"owner": owner.id, "intruder": intruder.id}
+    ranks = spread_ranks(2)
+    for name, user in (("a", owner), ("b", owner), ("x", intruder)):
+        board = Board(title=f"Board {name}", owner_id=user.id)
+        db.session.add(board)
+        db.session.flush()
+        ids[f"board_{name}"] = board.id
+        for i in range(2):
+            lst = List(
+                title=f"List {name}{i}", board_id=board.id, position=i, rank=ranks[i]
+            )
+            db.session.add(lst)
+            db.session.flush()
+            card = Card(
+                title=f"Card {name}{i}", list_id=lst.id, position=0, rank=ranks[0]
+            )
+            db.session.add(card)
+            db.session.flush()
+            ids[f"list_{name}{i}"] = lst.id
+            ids[f"card_{name}{i}"] = card.id
+    db.session.commit()
+    return ids
+
+
+class Api:
+    """Test client autenticado como alguno de los usuarios del dataset."""
+
+    def __init__(self, client, ids):
+        self.client = client
+        self.ids = ids
+        self.tokens = {
+            user: create_access_token(identity=str(ids[user]))
+            for user in ("owner", "intruder")
+        }
+
+    def call(self, user, method, url, body=None, headers=None):
+        headers = {"Authorization": f"Bearer {self.tokens[user]}", **(headers or {})}
+        return getattr(self.client, method)(
+            url.format(**self.ids), json=body, headers=headers
+        )
+
+
+def expect_status(response, status):
+    assert response.status_code == status, (
+        f"expected {status}, got {response.status_code}: "
+        f"{response.get_data(as_text=True)[:200]}"
+    )
+
+
+# Acceso a boards ajenos: un board_id en la URL o en el cuerpo no puede elegir
+# el permiso de un recurso de otro board, y los destinos también se autorizan
+
+
+def foreign_card_with_own_board_id(api):
+    expect_status(
+        api.call("intruder", "get", "/cards/{card_a0}?board_id={board_x}"), 403
+    )
+    response = api.call(
+        "intruder", "put", "/cards/{card_a0}?board_id={board_x}", {"title": "hacked"}
+    )
+    expect_status(response, 403)
+    assert db.session.get(Card, api.ids["card_a0"]).title == "Card a0"
+
+
+def foreign_list_cards_with_own_board_id(api):
+    expect_status(
+        api.call("intruder", "get", "/lists/{list_a0}/cards?board_id={board_x}"),
+        403,
+    )
+
+
+def own_list_with_other_board_id(api):
+    expect_status(api.call("owner", "get", "/lists/{list_a0}?board_id={board_b}"), 404)
+    expect_status(api.call("owner", "get", "/lists/{list_a0}?board_id={board_a}"), 200)
+
+
+def create_card_in_foreign_list(api):
+    body = {"title": "x", "list_id": api.ids["list_a0"], "board_id": api.ids["board_x"]}
+    expect_status(api.call("intruder", "post", "/cards/", body), 403)
+
+
+def move_card_to_foreign_list(api):
+    body = {"list_id": api.ids["list_a0"], "position": 0}
+    expect_status(api.call("intruder", "put", "/cards/{card_x0}/move", body), 403)
+    expect_status(api.call("intruder", "put", "/cards/{card_x0}", body), 403)
+    assert db.session.get(Card, api.ids["card_x0"]).list_id == api.ids["list_x0"]
+
+
+def move_card_between_own_boards(api):
+    body = {"list_id": api.ids["list_b0"], "position": 0}
+    expect_status(api.call("owner", "put", "/cards/{card_a0}/move", body), 200)
+    body = {"list_id": api.ids["list_b1"]}
+    expect_status(api.call("owner", "put", "/cards/{card_a1}", body), 200)
+
+
+def move_list_to_foreign_board(api):
+    body = {"board_id": api.ids["board_a"], "position": 0}
+    expect_status(api.call("intruder", "put", "/lists/{list_x0}/move", body), 403)
+    expect_status(api.call("intruder", "put", "/lists/{list_x0}", body), 403)
+    assert db.session.get(List, api.ids["list_x0"]).board_id == api.ids["board_x"]
+
+
+def move_foreign_list_to_own_board(api):
+    body = {"board_id": api.ids["board_x"], "position": 0}
+    expect_status(api.call("intruder", "put", "/lists/{list_a0}/move", body), 403)
+    expect_status(api.call("intruder", "put", "/lists/{list_a0}", body), 403)
+    assert db.session.get(List, api.ids["list_a0"]).board_id == api.ids["board_a"]
+
+
+def move_list_between_own_boards(api):
+    body = {"board_id": api.ids["board_b"], "position": 0}
+    expect_status(api.call("owner", "put", "/lists/{list_a0}/move", body), 200)
+    expect_status(api.call("owner", "put", "/lists/{list_a1}", body), 200)
+
+
+def clone_foreign_list(api):
+    body = {"board_id": api.ids["board_x"]}
+    expect_status(api.call("intruder", "post", "/lists/{list_a0}/clone", body), 403)
+    expect_status(api.call("intruder", "post", "/lists/{list_a0}/clone", {}), 403)
+
+
+def clone_list_to_foreign_board(api):
+    body = {"board_id": api.ids["board_a"]}
+    expect_status(api.call("intruder", "post", "/lists/{list_x0}/clone", body), 403)
+
+
+def clone_list_between_own_boards(api):
+    body = {"board_id": api.ids["board_b"]}
+    expect_status(api.call("owner", "post", "/lists/{list_a0}/clone", body), 201)
+
+
+def retry_rechecks_access(api):
+    # Otro request pasa la card a un board ajeno justo antes del reintento
+    lock_positions = card_routes.lock_positions
+
+    def move_away_once(*board_ids, item=None):
+        card_routes.lock_positions = lock_positions
+        cards = Card.__table__
+        db.session.execute(
+            cards.update()
+            .where(cards.c.id == api.ids["card_x0"])
+            .values(list_id=api.ids["list_a0"], board_id=api.ids["board_a"])
+        )
+        db.session.commit()
+        raise PositionConflict("card moved to another board")
+
+    card_routes.lock_positions = move_away_once
+    try:
+        body = {"list_id": api.ids["list_x1"], "position": 0}
+        response = api.call("intruder", "put", "/cards/{card_x0}/move", body)
+    finally:
+        card_routes.lock_positions = lock_positions
+    expect_status(response, 403)
+    assert db.session.get(Card, api.ids["card_x0"]).list_id == api.ids["list_a0"]
+
+
+# Los miembros forman parte del board: agregarlos o quitarlos cambia su ETag
+
+
+def add_member_changes_board_etag(api):
+    before = api.call("owner", "get", "/boards/{board_a}")
+    expect_status(before, 200)
+    etag = before.headers["ETag"]
+    body = {"user_ids": [api.ids["intruder"]]}
+    expect_status(api.call("owner", "post", "/boards/{board_a}/members", body), 201)
+    after = api.call(
+        "owner", "get", "/boards/{board_a}", headers={"If-None-Match": etag}
+    )
+    expect_status(after, 200)
+    assert after.headers["ETag"] != etag, "ETag unchanged after adding a member"
+
+
+def remove_member_changes_board_etag(api):
+    body = {"user_ids": [api.ids["intruder"]]}
+    expect_status(api.call("owner", "post", "/boards/{board_a}/members", body), 201)
+    etag = api.call("owner", "get", "/boards/{board_a}").headers["ETag"]
+    url = "/boards/{board_a}/members/{intruder}"
+    expect_status(api.call("owner", "delete", url), 200)
+    after = api.call(
+        "owner", "get", "/boards/{board_a}", headers={"If-None-Match": etag}
+    )
+    expect_status(after, 200)
+
+
+CASES = [
+    foreign_card_with_own_board_id,
+    foreign_list_cards_with_own_board_id,
+    own_list_with_other_board_id,
+    create_card_in_foreign_list,
+    move_card_to_foreign_list,
+    move_card_between_own_boards,
+    move_list_to_foreign_board,
+    move_foreign_list_to_own_board,
+    move_list_between_own_boards,
+    clone_foreign_list,
+    clone_list_to_foreign_board,
+    clone_list_between_own_boards,
+    retry_rechecks_access,
+    add_member_changes_board_etag,
+    remove_member_changes_board_etag,
+]
+
+
+def main():
+    app = create_app()
+    client = app.test_client()
+    failures = 0
+    for case in CASES:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.create_all()
+            board_cache.clear()
+            permission_cache.clear()
+            api = Api(client, seed())
+            try:
+                case(api)
+            except AssertionError as exc:
+                failures += 1
+                print(f"[FAIL] {case.__name__}: {exc}")
+                traceback.print_exc(limit=-1)
+            else:
+                print(f"[  ok] {case.__name__}")
+
+    print(f"\n{failures} casos fallidos")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
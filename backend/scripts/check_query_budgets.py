@@ -0,0 +1,314 @@
+"""
+Comprueba que cada ruta de src/routes/ se mantenga dentro de su presupuesto de
+queries SQL, con pocos datos y con muchos.
+
+Para cada ruta recrea la base, carga un dataset chico (1 lista, 2 cards, 1
+board, 1 miembro) o uno grande (--lists listas con --cards cards cada una,
+--boards boards en el dashboard y --members miembros), llama a la ruta con el
+test client dentro de query_budget y verifica que:
+
+- responda sin error,
+- no ejecute más queries que su presupuesto (BUDGETS),
+- ninguna sentencia se repita más veces con el dataset grande que con el chico
+  (un N+1 crece con los datos aunque entre en el presupuesto).
+
+Los caches en proceso se vacían antes de cada llamada, así que se mide el
+peor caso. Sale con código 1 si alguna ruta falla.
+
+Uso (desde backend/):
+    python scripts/check_query_budgets.py
+    python scripts/check_query_budgets.py --verbose
+    POSITION_MODE=rank python scripts/check_query_budgets.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# Borrados y clonados dentro del request, para contar sus queries
+os.environ["BACKGROUND_WORKER_THREADS"] = "0"
+
+from flask_jwt_extended import (  # noqa: E402
+    create_access_token,
+    create_refresh_token,
+)
+
+from app import create_app  # noqa: E402
+from src.db import db  # noqa: E402
+from src.models import Board, BoardMember, Card, List, User  # noqa: E402
+from src.utils.board_cache import board_cache  # noqa: E402
+from src.utils.change_tracking import encode_changes_cursor  # noqa: E402
+from src.utils.permissions import permission_cache  # noqa: E402
+from src.utils.query_budget import (  # noqa: E402
+    QueryBudgetExceeded,
+    query_budget,
+)
+from src.utils.ranks import spread_ranks  # noqa: E402
+
+PASSWORD = "budget-password"
+
+SMALL = {"lists": 1, "cards": 2, "boards": 1, "members": 1}
+
+# Máximo de queries por ruta: (nombre, método, url, body, presupuesto). La url
+# y el body se completan con los ids del dataset (ver seed). Los presupuestos
+# valen para POSITION_MODE dense y rank; si un cambio los baja, bajarlos acá
+# también para que no vuelvan a subir sin que nadie lo note
+BUDGETS = [
+    # auth
+    ("registro", "post", "/auth/register", "register", 3),
+    ("login", "post", "/auth/login", "login", 1),
+    ("refresh", "post", "/auth/refresh", None, 0),
+    ("usuario actual", "get", "/auth/me", None, 1),
+    # boards
+    ("dashboard", "get", "/boards/", None, 1),
+    ("crear board", "post", "/boards/", {"title": "Nuevo"}, 3),
+    ("board", "get", "/boards/{board}", None, 1),
+    ("editar board", "put", "/boards/{board}", {"title": "Editado"}, 5),
+    ("eliminar board", "delete", "/boards/{board}", None, 6),
+    ("boards del miembro", "get", "/boards/{owner}/boards", None, 1),
+    ("listas del board", "get", "/boards/{board}/lists", None, 3),
+    ("snapshot", "get", "/boards/{board}/snapshot", None, 4),
+    ("cambios", "get", "/boards/{board}/changes?since={since}", None, 3),
+    ("mover en lote", "post", "/boards/{board}/moves", "moves", 18),
+    ("clonar board", "post", "/boards/{board}/clone", {}, 22),
+    ("miembros", "get", "/boards/{board}/members", None, 2),
+    ("agregar miembros", "post", "/boards/{board}/members", "add_member", 4),
+    ("quitar miembro", "delete", "/boards/{board}/members/{member}", None, 4),
+    ("cards del board", "get", "/boards/{board}/cards", None, 2),
+    # lists
+    ("crear lista", "post", "/lists/", "create_list", 9),
+    ("lista", "get", "/lists/{list}?board_id={board}", None, 3),
+    ("editar lista", "put", "/lists/{list}", {"title": "Editada"}, 5),
+    ("eliminar lista", "delete", "/lists/{list}", None, 11),
+    ("cards de la lista", "get", "/lists/{list}/cards", None, 2),
+    ("crear card en lista", "post", "/lists/{list}/cards", {"title": "x"}, 10),
+    ("posición de lista", "put", "/lists/{list}/position", {"position": 0}, 8),
+    ("mover lista", "put", "/lists/{list}/move", {"position": 0}, 8),
+    ("clonar lista", "post", "/lists/{list}/clone", {}, 25),
+    # cards
+    ("crear card", "post", "/cards/", "create_card", 9),
+    ("cards en lote", "post", "/cards/bulk", "bulk", 12),
+    ("card", "get", "/cards/{card}", None, 1),
+    ("editar card", "put", "/cards/{card}", {"title": "Editada"}, 5),
+    ("eliminar card", "delete", "/cards/{card}", None, 8),
+    ("archivar card", "put", "/cards/{card}/archive", None, 5),
+    ("desarchivar card", "put", "/cards/{archived_card}/unarchive", None, 5),
+    ("mover card", "put", "/cards/{card}/move", "move_card", 13),
+    # trabajos
+    ("progreso de borrado", "get", "/deletions/{deletion}", None, 1),
+    ("progreso de copia", "get", "/clones/{clone}", None, 1),
+]
+
+
+def seed(lists, cards, boards, members):
+    """
+    Crea el dataset y retorna los ids que usan las rutas.
+
+    El board medido tiene `lists` listas con `cards` cards cada una y
+    `members` miembros (y otros tantos usuarios que no lo son); el dueño tiene
+    además `boards` boards en el dashboard.
+    """
+    owner = User(username="budget", email="budget@example.com")
+    owner.set_password(PASSWORD)
+    users = [
+        User(username=f"member{i}", email=f"member{i}@example.com")
+        for i in range(2 * members)
+    ]
+    for user in users:
+        user.password_hash = owner.password_hash
+    db.session.add(owner)
+    db.session.add_all(users)
+    db.session.flush()
+
+    board_rows = [
+        Board(title=f"Board {i}", owner_id=owner.id) for i in range(boards)
+    ]
+    db.session.add_all(board_rows)
+    db.session.flush()
+    board = board_rows[0]
+    db.session.add_all(
+        BoardMember(board_id=board.id, user_id=user.id) for user in users[:members]
+    )
+
+    list_ranks = spread_ranks(lists + 1)
+    list_rows = [
+        List(title=f"List {i}", board_id=board.id, position=i, rank=list_ranks[i])
+        for i in range(lists + 1)
+    ]
+    db.session.add_all(list_rows)
+    db.session.flush()
+
+    card_ranks = spread_ranks(cards)
+    db.session.execute(
+        Card.__table__.insert(),
+        [
+            {
+                "title": f"Card {lst.id}-{i}",
+                "description": "",
+                "list_id": lst.id,
+                "board_id": board.id,
+                "position": i,
+                "rank": card_ranks[i],
+                # La primera de cada lista, para desarchivar
+                "archived": i == 0,
+            }
+            for lst in list_rows[:lists]
+            for i in range(cards)
+        ],
+    )
+    db.session.commit()
+
+    first_list, other_list = list_rows[0], list_rows[-1]
+    card_ids = [
+        row[0]
+        for row in db.session.query(Card.id)
+        .filter_by(list_id=first_list.id)
+        .order_by(Card.position)
+    ]
+    return {
+        "owner": owner.id,
+        "member": users[0].id,
+        "outsiders": [user.id for user in users[members:]],
+        "board": board.id,
+        "list": first_list.id,
+        "other_list": other_list.id,
+        "card": card_ids[-1],
+        "archived_card": card_ids[0],
+        "cards": card_ids,
+        "since": encode_changes_cursor(0),
+    }
+
+
+def bodies(ids):
+    """Cuerpos que dependen de los ids del dataset."""
+    return {
+        "register": {
+            "username": "nuevo",
+            "email": "nuevo@example.com",
+            "password": PASSWORD,
+        },
+        "login": {"email": "budget@example.com", "password": PASSWORD},
+        "moves": {
+            "moves": [
+                {"type": "card", "id": ids["card"], "list_id": ids["other_list"]},
+                {"type": "list", "id": ids["list"], "position": 1},
+            ]
+        },
+        "add_member": {"user_ids": ids["outsiders"]},
+        "create_list": {"title": "Nueva", "board_id": ids["board"], "position": 0},
+        "create_card": {"title": "Nueva", "list_id": ids["list"], "position": 0},
+        "bulk": {"action": "move", "ids": ids["cards"], "list_id": ids["other_list"]},
+        "move_card": {"list_id": ids["other_list"], "position": 0},
+    }
+
+
+def prepare_jobs(client, headers, ids):
+    """Crea un borrado y una copia para las rutas de progreso."""
+    extra = client.post("/boards/", json={"title": "Extra"}, headers=headers)
+    extra_id = extra.get_json()["id"]
+    clone = client.post(f"/boards/{ids['board']}/clone", json={}, headers=headers)
+    deletion = client.delete(f"/boards/{extra_id}", headers=headers)
+    ids["clone"] = clone.get_json()["clone"]["id"]
+    ids["deletion"] = deletion.get_json()["deletion"]["id"]
+
+
+def measure(app, client, dataset, name, method, url, body, budget):
+    """
+    Llama a una ruta sobre una base recién cargada.
+
+    Returns:
+        tuple: (status, query_budget con las sentencias, error o None)
+    """
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        board_cache.clear()
+        permission_cache.clear()
+        ids = seed(**dataset)
+        tokens = {
+            "access": create_access_token(identity=str(ids["owner"])),
+            "refresh": create_refresh_token(identity=str(ids["owner"])),
+        }
+
+    token = tokens["refresh"] if url == "/auth/refresh" else tokens["access"]
+    headers = {"Authorization": f"Bearer {token}"}
+    if "{deletion}" in url or "{clone}" in url:
+        prepare_jobs(client, headers, ids)
+    if isinstance(body, str):
+        body = bodies(ids)[body]
+    board_cache.clear()
+    permission_cache.clear()
+
+    counter = query_budget(budget)
+    error = None
+    try:
+        with counter:
+            response = getattr(client, method)(
+                url.format(**ids), json=body, headers=headers
+            )
+    except QueryBudgetExceeded as exc:
+        error = str(exc).splitlines()[1].strip()
+        response = None
+    status = response.status_code if response is not None else None
+    if response is not None and response.status_code >= 400:
+        error = f"HTTP {response.status_code}: {response.get_data(as_text=True)}"
+    return status, counter, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lists", type=int, default=100)
+    parser.add_argument("--cards", type=int, default=10)
+    parser.add_argument("--boards", type=int, default=50)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument(
+        "--verbose", action="store_true", help="Mostrar las queries de cada ruta"
+    )
+    args = parser.parse_args()
+    large = {
+        "lists": args.lists,
+        "cards": args.cards,
+        "boards": args.boards,
+        "members": args.members,
+    }
+
+    app = create_app()
+    client = app.test_client()
+    failures = 0
+    for name, method, url, body, budget in BUDGETS:
+        _, small_counter, small_error = measure(
+            app, client, SMALL, name, method, url, body, budget
+        )
+        _, large_counter, large_error = measure(
+            app, client, large, name, method, url, body, budget
+        )
+        problems = [error for error in (small_error, large_error) if error]
+        small_counts = dict(small_counter.repeated(1))
+        problems += [
+            f"grows with data: {small_counts.get(shape, 0)} -> {count}x {shape[:120]}"
+            for shape, count in large_counter.repeated(2)
+            if count > small_counts.get(shape, 0)
+        ]
+        failures += bool(problems)
+
+        marker = "FAIL" if problems else "ok"
+        print(
+            f"[{marker:>4}] {method.upper():6} {url:40} "
+            f"{small_counter.count:>3} / {large_counter.count:>3} "
+            f"(budget {budget})  {name}"
+        )
+        for problem in problems:
+            print(f"         {problem[:200]}")
+        if args.verbose or problems:
+            for line in large_counter.report().splitlines()[1:]:
+                print(f"       {line}")
+
+    print(f"\n{failures} rutas fuera de presupuesto")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Comandos de mantenimiento para `flask <grupo> <comando>`.
+"""
+
+import json
+
+import click
+from flask.cli import AppGroup
+
+changes_cli = AppGroup("changes", help="Log de cambios de sincronización incremental")
+
+
+@changes_cli.command("prune")
+@click.option(
+    "--hours",
+    type=int,
+    default=None,
+    help="Retención en horas (por defecto BOARD_CHANGES_RETENTION_HOURS)",
+)
+def prune_changes(hours):
+    """Eliminar los cambios más viejos que la retención."""
+    from src.utils.change_tracking import prune_board_changes
+
+    deleted = prune_board_changes(hours)
+    click.echo(f"Deleted {deleted} board changes")
+
+
+card_boards_cli = AppGroup(
+    "card-boards", help="Consistencia de cards.board_id con lists.board_id"
+)
+
+
+@card_boards_cli.command("check")
+@click.option("--limit", type=int, default=20, help="Cards a mostrar como ejemplo")
+def check_card_boards(limit):
+    """Listar cards cuyo board_id no coincide con el de su lista."""
+    from src.utils.card_boards import find_inconsistent_cards
+
+    rows = find_inconsistent_cards()
+    for card_id, board_id, list_board_id in rows[:limit]:
+        click.echo(f"card {card_id}: board_id={board_id}, list board={list_board_id}")
+    click.echo(f"{len(rows)} inconsistent cards")
+    if rows:
+        raise SystemExit(1)
+
+
+@card_boards_cli.command("repair")
+def repair_card_boards():
+    """Copiar a cada card el board_id de su lista."""
+    from src.utils.card_boards import repair_card_board_ids
+
+    click.echo(f"Repaired {repair_card_board_ids()} cards")
+
+
+positions_cli = AppGroup("positions", help="Integridad de posiciones de cards y listas")
+
+POSITION_KIND_CHOICES = click.Choice(["all", "cards", "lists"])
+
+
+def _scan_positions(kind, batch_size, repair):
+    """Recorre los padres por lotes e imprime un JSON por padre con problemas."""
+    from src.utils.position_integrity import (
+        find_position_issues,
+        parent_batches,
+        repair_position_issues,
+    )
+
+    summary = {"checked_parents": 0, "parents_with_issues": 0, "updated_rows": 0}
+    for current_kind in ("lists", "cards") if kind == "all" else (kind,):
+        for parent_ids in parent_batches(current_kind, batch_size):
+            issues = find_position_issues(current_kind, parent_ids)
+            if repair and issues:
+                summary["updated_rows"] += repair_position_issues(current_kind, issues)
+            for issue in issues:
+                click.echo(json.dumps(issue))
+            summary["checked_parents"] += len(parent_ids)
+            summary["parents_with_issues"] += len(issues)
+    click.echo(json.dumps({"summary": summary}))
+    return summary
+
+
+@positions_cli.command("check")
+@click.option("--kind", type=POSITION_KIND_CHOICES, default="all")
+@click.option("--batch-size", type=int, default=500, help="Padres por query")
+def check_positions(kind, batch_size):
+    """Reportar posiciones con huecos, duplicados o fuera de rango."""
+    summary = _scan_positions(kind, batch_size, repair=False)
+    if summary["parents_with_issues"]:
+        raise SystemExit(1)
+
+
+@positions_cli.command("repair")
+@click.option("--kind", type=POSITION_KIND_CHOICES, default="all")
+@click.option("--batch-size", type=int, default=500, help="Padres por transacción")
+def repair_positions(kind, batch_size):
+    """Reescribir densamente, según rank, las posiciones inconsistentes."""
+    _scan_positions(kind, batch_size, repair=True)
+
+
+@positions_cli.command("constraint")
+@click.option("--drop", is_flag=True, help="Eliminarla, para POSITION_MODE=rank")
+@click.option("--create", is_flag=True, help="Crearla, al volver a modo dense")
+def position_constraint(drop, create):
+    """Ver, eliminar o crear UNIQUE (list_id, position) de las cards (Postgres)."""
+    from src.utils.position_integrity import (
+        create_position_constraint,
+        drop_position_constraint,
+        position_constraint_exists,
+    )
+
+    if drop and create:
+        raise click.UsageError("Use only one of --drop or --create")
+    exists = position_constraint_exists()
+    if exists is None:
+        click.echo("Not applicable: requires Postgres with the cards table")
+        return
+    if drop and exists:
+        drop_position_constraint()
+        exists = False
+    elif create and not exists:
+        create_position_constraint()
+        exists = True
+    click.echo("Constraint present" if exists else "Constraint absent")
+
+
+deletions_cli = AppGroup("deletions", help="Borrado diferido de boards y listas")
+
+
+@deletions_cli.command("run")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Filas por transacción (por defecto DELETION_BATCH_SIZE)",
+)
+def run_deletions(batch_size):
+    """Purgar los borrados pendientes, interrumpidos o fallidos."""
+    from src.utils.deletions import run_deletion, unfinished_job_ids
+
+    failed = 0
+    for job_id in unfinished_job_ids():
+        try:
+            job = run_deletion(job_id, batch_size)
+        except Exception as error:
+            failed += 1
+            click.echo(json.dumps({"id": job_id, "error": str(error)}))
+            continue
+        click.echo(json.dumps(job.to_dict()))
+    if failed:
+        raise SystemExit(1)
+
+
+clones_cli = AppGroup("clones", help="Copias de boards y listas")
+
+
+@clones_cli.command("run")
+def run_clones():
+    """Completar las copias pendientes, interrumpidas o fallidas."""
+    from src.utils.clones import run_clone, unfinished_clone_ids
+
+    failed = 0
+    for job_id in unfinished_clone_ids():
+        try:
+            job = run_clone(job_id)
+        except Exception as error:
+            failed += 1
+            click.echo(json.dumps({"id": job_id, "error": str(error)}))
+            continue
+        click.echo(json.dumps(job.to_dict()))
+    if failed:
+        raise SystemExit(1)
+
+
+def register_commands(app):
+    """Registra los grupos de comandos en app.cli."""
+    app.cli.add_command(changes_cli)
+    app.cli.add_command(card_boards_cli)
+    app.cli.add_command(positions_cli)
+    app.cli.add_command(deletions_cli)
+    app.cli.add_command(clones_cli)
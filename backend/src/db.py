@@ -1,3 +1,80 @@
+"""
+Instancia de Flask-SQLAlchemy y sesión que reparte las lecturas entre réplicas.
+
+Con réplicas configuradas (DATABASE_REPLICA_URLS, ver
+src/utils/read_replicas.py) cada request de solo lectura (GET, HEAD, OPTIONS)
+elige una réplica y todas sus queries van a ella. Todo lo demás usa el
+primario: los otros métodos, los flush, los INSERT/UPDATE/DELETE de Core, los
+SELECT ... FOR UPDATE y, dentro de un request, todo lo que siga a una escritura.
+Fuera de un request (comandos, trabajos en segundo plano) siempre se usa el
+primario.
+
+Para que un cliente lea sus propias escrituras, después de escribir se le
+devuelve un vencimiento (cookie db_primary_until y header X-Primary-Until):
+mientras no venza, sus lecturas también van al primario.
+"""
+
+import random
+import time
+
+from flask import g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND_PREFIX = "replica_"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+
+def primary_pinned():
+    """Indica si el cliente del request escribió hace poco y debe leer del primario."""
+    value = request.headers.get(PRIMARY_UNTIL_HEADER) or request.cookies.get(
+        PRIMARY_UNTIL_COOKIE
+    )
+    try:
+        return float(value) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+def _choose_replica(engines):
+    """Bind key de la réplica para el request actual, o None para el primario."""
+    if request.method not in READ_METHODS or primary_pinned():
+        return None
+    keys = [
+        key
+        for key in engines
+        if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+    ]
+    return random.choice(keys) if keys else None
+
+
+class RoutingSession(Session):
+    """Sesión que manda las lecturas de requests de solo lectura a una réplica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            replica = self._replica_engine(clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_engine(self, clause):
+        if (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            # Desde acá el request lee del primario y el cliente queda fijado
+            g.db_wrote = True
+            return None
+        if g.get("db_wrote"):
+            return None
+        if "db_replica" not in g:
+            g.db_replica = _choose_replica(self._db.engines)
+        return self._db.engines[g.db_replica] if g.db_replica else None
+
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
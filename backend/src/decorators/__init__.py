@@ -1,3 +1,17 @@
-from .board import require_board_access, require_board_owner
+from .board import (
+    authorize_board,
+    get_current_board,
+    require_board_access,
+    require_board_owner,
+    resolve_board_role,
+)
+from .retry import retry_on_conflict
 
-__all__ = ["require_board_access", "require_board_owner"]
+__all__ = [
+    "authorize_board",
+    "get_current_board",
+    "require_board_access",
+    "require_board_owner",
+    "resolve_board_role",
+    "retry_on_conflict",
+]
@@ -1,8 +1,138 @@
 from functools import wraps
-from flask import request
+from flask import g, request
 from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import and_, select
 from werkzeug.exceptions import BadRequest, NotFound, Forbidden
+from src.db import db
 from src.models import BoardMember, Board, List, Card
+from src.utils.permissions import permission_cache
+
+
+def _access_query(current_user_id, board_id=None, list_id=None, card_id=None):
+    """
+    Arma un único SELECT que resuelve el board (directo, desde una lista o desde
+    una card) junto con la membresía del usuario. La lista o card también se
+    selecciona para que el handler la encuentre en el identity map.
+    """
+    membership = and_(
+        BoardMember.board_id == Board.id, BoardMember.user_id == current_user_id
+    )
+    if board_id:
+        statement = select(Board, BoardMember.id).where(Board.id == board_id)
+    elif list_id:
+        statement = (
+            select(Board, BoardMember.id, List)
+            .select_from(List)
+            .join(Board, List.board_id == Board.id)
+            .where(List.id == list_id)
+        )
+    else:
+        statement = (
+            select(Board, BoardMember.id, Card)
+            .select_from(Card)
+            .join(Board, Card.board_id == Board.id)
+            .where(Card.id == card_id)
+        )
+    return statement.outerjoin(BoardMember, membership)
+
+
+def _lookup_board_role(current_user_id, board_id=None, list_id=None, card_id=None):
+    """
+    Busca el board (directo, desde una lista o desde una card) y el rol del
+    usuario en él, usando el cache de permisos cuando se conoce el board_id.
+
+    Returns:
+        tuple: (rol, board_id, board o None si vino del cache, lista o card
+            resuelta o None)
+
+    Raises:
+        BadRequest: Si no se pudo determinar el board
+        NotFound: Si el board no existe
+    """
+    if board_id:
+        role = permission_cache.get(current_user_id, board_id)
+        if role is not permission_cache.MISSING:
+            return role, board_id, None, None
+
+    row = None
+    if board_id:
+        row = db.session.execute(_access_query(current_user_id, board_id)).first()
+    else:
+        if list_id:
+            statement = _access_query(current_user_id, list_id=list_id)
+            row = db.session.execute(statement).first()
+        if row is None and card_id:
+            statement = _access_query(current_user_id, card_id=card_id)
+            row = db.session.execute(statement).first()
+
+    if row is None:
+        if board_id:
+            raise NotFound("Board not found")
+        raise BadRequest("Board ID required")
+
+    board, membership_id = row[0], row[1]
+    if board.owner_id == current_user_id:
+        role = "owner"
+    elif membership_id is not None:
+        role = "member"
+    else:
+        role = None
+
+    permission_cache.put(current_user_id, board.id, role)
+    return role, board.id, board, row[2] if len(row) > 2 else None
+
+
+def resolve_board_role(current_user_id, board_id=None, list_id=None, card_id=None):
+    """
+    Resuelve el board y el rol del usuario en él, y los guarda en flask.g
+    (g.board_id, g.board_role y g.board si se cargó). Si el board se resolvió
+    desde una lista o card, queda en g.access_target.
+
+    Args:
+        current_user_id: ID del usuario autenticado
+        board_id, list_id, card_id: El primer ID presente identifica el board
+
+    Returns:
+        str o None: "owner", "member" o None si no tiene acceso
+
+    Raises:
+        BadRequest: Si no se pudo determinar el board
+        NotFound: Si el board no existe
+    """
+    role, resolved_id, board, target = _lookup_board_role(
+        current_user_id, board_id, list_id, card_id
+    )
+    if target is not None:
+        # Mantener viva la lista o card resuelta: el identity map es débil
+        g.access_target = target
+    if board is not None:
+        g.board = board
+    g.board_id = resolved_id
+    g.board_role = role
+    return role
+
+
+def authorize_board(current_user_id, board_id):
+    """
+    Verifica que el usuario tenga acceso a otro board, por ejemplo el destino
+    de un movimiento o el origen de una copia, sin cambiar el board que el
+    decorador dejó en flask.g.
+
+    Raises:
+        NotFound: Si el board no existe
+        Forbidden: Si el usuario no es owner ni miembro del board
+    """
+    role, _, _, _ = _lookup_board_role(current_user_id, board_id)
+    if role is None:
+        raise Forbidden("You do not have permission to access this board")
+
+
+def get_current_board(board_id):
+    """Retorna el board resuelto por el decorador o lo carga si no está en g."""
+    board = g.get("board")
+    if board is not None and board.id == board_id:
+        return board
+    return Board.query.get(board_id)
 
 
 def require_board_access(f):
@@ -12,53 +142,27 @@ def require_board_access(f):
     def decorated_function(*args, **kwargs):
         current_user_id = int(get_jwt_identity())
         board_id = kwargs.get("board_id") or kwargs.get("id")
-
-        # Si no está en kwargs, intentar obtenerlo de los query params
-        if not board_id:
-            board_id = request.args.get("board_id", type=int)
-
-        # Si no está en query params, intentar obtenerlo del request body
-        if not board_id:
-            data = request.get_json(silent=True)
-            if data:
-                board_id = data.get("board_id")
-
-        # Si aún no hay board_id, intentar obtenerlo de list_id
-        if not board_id:
-            list_id = kwargs.get("list_id")
-            if not list_id and data:
-                list_id = data.get("list_id")
-
-            if list_id:
-                list_obj = List.query.get(list_id)
-                if list_obj:
-                    board_id = list_obj.board_id
-
-        # Si aún no hay board_id, intentar obtenerlo de card_id
-        if not board_id:
-            card_id = kwargs.get("card_id")
-            if card_id:
-                card_obj = Card.query.get(card_id)
-                if card_obj and card_obj.list:
-                    board_id = card_obj.list.board_id
-
-        if not board_id:
-            raise BadRequest("Board ID required")
-
-        board = Board.query.get(board_id)
-        if not board:
-            raise NotFound("Board not found")
-
-        is_owner = board.owner_id == current_user_id
-        is_member = (
-            BoardMember.query.filter_by(
-                board_id=board_id, user_id=current_user_id
-            ).first()
-            is not None
-        )
-
-        if not (is_owner or is_member):
+        list_id = kwargs.get("list_id")
+        card_id = kwargs.get("card_id")
+        requested_board_id = request.args.get("board_id", type=int)
+
+        # Sin recurso en la URL (crear listas o cards), el cuerpo dice dónde:
+        # primero la lista y si no el board. Con recurso en la URL, board_id y
+        # list_id del cuerpo son destinos que autoriza cada handler
+        if not (board_id or list_id or card_id):
+            data = request.get_json(silent=True) or {}
+            list_id = data.get("list_id")
+            if not requested_board_id:
+                requested_board_id = data.get("board_id")
+            if not list_id:
+                board_id = requested_board_id
+
+        role = resolve_board_role(current_user_id, board_id, list_id, card_id)
+        if role is None:
             raise Forbidden("You do not have permission to access this board")
+        if requested_board_id and requested_board_id != g.board_id:
+            # Un board_id que no es el del recurso no puede elegir el permiso
+            raise NotFound("Resource not found in this board")
 
         return f(*args, **kwargs)
 
@@ -82,13 +186,8 @@ def require_board_owner(f):
         if not board_id:
             raise BadRequest("Board ID required")
 
-        board = Board.query.get(board_id)
-        if not board:
-            raise NotFound("Board not found")
-
-        is_owner = board.owner_id == current_user_id
-
-        if not is_owner:
+        role = resolve_board_role(current_user_id, board_id)
+        if role != "owner":
             raise Forbidden("You do not have permission to access this route")
 
         return f(*args, **kwargs)
@@ -0,0 +1,75 @@
+import random
+import time
+from functools import wraps
+from flask import current_app
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.exc import StaleDataError
+from werkzeug.exceptions import Conflict
+from src.db import db
+from src.utils.position_helpers import POSITION_CONSTRAINT, PositionConflict
+
+# serialization_failure y deadlock_detected
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+# Restricciones que solo se violan si dos cambios de orden se cruzaron
+POSITION_CONSTRAINTS = {POSITION_CONSTRAINT}
+
+
+def _is_retryable(error):
+    """Indica si un error de la base se resuelve repitiendo la transacción."""
+    if isinstance(error, (PositionConflict, StaleDataError)):
+        return True
+
+    orig = getattr(error, "orig", None)
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    if sqlstate == "23505":
+        diag = getattr(orig, "diag", None)
+        return getattr(diag, "constraint_name", None) in POSITION_CONSTRAINTS
+
+    # SQLite: otro request tiene el lock de escritura y venció el timeout
+    return "database is locked" in str(orig)
+
+
+def retry_on_conflict(f):
+    """
+    Repite el handler si la transacción falla por un conflicto de concurrencia
+    (serialización, deadlock, lock de SQLite, violación del orden o UPDATE
+    condicional por versión de fila que no encontró la versión leída).
+
+    Antes de cada intento se hace rollback. La espera crece exponencialmente con
+    jitter y está acotada por POSITION_RETRY_MAX_BACKOFF. Si se agotan los
+    intentos se responde 409.
+
+    Va por encima de require_board_access: entre un intento y otro la card o
+    lista puede pasar a otro board, así que cada intento vuelve a resolver el
+    acceso.
+    """
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        attempts = current_app.config.get("POSITION_RETRY_ATTEMPTS", 5)
+        backoff = current_app.config.get("POSITION_RETRY_BACKOFF", 0.02)
+        max_backoff = current_app.config.get("POSITION_RETRY_MAX_BACKOFF", 0.5)
+
+        for attempt in range(attempts):
+            try:
+                return f(*args, **kwargs)
+            except (DBAPIError, PositionConflict, StaleDataError) as error:
+                db.session.rollback()
+                if not _is_retryable(error):
+                    raise
+                current_app.logger.info(
+                    "Retrying %s after conflict (attempt %d): %s",
+                    f.__qualname__,
+                    attempt + 1,
+                    error,
+                )
+            if attempt + 1 < attempts:
+                delay = min(max_backoff, backoff * 2**attempt)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+
+        raise Conflict("The board was modified concurrently, please retry")
+
+    return decorated_function
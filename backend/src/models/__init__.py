@@ -1,7 +1,19 @@
 from .board import Board
 from .board_member import BoardMember
+from .board_change import BoardChange
+from .clone_job import CloneJob
+from .deletion_job import DeletionJob
 from .user import User
 from .card import Card
 from .list import List
 
-__all__ = ["Board", "BoardMember", "User", "Card", "List"]
+__all__ = [
+    "Board",
+    "BoardMember",
+    "BoardChange",
+    "CloneJob",
+    "DeletionJob",
+    "User",
+    "Card",
+    "List",
+]
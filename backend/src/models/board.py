@@ -1,4 +1,5 @@
 from src.db import db
+from src.models.serialization import serialize
 from datetime import datetime
 
 
@@ -8,7 +9,14 @@ class Board(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(255), nullable=True)
-    owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    owner_id = db.Column(
+        db.Integer, db.ForeignKey("users.id"), nullable=False, index=True
+    )
+    # Se incrementa en cada escritura del board, sus listas, cards o miembros
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    # Marca de baja: el board queda oculto y se purga en segundo plano
+    # (ver src/utils/deletions.py)
+    deleted_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -17,15 +25,19 @@ class Board(db.Model):
     owner = db.relationship("User")
     lists = db.relationship("List", backref="board", cascade="all, delete-orphan")
 
+    # Campos que se pueden pedir con ?fields=
+    FIELDS = (
+        "id",
+        "title",
+        "description",
+        "owner_id",
+        "version",
+        "created_at",
+        "updated_at",
+    )
+
     def __repr__(self):
         return f"<Board {self.title}>"
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "owner_id": self.owner_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    def to_dict(self, fields=None):
+        return serialize(self, fields or self.FIELDS)
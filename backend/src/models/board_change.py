@@ -0,0 +1,29 @@
+from src.db import db
+from datetime import datetime
+
+
+class BoardChange(db.Model):
+    """
+    Registro append-only de cambios por board para la sincronización incremental.
+    El id autoincremental es la posición del cambio en el log (ver
+    src/utils/change_tracking.py). board_id no tiene FK para conservar las
+    bajas de boards ya eliminados hasta que se purguen.
+    """
+
+    __tablename__ = "board_changes"
+    __table_args__ = (db.Index("ix_board_changes_board_id_id", "board_id", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    board_id = db.Column(db.Integer, nullable=False)
+    entity_type = db.Column(db.String(16), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(16), nullable=False)
+    created_at = db.Column(
+        db.DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+    def __repr__(self):
+        return (
+            f"<BoardChange {self.id}: {self.action} {self.entity_type} "
+            f"{self.entity_id} (board {self.board_id})>"
+        )
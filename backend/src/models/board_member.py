@@ -6,6 +6,8 @@ class BoardMember(db.Model):
     __tablename__ = "board_members"
     __table_args__ = (
         db.UniqueConstraint("board_id", "user_id", name="unique_board_member"),
+        # Boards de un usuario (dashboard y chequeo de acceso)
+        db.Index("ix_board_members_user_id_board_id", "user_id", "board_id"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -1,17 +1,38 @@
 from src.db import db
+from src.models.serialization import serialize
 from datetime import datetime
 
 
 class Card(db.Model):
     __tablename__ = "cards"
+    __table_args__ = (
+        db.Index("ix_cards_list_id_rank", "list_id", "rank"),
+        db.Index("ix_cards_board_id_rank", "board_id", "rank"),
+        db.Index("ix_cards_list_id_position", "list_id", "position"),
+        # Solo cards activas: contadores del dashboard y cards vencidas
+        db.Index(
+            "ix_cards_active_board_id_due_date",
+            "board_id",
+            "due_date",
+            postgresql_where=db.text("NOT archived"),
+            sqlite_where=db.text("archived = 0"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     list_id = db.Column(db.Integer, db.ForeignKey("lists.id"), nullable=False)
+    # Copia de lists.board_id, la mantiene src/utils/card_boards.py en cada flush
+    board_id = db.Column(db.Integer, db.ForeignKey("boards.id"), nullable=False)
     position = db.Column(db.Integer, nullable=False)
+    # Clave de orden lexicográfica (ver src/utils/ranks.py)
+    rank = db.Column(db.String(64), nullable=False)
     due_date = db.Column(db.DateTime, nullable=True)
     archived = db.Column(db.Boolean, default=False, nullable=False)
+    # Versión de la fila (su ETag): el ORM la incrementa en cada UPDATE con
+    # WHERE version = <leída>. Los corrimientos de posición en bloque no la tocan
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -19,18 +40,26 @@ class Card(db.Model):
 
     list = db.relationship("List", back_populates="cards")
 
+    __mapper_args__ = {"version_id_col": version}
+
+    # Campos que se pueden pedir con ?fields=
+    FIELDS = (
+        "id",
+        "title",
+        "description",
+        "list_id",
+        "board_id",
+        "position",
+        "rank",
+        "due_date",
+        "archived",
+        "version",
+        "created_at",
+        "updated_at",
+    )
+
     def __repr__(self):
         return f"<Card ID: {self.id}, Title: {self.title}>"
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "list_id": self.list_id,
-            "position": self.position,
-            "due_date": self.due_date.isoformat() if self.due_date else None,
-            "archived": self.archived,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    def to_dict(self, fields=None):
+        return serialize(self, fields or self.FIELDS)
@@ -0,0 +1,61 @@
+from src.db import db
+from src.models.serialization import serialize
+from datetime import datetime
+
+
+class CloneJob(db.Model):
+    """
+    Copia de un board o una lista con sus cards (ver src/utils/clones.py).
+    target_id es el board o la lista nuevos, que se crean al pedir la copia;
+    source_id no tiene FK para que el origen se pueda borrar después.
+    """
+
+    __tablename__ = "clone_jobs"
+    __table_args__ = (db.Index("ix_clone_jobs_status", "status"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    # "board" o "list"
+    entity_type = db.Column(db.String(16), nullable=False)
+    source_id = db.Column(db.Integer, nullable=False)
+    target_id = db.Column(db.Integer, nullable=False)
+    # Board donde quedan las copias
+    board_id = db.Column(db.Integer, nullable=False)
+    requested_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    include_archived = db.Column(db.Boolean, nullable=False, default=True)
+    include_descriptions = db.Column(db.Boolean, nullable=False, default=True)
+    # "pending", "running", "done" o "failed"
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    copied_lists = db.Column(db.Integer, nullable=False, default=0)
+    copied_cards = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    FIELDS = (
+        "id",
+        "entity_type",
+        "source_id",
+        "target_id",
+        "board_id",
+        "include_archived",
+        "include_descriptions",
+        "status",
+        "copied_lists",
+        "copied_cards",
+        "error",
+        "created_at",
+        "updated_at",
+        "finished_at",
+    )
+
+    def __repr__(self):
+        return (
+            f"<CloneJob {self.id}: {self.entity_type} {self.source_id} -> "
+            f"{self.target_id} ({self.status})>"
+        )
+
+    def to_dict(self):
+        return serialize(self, self.FIELDS)
@@ -0,0 +1,58 @@
+from src.db import db
+from src.models.serialization import serialize
+from datetime import datetime
+
+
+class DeletionJob(db.Model):
+    """
+    Purgado en segundo plano de un board o una lista dados de baja (ver
+    src/utils/deletions.py). entity_id y board_id no tienen FK: el registro
+    sobrevive a las filas borradas para poder consultar cómo terminó.
+    """
+
+    __tablename__ = "deletion_jobs"
+    __table_args__ = (db.Index("ix_deletion_jobs_status", "status"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    # "board" o "list"
+    entity_type = db.Column(db.String(16), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    board_id = db.Column(db.Integer, nullable=False)
+    requested_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    # "pending", "running", "done" o "failed"
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    total_lists = db.Column(db.Integer, nullable=False, default=0)
+    deleted_lists = db.Column(db.Integer, nullable=False, default=0)
+    total_cards = db.Column(db.Integer, nullable=False, default=0)
+    deleted_cards = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    FIELDS = (
+        "id",
+        "entity_type",
+        "entity_id",
+        "board_id",
+        "status",
+        "total_lists",
+        "deleted_lists",
+        "total_cards",
+        "deleted_cards",
+        "error",
+        "created_at",
+        "updated_at",
+        "finished_at",
+    )
+
+    def __repr__(self):
+        return (
+            f"<DeletionJob {self.id}: {self.entity_type} {self.entity_id} "
+            f"({self.status})>"
+        )
+
+    def to_dict(self):
+        return serialize(self, self.FIELDS)
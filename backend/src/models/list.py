@@ -1,31 +1,65 @@
 from src.db import db
+from src.models.serialization import serialize
 from datetime import datetime
 
 
 class List(db.Model):
     __tablename__ = "lists"
+    __table_args__ = (
+        db.Index("ix_lists_board_id_rank", "board_id", "rank"),
+        db.Index("ix_lists_board_id_position", "board_id", "position"),
+        # Solo listas dadas de baja: las cards de estas listas quedan ocultas
+        db.Index(
+            "ix_lists_deleted_at",
+            "deleted_at",
+            postgresql_where=db.text("deleted_at IS NOT NULL"),
+            sqlite_where=db.text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     board_id = db.Column(db.Integer, db.ForeignKey("boards.id"), nullable=False)
     position = db.Column(db.Integer, nullable=False)
+    # Clave de orden lexicográfica (ver src/utils/ranks.py)
+    rank = db.Column(db.String(64), nullable=False)
+    # Versión de la fila (su ETag): el ORM la incrementa en cada UPDATE con
+    # WHERE version = <leída>. Los corrimientos de posición en bloque no la tocan
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    # Marca de baja: la lista y sus cards quedan ocultas hasta que se purgan
+    deleted_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
-    cards = db.relationship("Card", back_populates="list", cascade="all, delete-orphan")
+    cards = db.relationship(
+        "Card",
+        back_populates="list",
+        cascade="all, delete-orphan",
+        order_by="[Card.rank, Card.id]",
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+
+    # Campos que se pueden pedir con ?fields= (las cards van aparte)
+    FIELDS = (
+        "id",
+        "title",
+        "board_id",
+        "position",
+        "rank",
+        "version",
+        "created_at",
+        "updated_at",
+    )
 
     def __repr__(self):
         return f"<List ID: {self.id}, Title: {self.title}>"
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "board_id": self.board_id,
-            "position": self.position,
-            "cards": [card.to_dict() for card in self.cards],
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    def to_dict(self, fields=None, include_cards=False, card_fields=None):
+        data = serialize(self, fields or self.FIELDS)
+        # Solo tocar self.cards si se pide, para no disparar el lazy load
+        if include_cards:
+            data["cards"] = [card.to_dict(card_fields) for card in self.cards]
+        return data
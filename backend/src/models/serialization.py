@@ -0,0 +1,14 @@
+from datetime import datetime
+
+
+def serialize(obj, fields):
+    """
+    Convierte en dict solo los atributos pedidos del modelo.
+    Solo se accede a esos atributos, así que las columnas diferidas
+    (load_only) que no se piden nunca se cargan.
+    """
+    data = {}
+    for name in fields:
+        value = getattr(obj, name)
+        data[name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
@@ -2,5 +2,7 @@ from .boards import boards_ns
 from .auth import auth_ns
 from .cards import cards_ns
 from .lists import lists_ns
+from .deletions import deletions_ns
+from .clones import clones_ns
 
-__all__ = ["boards_ns", "auth_ns", "cards_ns", "lists_ns"]
+__all__ = ["boards_ns", "auth_ns", "cards_ns", "lists_ns", "deletions_ns", "clones_ns"]
@@ -1,9 +1,44 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models import Board, BoardMember, List, Card
+from src.models import Board, BoardMember, Card
 from src.db import db
-from src.decorators import require_board_access, require_board_owner
+from src.decorators import (
+    get_current_board,
+    require_board_access,
+    require_board_owner,
+    retry_on_conflict,
+)
+from src.utils.board_cache import cached_board_response
+from src.utils.batch_moves import apply_moves, parse_moves
+from src.utils.board_versions import board_etag, mark_boards_changed
+from src.utils.board_reader import read_board_lists
+from src.utils.change_tracking import (
+    DEFAULT_CHANGES_LIMIT,
+    MAX_CHANGES_LIMIT,
+    current_changes_cursor,
+    cursor_expired,
+    decode_changes_cursor,
+    read_changes,
+)
+from src.utils.clones import parse_clone_options, schedule_clone, start_clone
+from src.utils.dashboard import read_dashboard_boards
+from src.utils.deletions import schedule_deletion, start_deletion
+from src.utils.fieldsets import fields_variant, parse_fields, project
+from src.utils.http_cache import (
+    etag_header,
+    is_not_modified,
+    is_precondition_failed,
+    not_modified,
+    precondition_failed,
+)
+from src.utils.pagination import (
+    page_variant,
+    paginate_cards,
+    parse_card_page_args,
+    parse_limit,
+)
+from src.utils.permissions import permission_cache
 
 # Crear namespace para boards
 boards_ns = Namespace("boards", description="Operaciones de tableros")
@@ -37,6 +72,7 @@ board_response_model = boards_ns.model(
         "title": fields.String(description="Título del tablero"),
         "description": fields.String(description="Descripción del tablero"),
         "owner_id": fields.Integer(description="ID del propietario"),
+        "version": fields.Integer(description="Versión del tablero (ETag)"),
         "created_at": fields.DateTime(description="Fecha de creación"),
         "updated_at": fields.DateTime(description="Fecha de actualización"),
     },
@@ -65,6 +101,44 @@ member_response_model = boards_ns.model(
     },
 )
 
+board_move_model = boards_ns.model(
+    "BoardMove",
+    {
+        "type": fields.String(
+            required=True, description="card o list", enum=["card", "list"]
+        ),
+        "id": fields.Integer(required=True, description="ID de la tarjeta o lista"),
+        "list_id": fields.Integer(description="Lista destino (solo tarjetas)"),
+        "position": fields.Integer(description="Posición destino (0-indexed)"),
+    },
+)
+
+board_moves_model = boards_ns.model(
+    "BoardMoves",
+    {
+        "moves": fields.List(
+            fields.Nested(board_move_model),
+            required=True,
+            description="Movimientos a aplicar en orden",
+        ),
+    },
+)
+
+board_clone_model = boards_ns.model(
+    "BoardClone",
+    {
+        "title": fields.String(
+            description="Título del tablero nuevo (por defecto, el del original)"
+        ),
+        "include_archived": fields.Boolean(
+            description="Copiar también las tarjetas archivadas", default=True
+        ),
+        "include_descriptions": fields.Boolean(
+            description="Copiar las descripciones de las tarjetas", default=True
+        ),
+    },
+)
+
 error_model = boards_ns.model(
     "Error",
     {
@@ -74,6 +148,27 @@ error_model = boards_ns.model(
 )
 
 
+def check_board_if_match(board):
+    """
+    Compara el If-Match del request con la versión del board.
+
+    La versión del board cambia con cualquier escritura en él, así que no hace
+    falta una versión de fila aparte. Si hay If-Match, el board se relee con
+    SELECT ... FOR UPDATE para que la versión comparada siga vigente hasta el
+    commit.
+
+    Returns:
+        La respuesta 412 con el board actual, o None si se puede continuar
+    """
+    if not request.if_match:
+        return None
+    db.session.refresh(board, with_for_update=True)
+    etag = board_etag(board)
+    if is_precondition_failed(etag):
+        return precondition_failed(etag, board.to_dict())
+    return None
+
+
 @boards_ns.route("/")
 class BoardList(Resource):
     @boards_ns.doc(
@@ -81,26 +176,27 @@ class BoardList(Resource):
         description="Obtener todos los tableros del usuario autenticado",
         security="Bearer",
     )
-    @boards_ns.response(
-        200, "Lista de tableros obtenida exitosamente", [board_response_model]
-    )
+    @boards_ns.response(200, "Página de tableros obtenida exitosamente")
+    @boards_ns.response(400, "Parámetros inválidos", error_model)
     @boards_ns.response(401, "No autorizado", error_model)
+    @boards_ns.param("fields", "Campos del tablero a devolver, separados por coma")
+    @boards_ns.param("sort", "activity (más reciente primero, por defecto) o title")
+    @boards_ns.param("limit", "Tableros por página (por defecto 100, máximo 500)")
+    @boards_ns.param("cursor", "Cursor next_cursor de la página anterior")
     @jwt_required()
     def get(self):
-        """Obtener todos los boards del usuario autenticado"""
+        """Obtener los boards propios y compartidos del usuario con sus contadores"""
         current_user_id = int(get_jwt_identity())
-
-        # Boards donde es owner
-        owned_boards = Board.query.filter_by(owner_id=current_user_id).all()
-
-        # Boards donde es miembro
-        memberships = BoardMember.query.filter_by(user_id=current_user_id).all()
-        member_boards = [m.board for m in memberships]
-
-        # Combinar y eliminar duplicados
-        all_boards = owned_boards + [b for b in member_boards if b not in owned_boards]
-
-        return [board.to_dict() for board in all_boards], 200
+        board_fields = parse_fields("boards", primary=True)
+
+        page = read_dashboard_boards(
+            current_user_id,
+            fields=board_fields,
+            sort=request.args.get("sort", "activity"),
+            limit=parse_limit(),
+            cursor=request.args.get("cursor") or None,
+        )
+        return page, 200
 
     @boards_ns.doc(
         "create_board", description="Crear un nuevo tablero", security="Bearer"
@@ -135,16 +231,23 @@ class BoardResource(Resource):
         "get_board", description="Obtener un tablero específico", security="Bearer"
     )
     @boards_ns.response(200, "Tablero obtenido exitosamente", board_response_model)
+    @boards_ns.response(304, "Sin cambios desde el ETag enviado")
     @boards_ns.response(401, "No autorizado", error_model)
     @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.param("fields", "Campos del tablero a devolver, separados por coma")
     @jwt_required()
     @require_board_access
     def get(self, board_id):
         """Obtener un board específico"""
-        board = Board.query.get(board_id)
+        board_fields = parse_fields("boards", primary=True)
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
-        return board.to_dict(), 200
+
+        etag = board_etag(board)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        return board.to_dict(board_fields), 200, etag_header(etag)
 
     @boards_ns.doc(
         "update_board", description="Actualizar un tablero", security="Bearer"
@@ -153,14 +256,19 @@ class BoardResource(Resource):
     @boards_ns.response(200, "Tablero actualizado exitosamente", board_response_model)
     @boards_ns.response(401, "No autorizado", error_model)
     @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.response(412, "El tablero cambió desde el ETag de If-Match")
     @jwt_required()
     @require_board_access
     def put(self, board_id):
         """Actualizar un board"""
         data = request.get_json()
-        board = Board.query.get(board_id)
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
+        failed = check_board_if_match(board)
+        if failed:
+            return failed
+
         title = data.get("title")
         description = data.get("description")
         if title:
@@ -168,29 +276,43 @@ class BoardResource(Resource):
         if description:
             board.description = description
         db.session.commit()
-        return board.to_dict(), 200
+        return board.to_dict(), 200, etag_header(board_etag(board))
 
     @boards_ns.doc(
         "delete_board",
         description="Eliminar un tablero (solo propietario)",
         security="Bearer",
     )
-    @boards_ns.response(200, "Tablero eliminado exitosamente")
+    @boards_ns.response(
+        202, "Tablero eliminado; su contenido se purga en segundo plano"
+    )
     @boards_ns.response(401, "No autorizado", error_model)
     @boards_ns.response(
         403, "Prohibido - solo el propietario puede eliminar", error_model
     )
     @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.response(412, "El tablero cambió desde el ETag de If-Match")
     @jwt_required()
     @require_board_owner
     def delete(self, board_id):
         """Eliminar un board (solo owner)"""
-        board = Board.query.get(board_id)
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
-        db.session.delete(board)
+        failed = check_board_if_match(board)
+        if failed:
+            return failed
+
+        # Queda oculto enseguida; listas y cards se borran por lotes después
+        job = schedule_deletion(board, int(get_jwt_identity()))
         db.session.commit()
-        return {"message": "Board deleted successfully"}, 200
+        permission_cache.invalidate(board_id)
+        start_deletion(job.id)
+        return (
+            {"message": "Board deleted successfully", "deletion": job.to_dict()},
+            202,
+            {"Location": f"/deletions/{job.id}"},
+        )
 
 
 @boards_ns.route("/<int:member_id>/boards")
@@ -208,6 +330,7 @@ class MemberBoards(Resource):
     @boards_ns.response(
         403, "Prohibido - no puedes ver tableros de otros usuarios", error_model
     )
+    @boards_ns.param("fields", "Campos del tablero a devolver, separados por coma")
     @jwt_required()
     def get(self, member_id):
         """Obtener boards de un usuario (solo si es el mismo usuario autenticado)"""
@@ -217,10 +340,10 @@ class MemberBoards(Resource):
         if current_user_id != member_id:
             boards_ns.abort(403, "Not authorized to view other users' boards")
 
-        boards = (
-            Board.query.join(BoardMember).filter(BoardMember.user_id == member_id).all()
-        )
-        return [board.to_dict() for board in boards], 200
+        board_fields = parse_fields("boards", primary=True)
+        query = Board.query.join(BoardMember).filter(BoardMember.user_id == member_id)
+        boards = project(query, Board, board_fields).all()
+        return [board.to_dict(board_fields) for board in boards], 200
 
 
 @boards_ns.route("/<int:board_id>/lists")
@@ -232,29 +355,199 @@ class BoardLists(Resource):
         security="Bearer",
     )
     @boards_ns.response(200, "Listas y tarjetas obtenidas exitosamente")
+    @boards_ns.response(304, "Sin cambios desde el ETag enviado")
     @boards_ns.response(401, "No autorizado", error_model)
     @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.param("fields", "Campos de las listas a devolver, separados por coma")
+    @boards_ns.param("fields[cards]", "Campos de las tarjetas a devolver")
     @jwt_required()
     @require_board_access
     def get(self, board_id):
         """Obtener todas las listas y sus tarjetas de un board"""
-        board = Board.query.get(board_id)
+        list_fields = parse_fields("lists", primary=True)
+        card_fields = parse_fields("cards")
+        board = get_current_board(board_id)
+        if not board:
+            boards_ns.abort(404, "Board not found")
+
+        etag = board_etag(board)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        def build_payload():
+            return read_board_lists(board_id, list_fields, card_fields)
+
+        variant = "lists:" + fields_variant(list_fields, card_fields)
+        return cached_board_response(board, variant, build_payload, etag)
+
+
+@boards_ns.route("/<int:board_id>/snapshot")
+@boards_ns.param("board_id", "ID del tablero")
+class BoardSnapshot(Resource):
+    @boards_ns.doc(
+        "get_board_snapshot",
+        description="Obtener el tablero con sus listas y tarjetas ordenadas",
+        security="Bearer",
+    )
+    @boards_ns.response(200, "Tablero obtenido exitosamente")
+    @boards_ns.response(304, "Sin cambios desde el ETag enviado")
+    @boards_ns.response(401, "No autorizado", error_model)
+    @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.param("fields[boards]", "Campos del tablero a devolver")
+    @boards_ns.param("fields[lists]", "Campos de las listas a devolver")
+    @boards_ns.param("fields[cards]", "Campos de las tarjetas a devolver")
+    @jwt_required()
+    @require_board_access
+    def get(self, board_id):
+        """Obtener el board completo (board, listas y tarjetas)"""
+        board_fields = parse_fields("boards")
+        list_fields = parse_fields("lists")
+        card_fields = parse_fields("cards")
+        # El cursor se toma antes de leer el board: si entra un cambio en el medio,
+        # el cliente lo vuelve a recibir en /changes en lugar de perderlo
+        changes_cursor = current_changes_cursor(board_id)
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
-        
-        # Obtener todas las listas del board ordenadas por posición
-        lists = List.query.filter_by(board_id=board_id).order_by(List.position).all()
-        
-        # Para cada lista, obtener sus tarjetas
-        lists_with_cards = []
-        for lst in lists:
-            list_dict = lst.to_dict()
-            # Obtener tarjetas de esta lista ordenadas por posición
-            cards = Card.query.filter_by(list_id=lst.id).order_by(Card.position).all()
-            list_dict['cards'] = [card.to_dict() for card in cards]
-            lists_with_cards.append(list_dict)
-        
-        return lists_with_cards, 200
+
+        etag = board_etag(board)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        def build_payload():
+            return {
+                "board": board.to_dict(board_fields),
+                "lists": read_board_lists(board_id, list_fields, card_fields),
+            }
+
+        variant = "snapshot:" + fields_variant(board_fields, list_fields, card_fields)
+        response = cached_board_response(board, variant, build_payload, etag)
+        response.headers["X-Changes-Cursor"] = changes_cursor
+        return response
+
+
+@boards_ns.route("/<int:board_id>/changes")
+@boards_ns.param("board_id", "ID del tablero")
+class BoardChanges(Resource):
+    @boards_ns.doc(
+        "get_board_changes",
+        description=(
+            "Obtener los cambios del tablero desde un cursor. El cursor inicial "
+            "viene en el header X-Changes-Cursor de /snapshot"
+        ),
+        security="Bearer",
+    )
+    @boards_ns.param("since", "Cursor de la respuesta anterior", required=True)
+    @boards_ns.param("limit", "Cambios por respuesta (por defecto 1000)")
+    @boards_ns.param("fields[lists]", "Campos de las listas a devolver")
+    @boards_ns.param("fields[cards]", "Campos de las tarjetas a devolver")
+    @boards_ns.response(200, "Cambios obtenidos exitosamente")
+    @boards_ns.response(400, "Cursor inválido", error_model)
+    @boards_ns.response(401, "No autorizado", error_model)
+    @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.response(410, "Cursor vencido, recargar el snapshot", error_model)
+    @jwt_required()
+    @require_board_access
+    def get(self, board_id):
+        """Obtener lo que cambió en un board desde el cursor since"""
+        since = request.args.get("since")
+        if not since:
+            boards_ns.abort(400, "since cursor is required")
+        since_id, issued_at = decode_changes_cursor(since)
+        if cursor_expired(issued_at):
+            boards_ns.abort(410, "Full resync required", resync_required=True)
+
+        limit = request.args.get("limit", DEFAULT_CHANGES_LIMIT, type=int)
+        if limit < 1:
+            boards_ns.abort(400, "limit must be positive")
+
+        list_fields = parse_fields("lists")
+        card_fields = parse_fields("cards")
+        board = get_current_board(board_id)
+        if not board:
+            boards_ns.abort(404, "Board not found")
+
+        changes = read_changes(
+            board, since_id, min(limit, MAX_CHANGES_LIMIT), list_fields, card_fields
+        )
+        return changes, 200
+
+
+@boards_ns.route("/<int:board_id>/moves")
+@boards_ns.param("board_id", "ID del tablero")
+class BoardMoves(Resource):
+    @boards_ns.doc(
+        "apply_board_moves",
+        description=(
+            "Aplicar en orden una secuencia de movimientos de tarjetas y listas "
+            "en una sola transacción"
+        ),
+        security="Bearer",
+    )
+    @boards_ns.expect(board_moves_model)
+    @boards_ns.response(200, "Movimientos aplicados; orden final de los afectados")
+    @boards_ns.response(400, "Movimientos inválidos", error_model)
+    @boards_ns.response(401, "No autorizado", error_model)
+    @boards_ns.response(404, "Tarjeta o lista no encontrada en el tablero", error_model)
+    @jwt_required()
+    @retry_on_conflict
+    @require_board_access
+    def post(self, board_id):
+        """Mover varias tarjetas y listas de un board de una vez"""
+        moves = parse_moves(request.get_json(silent=True))
+        board = get_current_board(board_id)
+        if not board:
+            boards_ns.abort(404, "Board not found")
+
+        result = apply_moves(board_id, moves)
+        db.session.commit()
+        result["version"] = board.version
+        return result, 200
+
+
+@boards_ns.route("/<int:board_id>/clone")
+@boards_ns.param("board_id", "ID del tablero a copiar")
+class BoardClone(Resource):
+    @boards_ns.doc(
+        "clone_board",
+        description=(
+            "Copiar un tablero con sus listas y tarjetas en un tablero nuevo del "
+            "usuario; las copias grandes siguen en segundo plano"
+        ),
+        security="Bearer",
+    )
+    @boards_ns.expect(board_clone_model)
+    @boards_ns.response(201, "Tablero copiado")
+    @boards_ns.response(202, "Tablero creado; las tarjetas se copian en segundo plano")
+    @boards_ns.response(400, "Datos inválidos", error_model)
+    @boards_ns.response(401, "No autorizado", error_model)
+    @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.response(500, "La copia falló", error_model)
+    @jwt_required()
+    @require_board_access
+    def post(self, board_id):
+        """Copiar un board (plantilla) con INSERT ... SELECT"""
+        data = request.get_json(silent=True) or {}
+        options = parse_clone_options(data)
+        board = get_current_board(board_id)
+        if not board:
+            boards_ns.abort(404, "Board not found")
+
+        new_board = Board(
+            title=data.get("title") or board.title,
+            description=board.description,
+            owner_id=int(get_jwt_identity()),
+        )
+        job = schedule_clone(board, new_board, new_board.owner_id, **options)
+        db.session.commit()
+
+        if start_clone(job):
+            body = {"board": new_board.to_dict(), "clone": job.to_dict()}
+            return body, 202, {"Location": f"/clones/{job.id}"}
+        if job.status == "failed":
+            boards_ns.abort(500, "Clone failed")
+        body = {"board": new_board.to_dict(), "clone": job.to_dict()}
+        return body, 201, etag_header(board_etag(new_board))
 
 
 @boards_ns.route("/<int:board_id>/members")
@@ -274,11 +567,15 @@ class BoardMembers(Resource):
     @require_board_access
     def get(self, board_id):
         """Obtener miembros de un board"""
-        board = Board.query.get(board_id)
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
-        members = [member.to_dict() for member in board.members]
-        return members, 200
+        members = (
+            BoardMember.query.filter_by(board_id=board_id)
+            .order_by(BoardMember.id)
+            .all()
+        )
+        return [member.to_dict() for member in members], 200
 
     @boards_ns.doc(
         "add_members",
@@ -301,17 +598,26 @@ class BoardMembers(Resource):
         user_ids = data.get("user_ids", [])
         if not user_ids:
             boards_ns.abort(400, "user_ids list is required")
-        board = Board.query.get(board_id)
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
-        for user_id in user_ids:
-            existing_member = BoardMember.query.filter_by(
-                board_id=board_id, user_id=user_id
-            ).first()
-            if not existing_member:
-                new_member = BoardMember(board_id=board_id, user_id=user_id)
-                db.session.add(new_member)
+        existing = {
+            member.user_id
+            for member in BoardMember.query.filter(
+                BoardMember.board_id == board_id, BoardMember.user_id.in_(user_ids)
+            )
+        }
+        new_members = [
+            {"board_id": board_id, "user_id": user_id}
+            for user_id in dict.fromkeys(user_ids)
+            if user_id not in existing
+        ]
+        if new_members:
+            # INSERT de Core: no pasa por el flush que versiona el board
+            db.session.execute(BoardMember.__table__.insert(), new_members)
+            mark_boards_changed(db.session, {board_id})
         db.session.commit()
+        permission_cache.invalidate(board_id, user_ids)
         return {"message": "Members added successfully"}, 201
 
 
@@ -339,6 +645,7 @@ class BoardMemberResource(Resource):
             boards_ns.abort(404, "Member not found")
         db.session.delete(member)
         db.session.commit()
+        permission_cache.invalidate(board_id, [user_id])
         return {"message": "Member removed successfully"}, 200
 
 
@@ -350,22 +657,33 @@ class BoardCards(Resource):
         description="Obtener todas las tarjetas de un tablero",
         security="Bearer",
     )
-    @boards_ns.response(200, "Lista de tarjetas obtenida exitosamente")
+    @boards_ns.param("limit", "Tarjetas por página (por defecto 100, máximo 500)")
+    @boards_ns.param("cursor", "Cursor next_cursor de la página anterior")
+    @boards_ns.param("archived", "true/false para filtrar por estado archivado")
+    @boards_ns.response(200, "Página de tarjetas obtenida exitosamente")
+    @boards_ns.response(304, "Sin cambios desde el ETag enviado")
     @boards_ns.response(401, "No autorizado", error_model)
     @boards_ns.response(404, "Tablero no encontrado", error_model)
+    @boards_ns.param("fields", "Campos de las tarjetas a devolver, separados por coma")
     @jwt_required()
     @require_board_access
     def get(self, board_id):
-        """Obtener todas las tarjetas de un board"""
-        board = Board.query.get(board_id)
+        """Obtener las tarjetas de un board paginadas por cursor"""
+        board = get_current_board(board_id)
         if not board:
             boards_ns.abort(404, "Board not found")
-        
-        # Obtener todas las listas del board
-        lists = List.query.filter_by(board_id=board_id).all()
-        list_ids = [lst.id for lst in lists]
-        
-        # Obtener todas las tarjetas de esas listas
-        cards = Card.query.filter(Card.list_id.in_(list_ids)).order_by(Card.position).all()
-        
-        return [card.to_dict() for card in cards], 200
+
+        page = parse_card_page_args()
+        card_fields = parse_fields("cards", primary=True)
+        etag = board_etag(board)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        def build_payload():
+            # Tarjetas de todas las listas del board, paginadas por (rank, id)
+            return paginate_cards(
+                Card.board_id == board_id, fields=card_fields, **page
+            )
+
+        variant = page_variant("cards", page) + ":" + fields_variant(card_fields)
+        return cached_board_response(board, variant, build_payload, etag)
@@ -1,14 +1,31 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.decorators import require_board_access
+from src.decorators import (
+    authorize_board,
+    require_board_access,
+    retry_on_conflict,
+)
 from src.models import Card, List
 from src.db import db
+from src.utils.board_versions import row_etag
+from src.utils.bulk_cards import apply_bulk_action, parse_bulk_request
+from src.utils.fieldsets import parse_fields, project
+from src.utils.http_cache import (
+    etag_header,
+    is_not_modified,
+    is_precondition_failed,
+    not_modified,
+    precondition_failed,
+)
 from src.utils.position_helpers import (
     adjust_positions_on_insert,
     validate_position,
     compact_positions_on_delete,
     reorder_on_move,
+    assign_rank,
+    lock_positions,
+    position_changed,
 )
 
 # Crear namespace para cards
@@ -55,6 +72,44 @@ card_move_model = cards_ns.model(
     },
 )
 
+card_bulk_filter_model = cards_ns.model(
+    "CardBulkFilter",
+    {
+        "list_id": fields.Integer(
+            required=True, description="ID de la lista cuyas tarjetas se eligen"
+        ),
+        "archived": fields.Boolean(description="Elegir solo archivadas o activas"),
+    },
+)
+
+card_bulk_model = cards_ns.model(
+    "CardBulk",
+    {
+        "action": fields.String(
+            required=True,
+            description="archive, unarchive, delete o move",
+            example="archive",
+        ),
+        "ids": fields.List(
+            fields.Integer, description="IDs de las tarjetas (o usar filter)"
+        ),
+        "filter": fields.Nested(
+            card_bulk_filter_model, description="Elegir tarjetas por lista"
+        ),
+        "list_id": fields.Integer(description="ID de la lista destino (move)"),
+    },
+)
+
+card_bulk_response_model = cards_ns.model(
+    "CardBulkResponse",
+    {
+        "action": fields.String(description="Acción aplicada"),
+        "count": fields.Integer(description="Cantidad de tarjetas afectadas"),
+        "ids": fields.List(fields.Integer, description="IDs de las tarjetas"),
+        "board_ids": fields.List(fields.Integer, description="Tableros afectados"),
+    },
+)
+
 card_response_model = cards_ns.model(
     "CardResponse",
     {
@@ -62,9 +117,12 @@ card_response_model = cards_ns.model(
         "title": fields.String(description="Título de la tarjeta"),
         "description": fields.String(description="Descripción de la tarjeta"),
         "list_id": fields.Integer(description="ID de la lista"),
+        "board_id": fields.Integer(description="ID del tablero"),
         "position": fields.Float(description="Posición en la lista"),
+        "rank": fields.String(description="Clave de orden dentro de la lista"),
         "due_date": fields.DateTime(description="Fecha de vencimiento"),
         "archived": fields.Boolean(description="Estado archivado"),
+        "version": fields.Integer(description="Versión de la fila (ETag)"),
         "created_at": fields.DateTime(description="Fecha de creación"),
     },
 )
@@ -87,6 +145,7 @@ class CardCollection(Resource):
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Lista no encontrada", error_model)
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def post(self):
         """Crear una nueva tarjeta"""
@@ -105,12 +164,11 @@ class CardCollection(Resource):
         if not list_obj:
             cards_ns.abort(404, "List not found")
 
+        lock_positions(list_obj.board_id)
+
         # Validar y obtener posición
         position = validate_position(Card, "list_id", list_id, position)
 
-        # Ajustar posiciones de cards existentes
-        adjust_positions_on_insert(Card, "list_id", list_id, position)
-
         new_card = Card(
             title=title,
             description=description,
@@ -118,9 +176,42 @@ class CardCollection(Resource):
             position=position,
             due_date=due_date,
         )
+        assign_rank(Card, "list_id", new_card, list_id, position)
+
+        # Ajustar posiciones de cards existentes
+        adjust_positions_on_insert(Card, "list_id", list_id, position)
+
         db.session.add(new_card)
         db.session.commit()
-        return new_card.to_dict(), 201
+        return new_card.to_dict(), 201, etag_header(row_etag(new_card))
+
+
+@cards_ns.route("/bulk")
+class CardBulk(Resource):
+    @cards_ns.doc(
+        "bulk_cards",
+        description=(
+            "Archivar, desarchivar, borrar o mover al final de una lista varias "
+            "tarjetas de una vez, elegidas por ids o por lista"
+        ),
+        security="Bearer",
+    )
+    @cards_ns.expect(card_bulk_model)
+    @cards_ns.response(200, "Operación aplicada", card_bulk_response_model)
+    @cards_ns.response(400, "Datos inválidos", error_model)
+    @cards_ns.response(401, "No autorizado", error_model)
+    @cards_ns.response(403, "Sin acceso a alguno de los tableros", error_model)
+    @cards_ns.response(404, "Tarjeta o lista no encontrada", error_model)
+    @jwt_required()
+    @retry_on_conflict
+    def post(self):
+        """Aplicar una acción a varias tarjetas"""
+        current_user_id = int(get_jwt_identity())
+        bulk = parse_bulk_request(request.get_json(silent=True))
+        # Los permisos se revisan una vez por cada board de la selección
+        result = apply_bulk_action(current_user_id, bulk)
+        db.session.commit()
+        return result, 200
 
 
 @cards_ns.route("/<int:card_id>")
@@ -129,18 +220,24 @@ class CardResource(Resource):
     @cards_ns.doc(
         "get_card", description="Obtener una tarjeta específica", security="Bearer"
     )
+    @cards_ns.param("fields", "Campos de la tarjeta a devolver, separados por coma")
     @cards_ns.response(200, "Tarjeta obtenida exitosamente", card_response_model)
+    @cards_ns.response(304, "Sin cambios desde el ETag enviado")
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Tarjeta no encontrada", error_model)
     @jwt_required()
     @require_board_access
     def get(self, card_id):
         """Obtener una tarjeta específica"""
-        card = Card.query.get(card_id)
+        card_fields = parse_fields("cards", primary=True)
+        card = project(Card.query, Card, card_fields, extra=("version",)).get(card_id)
         if not card:
             cards_ns.abort(404, "Card not found")
 
-        return card.to_dict(), 200
+        etag = row_etag(card)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        return card.to_dict(card_fields), 200, etag_header(etag)
 
     @cards_ns.doc(
         "update_card", description="Actualizar una tarjeta", security="Bearer"
@@ -149,7 +246,9 @@ class CardResource(Resource):
     @cards_ns.response(200, "Tarjeta actualizada exitosamente", card_response_model)
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Tarjeta o lista no encontrada", error_model)
+    @cards_ns.response(412, "La tarjeta cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, card_id):
         """Actualizar una tarjeta"""
@@ -157,39 +256,36 @@ class CardResource(Resource):
         if not card:
             cards_ns.abort(404, "Card not found")
 
+        etag = row_etag(card)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, card.to_dict())
+
         data = request.get_json()
+        new_list = None
+        if "list_id" in data:
+            # Verificar que la nueva lista existe
+            new_list = List.query.get(data["list_id"])
+            if not new_list:
+                cards_ns.abort(404, "New list not found")
+            if new_list.board_id != card.board_id:
+                authorize_board(int(get_jwt_identity()), new_list.board_id)
+
+        if "list_id" in data or "position" in data:
+            new_board_id = new_list.board_id if new_list else None
+            lock_positions(card.board_id, new_board_id, item=card)
+
         old_list_id = card.list_id
         old_position = card.position
 
-        if "title" in data:
-            card.title = data["title"]
-        if "description" in data:
-            card.description = data["description"]
-        if "due_date" in data:
-            card.due_date = data["due_date"]
-        if "archived" in data:
-            card.archived = data["archived"]
-
         # Manejar cambios de lista y/o posición
         new_list_id = data.get("list_id", old_list_id)
         new_position = data.get("position")
 
-        if "list_id" in data:
-            # Verificar que la nueva lista existe
-            new_list = List.query.get(data["list_id"])
-            if not new_list:
-                cards_ns.abort(404, "New list not found")
-
         # Si cambió la lista o la posición, reordenar
-        if new_list_id != old_list_id or (
-            new_position is not None and new_position != old_position
-        ):
-            if new_position is None:
-                new_position = validate_position(Card, "list_id", new_list_id, None)
-            else:
-                new_position = validate_position(
-                    Card, "list_id", new_list_id, new_position
-                )
+        if position_changed(old_list_id, old_position, new_list_id, new_position):
+            new_position = validate_position(
+                Card, "list_id", new_list_id, new_position, item=card
+            )
 
             reorder_on_move(
                 Card,
@@ -200,17 +296,31 @@ class CardResource(Resource):
                 new_list_id,
                 new_position,
             )
+            # Después de reorder_on_move (ver assign_rank)
+            assign_rank(Card, "list_id", card, new_list_id, new_position)
             card.list_id = new_list_id
             card.position = new_position
 
+        # Después de reordenar, para que sus queries no escriban la fila antes
+        if "title" in data:
+            card.title = data["title"]
+        if "description" in data:
+            card.description = data["description"]
+        if "due_date" in data:
+            card.due_date = data["due_date"]
+        if "archived" in data:
+            card.archived = data["archived"]
+
         db.session.commit()
-        return card.to_dict(), 200
+        return card.to_dict(), 200, etag_header(row_etag(card))
 
     @cards_ns.doc("delete_card", description="Eliminar una tarjeta", security="Bearer")
     @cards_ns.response(200, "Tarjeta eliminada exitosamente")
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Tarjeta no encontrada", error_model)
+    @cards_ns.response(412, "La tarjeta cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def delete(self, card_id):
         """Eliminar una tarjeta"""
@@ -218,6 +328,11 @@ class CardResource(Resource):
         if not card:
             cards_ns.abort(404, "Card not found")
 
+        etag = row_etag(card)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, card.to_dict())
+
+        lock_positions(card.board_id, item=card)
         list_id = card.list_id
         position = card.position
 
@@ -236,7 +351,9 @@ class CardArchive(Resource):
     @cards_ns.response(200, "Tarjeta archivada exitosamente", card_response_model)
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Tarjeta no encontrada", error_model)
+    @cards_ns.response(412, "La tarjeta cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, card_id):
         """Archivar una tarjeta"""
@@ -244,9 +361,13 @@ class CardArchive(Resource):
         if not card:
             cards_ns.abort(404, "Card not found")
 
+        etag = row_etag(card)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, card.to_dict())
+
         card.archived = True
         db.session.commit()
-        return card.to_dict(), 200
+        return card.to_dict(), 200, etag_header(row_etag(card))
 
 
 @cards_ns.route("/<int:card_id>/unarchive")
@@ -258,7 +379,9 @@ class CardUnarchive(Resource):
     @cards_ns.response(200, "Tarjeta desarchivada exitosamente", card_response_model)
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Tarjeta no encontrada", error_model)
+    @cards_ns.response(412, "La tarjeta cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, card_id):
         """Desarchivar una tarjeta"""
@@ -266,9 +389,13 @@ class CardUnarchive(Resource):
         if not card:
             cards_ns.abort(404, "Card not found")
 
+        etag = row_etag(card)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, card.to_dict())
+
         card.archived = False
         db.session.commit()
-        return card.to_dict(), 200
+        return card.to_dict(), 200, etag_header(row_etag(card))
 
 
 @cards_ns.route("/<int:card_id>/move")
@@ -284,7 +411,9 @@ class CardMove(Resource):
     @cards_ns.response(400, "Datos inválidos", error_model)
     @cards_ns.response(401, "No autorizado", error_model)
     @cards_ns.response(404, "Tarjeta o lista no encontrada", error_model)
+    @cards_ns.response(412, "La tarjeta cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, card_id):
         """Mover una tarjeta a otra lista y/o posición"""
@@ -292,6 +421,10 @@ class CardMove(Resource):
         if not card:
             cards_ns.abort(404, "Card not found")
 
+        etag = row_etag(card)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, card.to_dict())
+
         data = request.get_json()
         new_list_id = data.get("list_id")
         new_position = data.get("position")
@@ -299,23 +432,31 @@ class CardMove(Resource):
         if new_list_id is None and new_position is None:
             cards_ns.abort(400, "list_id or position is required")
 
+        new_board_id = None
+        if new_list_id is not None:
+            # Verificar que la nueva lista existe
+            new_list = List.query.get(new_list_id)
+            if not new_list:
+                cards_ns.abort(404, "New list not found")
+            new_board_id = new_list.board_id
+            if new_board_id != card.board_id:
+                authorize_board(int(get_jwt_identity()), new_board_id)
+
+        lock_positions(card.board_id, new_board_id, item=card)
         old_list_id = card.list_id
         old_position = card.position
 
         # Usar list_id actual si no se proporciona uno nuevo
         if new_list_id is None:
             new_list_id = old_list_id
-        else:
-            # Verificar que la nueva lista existe
-            new_list = List.query.get(new_list_id)
-            if not new_list:
-                cards_ns.abort(404, "New list not found")
 
         # Validar y obtener posición
-        new_position = validate_position(Card, "list_id", new_list_id, new_position)
+        new_position = validate_position(
+            Card, "list_id", new_list_id, new_position, item=card
+        )
 
         # Solo reordenar si realmente cambia algo
-        if new_list_id != old_list_id or new_position != old_position:
+        if position_changed(old_list_id, old_position, new_list_id, new_position):
             reorder_on_move(
                 Card,
                 "list_id",
@@ -325,8 +466,10 @@ class CardMove(Resource):
                 new_list_id,
                 new_position,
             )
+            # Después de reorder_on_move (ver assign_rank)
+            assign_rank(Card, "list_id", card, new_list_id, new_position)
             card.list_id = new_list_id
             card.position = new_position
 
         db.session.commit()
-        return card.to_dict(), 200
+        return card.to_dict(), 200, etag_header(row_etag(card))
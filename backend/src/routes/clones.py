@@ -0,0 +1,56 @@
+from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.db import db
+from src.models import CloneJob
+
+# Crear namespace para el seguimiento de copias
+clones_ns = Namespace("clones", description="Progreso de la copia de tableros y listas")
+
+clone_response_model = clones_ns.model(
+    "CloneResponse",
+    {
+        "id": fields.Integer(description="ID de la copia"),
+        "entity_type": fields.String(description="board o list"),
+        "source_id": fields.Integer(description="ID del tablero o lista original"),
+        "target_id": fields.Integer(description="ID del tablero o lista nuevo"),
+        "board_id": fields.Integer(description="ID del tablero destino"),
+        "include_archived": fields.Boolean(description="Copia tarjetas archivadas"),
+        "include_descriptions": fields.Boolean(description="Copia descripciones"),
+        "status": fields.String(description="pending, running, done o failed"),
+        "copied_lists": fields.Integer(description="Listas copiadas"),
+        "copied_cards": fields.Integer(description="Tarjetas copiadas"),
+        "error": fields.String(description="Error del último intento"),
+        "created_at": fields.DateTime(description="Fecha del pedido"),
+        "updated_at": fields.DateTime(description="Fecha del último avance"),
+        "finished_at": fields.DateTime(description="Fecha de finalización"),
+    },
+)
+
+error_model = clones_ns.model(
+    "Error",
+    {
+        "error": fields.String(description="Mensaje de error"),
+        "message": fields.String(description="Mensaje de error"),
+    },
+)
+
+
+@clones_ns.route("/<int:job_id>")
+@clones_ns.param("job_id", "ID de la copia")
+class Clone(Resource):
+    @clones_ns.doc(
+        "get_clone",
+        description="Consultar el progreso de la copia de un tablero o lista",
+        security="Bearer",
+    )
+    @clones_ns.response(200, "Progreso de la copia", clone_response_model)
+    @clones_ns.response(401, "No autorizado", error_model)
+    @clones_ns.response(404, "Copia no encontrada", error_model)
+    @jwt_required()
+    def get(self, job_id):
+        """Obtener el progreso de una copia pedida por el usuario"""
+        current_user_id = int(get_jwt_identity())
+        job = db.session.get(CloneJob, job_id)
+        if not job or job.requested_by != current_user_id:
+            clones_ns.abort(404, "Clone not found")
+        return job.to_dict(), 200
@@ -0,0 +1,58 @@
+from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.db import db
+from src.models import DeletionJob
+
+# Crear namespace para el seguimiento de bajas
+deletions_ns = Namespace(
+    "deletions", description="Progreso del borrado de tableros y listas"
+)
+
+deletion_response_model = deletions_ns.model(
+    "DeletionResponse",
+    {
+        "id": fields.Integer(description="ID del borrado"),
+        "entity_type": fields.String(description="board o list"),
+        "entity_id": fields.Integer(description="ID del tablero o lista eliminado"),
+        "board_id": fields.Integer(description="ID del tablero"),
+        "status": fields.String(description="pending, running, done o failed"),
+        "total_lists": fields.Integer(description="Listas a borrar"),
+        "deleted_lists": fields.Integer(description="Listas ya borradas"),
+        "total_cards": fields.Integer(description="Tarjetas a borrar"),
+        "deleted_cards": fields.Integer(description="Tarjetas ya borradas"),
+        "error": fields.String(description="Error del último intento"),
+        "created_at": fields.DateTime(description="Fecha de la baja"),
+        "updated_at": fields.DateTime(description="Fecha del último avance"),
+        "finished_at": fields.DateTime(description="Fecha de finalización"),
+    },
+)
+
+error_model = deletions_ns.model(
+    "Error",
+    {
+        "error": fields.String(description="Mensaje de error"),
+        "message": fields.String(description="Mensaje de error"),
+    },
+)
+
+
+@deletions_ns.route("/<int:job_id>")
+@deletions_ns.param("job_id", "ID del borrado")
+class Deletion(Resource):
+    @deletions_ns.doc(
+        "get_deletion",
+        description="Consultar el progreso del borrado de un tablero o lista",
+        security="Bearer",
+    )
+    @deletions_ns.response(200, "Progreso del borrado", deletion_response_model)
+    @deletions_ns.response(401, "No autorizado", error_model)
+    @deletions_ns.response(404, "Borrado no encontrado", error_model)
+    @jwt_required()
+    def get(self, job_id):
+        """Obtener el progreso de un borrado pedido por el usuario"""
+        current_user_id = int(get_jwt_identity())
+        job = db.session.get(DeletionJob, job_id)
+        # Solo quien lo pidió: el board ya no existe para resolver permisos
+        if not job or job.requested_by != current_user_id:
+            deletions_ns.abort(404, "Deletion not found")
+        return job.to_dict(), 200
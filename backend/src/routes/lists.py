@@ -1,14 +1,40 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.decorators import require_board_access
+from src.decorators import (
+    get_current_board,
+    authorize_board,
+    require_board_access,
+    retry_on_conflict,
+)
 from src.models import List, Board, Card
 from src.db import db
+from src.utils.board_cache import cached_board_response
+from src.utils.board_versions import board_etag, row_etag
+from src.utils.clones import parse_clone_options, schedule_clone, start_clone
+from src.utils.deletions import schedule_deletion, start_deletion
+from src.utils.fieldsets import (
+    fields_variant,
+    list_cards_loader,
+    parse_fields,
+    project,
+)
+from src.utils.http_cache import (
+    etag_header,
+    is_not_modified,
+    is_precondition_failed,
+    not_modified,
+    precondition_failed,
+)
+from src.utils.pagination import page_variant, paginate_cards, parse_card_page_args
 from src.utils.position_helpers import (
     adjust_positions_on_insert,
     validate_position,
     compact_positions_on_delete,
     reorder_on_move,
+    assign_rank,
+    lock_positions,
+    position_changed,
 )
 
 # Crear namespace para lists
@@ -45,6 +71,25 @@ list_move_model = lists_ns.model(
     },
 )
 
+list_clone_model = lists_ns.model(
+    "ListClone",
+    {
+        "title": fields.String(
+            description="Título de la lista nueva (por defecto, el de la original)"
+        ),
+        "board_id": fields.Integer(
+            description="ID del tablero destino (por defecto, el de la original)"
+        ),
+        "position": fields.Float(description="Posición en el tablero destino"),
+        "include_archived": fields.Boolean(
+            description="Copiar también las tarjetas archivadas", default=True
+        ),
+        "include_descriptions": fields.Boolean(
+            description="Copiar las descripciones de las tarjetas", default=True
+        ),
+    },
+)
+
 list_response_model = lists_ns.model(
     "ListResponse",
     {
@@ -52,6 +97,8 @@ list_response_model = lists_ns.model(
         "title": fields.String(description="Título de la lista"),
         "board_id": fields.Integer(description="ID del tablero"),
         "position": fields.Float(description="Posición en el tablero"),
+        "rank": fields.String(description="Clave de orden dentro del tablero"),
+        "version": fields.Integer(description="Versión de la fila (ETag)"),
         "created_at": fields.DateTime(description="Fecha de creación"),
     },
 )
@@ -86,6 +133,7 @@ class ListCollection(Resource):
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Tablero no encontrado", error_model)
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def post(self):
         """Crear una nueva lista"""
@@ -98,20 +146,24 @@ class ListCollection(Resource):
             lists_ns.abort(400, "Title and board_id are required")
 
         # Verificar que el board existe
-        board = Board.query.get(board_id)
+        board = get_current_board(board_id)
         if not board:
             lists_ns.abort(404, "Board not found")
 
+        lock_positions(board_id)
+
         # Validar y obtener posición
         position = validate_position(List, "board_id", board_id, position)
 
+        new_list = List(title=title, board_id=board_id, position=position)
+        assign_rank(List, "board_id", new_list, board_id, position)
+
         # Ajustar posiciones de listas existentes
         adjust_positions_on_insert(List, "board_id", board_id, position)
 
-        new_list = List(title=title, board_id=board_id, position=position)
         db.session.add(new_list)
         db.session.commit()
-        return new_list.to_dict(), 201
+        return new_list.to_dict(), 201, etag_header(row_etag(new_list))
 
 
 @lists_ns.route("/<int:list_id>")
@@ -122,6 +174,8 @@ class ListResource(Resource):
         "get_list", description="Obtener una lista específica", security="Bearer"
     )
     @lists_ns.param("board_id", "ID del tablero")
+    @lists_ns.param("fields", "Campos de la lista a devolver, separados por coma")
+    @lists_ns.param("fields[cards]", "Campos de las tarjetas a devolver")
     @lists_ns.response(200, "Lista obtenida exitosamente", list_response_model)
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista no encontrada", error_model)
@@ -131,19 +185,30 @@ class ListResource(Resource):
         """Obtener una lista específica"""
         current_user_id = int(get_jwt_identity())
         board_id = request.args.get("board_id", type=int)
-        list_obj = List.query.filter_by(id=list_id, board_id=board_id).first()
+        list_fields = parse_fields("lists", primary=True)
+        card_fields = parse_fields("cards")
+
+        query = List.query.filter_by(id=list_id, board_id=board_id).options(
+            list_cards_loader(card_fields)
+        )
+        list_obj = project(query, List, list_fields).first()
 
         if not list_obj:
             lists_ns.abort(404, "List not found")
 
-        return list_obj.to_dict(), 200
+        return (
+            list_obj.to_dict(list_fields, include_cards=True, card_fields=card_fields),
+            200,
+        )
 
     @lists_ns.doc("update_list", description="Actualizar una lista", security="Bearer")
     @lists_ns.expect(list_update_model)
     @lists_ns.response(200, "Lista actualizada exitosamente", list_response_model)
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista o tablero no encontrado", error_model)
+    @lists_ns.response(412, "La lista cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, list_id):
         """Actualizar una lista"""
@@ -151,33 +216,34 @@ class ListResource(Resource):
         if not list_obj:
             lists_ns.abort(404, "List not found")
 
+        etag = row_etag(list_obj)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, list_obj.to_dict())
+
         data = request.get_json()
+        if "board_id" in data:
+            # Verificar que el nuevo board existe
+            new_board = Board.query.get(data["board_id"])
+            if not new_board:
+                lists_ns.abort(404, "Board not found")
+            if new_board.id != list_obj.board_id:
+                authorize_board(int(get_jwt_identity()), new_board.id)
+
+        if "board_id" in data or "position" in data:
+            lock_positions(list_obj.board_id, data.get("board_id"), item=list_obj)
+
         old_board_id = list_obj.board_id
         old_position = list_obj.position
 
-        if "title" in data:
-            list_obj.title = data["title"]
-
         # Manejar cambios de board y/o posición
         new_board_id = data.get("board_id", old_board_id)
         new_position = data.get("position")
 
-        if "board_id" in data:
-            # Verificar que el nuevo board existe
-            new_board = Board.query.get(data["board_id"])
-            if not new_board:
-                lists_ns.abort(404, "Board not found")
-
         # Si cambió el board o la posición, reordenar
-        if new_board_id != old_board_id or (
-            new_position is not None and new_position != old_position
-        ):
-            if new_position is None:
-                new_position = validate_position(List, "board_id", new_board_id, None)
-            else:
-                new_position = validate_position(
-                    List, "board_id", new_board_id, new_position
-                )
+        if position_changed(old_board_id, old_position, new_board_id, new_position):
+            new_position = validate_position(
+                List, "board_id", new_board_id, new_position, item=list_obj
+            )
 
             reorder_on_move(
                 List,
@@ -188,17 +254,27 @@ class ListResource(Resource):
                 new_board_id,
                 new_position,
             )
+            # Después de reorder_on_move (ver assign_rank)
+            assign_rank(List, "board_id", list_obj, new_board_id, new_position)
             list_obj.board_id = new_board_id
             list_obj.position = new_position
 
+        # Después de reordenar, para que sus queries no escriban la fila antes
+        if "title" in data:
+            list_obj.title = data["title"]
+
         db.session.commit()
-        return list_obj.to_dict(), 200
+        return list_obj.to_dict(), 200, etag_header(row_etag(list_obj))
 
     @lists_ns.doc("delete_list", description="Eliminar una lista", security="Bearer")
-    @lists_ns.response(200, "Lista eliminada exitosamente")
+    @lists_ns.response(
+        202, "Lista eliminada; sus tarjetas se purgan en segundo plano"
+    )
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista no encontrada", error_model)
+    @lists_ns.response(412, "La lista cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def delete(self, list_id):
         """Eliminar una lista"""
@@ -206,15 +282,26 @@ class ListResource(Resource):
         if not list_obj:
             lists_ns.abort(404, "List not found")
 
+        etag = row_etag(list_obj)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, list_obj.to_dict())
+
+        lock_positions(list_obj.board_id, item=list_obj)
         board_id = list_obj.board_id
         position = list_obj.position
 
-        db.session.delete(list_obj)
+        # Queda oculta enseguida; sus cards se borran por lotes después
+        job = schedule_deletion(list_obj, int(get_jwt_identity()))
         # Compactar posiciones de las listas restantes
         compact_positions_on_delete(List, "board_id", board_id, position)
 
         db.session.commit()
-        return {"message": "List deleted successfully"}, 200
+        start_deletion(job.id)
+        return (
+            {"message": "List deleted successfully", "deletion": job.to_dict()},
+            202,
+            {"Location": f"/deletions/{job.id}"},
+        )
 
 
 @lists_ns.route("/<int:list_id>/cards")
@@ -225,20 +312,36 @@ class ListCards(Resource):
         description="Obtener todas las tarjetas de una lista",
         security="Bearer",
     )
-    @lists_ns.response(200, "Lista de tarjetas obtenida exitosamente")
+    @lists_ns.param("limit", "Tarjetas por página (por defecto 100, máximo 500)")
+    @lists_ns.param("cursor", "Cursor next_cursor de la página anterior")
+    @lists_ns.param("archived", "true/false para filtrar por estado archivado")
+    @lists_ns.param("fields", "Campos de las tarjetas a devolver, separados por coma")
+    @lists_ns.response(200, "Página de tarjetas obtenida exitosamente")
+    @lists_ns.response(304, "Sin cambios desde el ETag enviado")
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista no encontrada", error_model)
     @jwt_required()
     @require_board_access
     def get(self, list_id):
-        """Obtener tarjetas de una lista"""
+        """Obtener tarjetas de una lista paginadas por cursor"""
         current_user_id = int(get_jwt_identity())
         list_obj = List.query.get(list_id)
         if not list_obj:
             lists_ns.abort(404, "List not found")
 
-        cards = [card.to_dict() for card in list_obj.cards]
-        return cards, 200
+        page = parse_card_page_args()
+        card_fields = parse_fields("cards", primary=True)
+        board = list_obj.board
+        etag = board_etag(board)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        def build_payload():
+            return paginate_cards(Card.list_id == list_id, fields=card_fields, **page)
+
+        variant = page_variant(f"list-cards:{list_id}", page)
+        variant += ":" + fields_variant(card_fields)
+        return cached_board_response(board, variant, build_payload, etag)
 
     @lists_ns.doc(
         "add_card_to_list",
@@ -251,6 +354,7 @@ class ListCards(Resource):
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista no encontrada", error_model)
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def post(self, list_id):
         """Agregar tarjeta a una lista"""
@@ -268,12 +372,11 @@ class ListCards(Resource):
         if not title:
             lists_ns.abort(400, "Title is required")
 
+        lock_positions(list_obj.board_id)
+
         # Validar y obtener posición
         position = validate_position(Card, "list_id", list_id, position)
 
-        # Ajustar posiciones de cards existentes
-        adjust_positions_on_insert(Card, "list_id", list_id, position)
-
         new_card = Card(
             title=title,
             description=description,
@@ -281,9 +384,14 @@ class ListCards(Resource):
             position=position,
             due_date=due_date,
         )
+        assign_rank(Card, "list_id", new_card, list_id, position)
+
+        # Ajustar posiciones de cards existentes
+        adjust_positions_on_insert(Card, "list_id", list_id, position)
+
         db.session.add(new_card)
         db.session.commit()
-        return new_card.to_dict(), 201
+        return new_card.to_dict(), 201, etag_header(row_etag(new_card))
 
 
 @lists_ns.route("/<int:list_id>/position")
@@ -299,7 +407,9 @@ class ListPosition(Resource):
     @lists_ns.response(400, "Datos inválidos", error_model)
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista no encontrada", error_model)
+    @lists_ns.response(412, "La lista cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, list_id):
         """Actualizar la posición de una lista"""
@@ -308,20 +418,27 @@ class ListPosition(Resource):
         if not list_obj:
             lists_ns.abort(404, "List not found")
 
+        etag = row_etag(list_obj)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, list_obj.to_dict())
+
         data = request.get_json()
         new_position = data.get("position")
 
         if new_position is None:
             lists_ns.abort(400, "position is required")
 
+        lock_positions(list_obj.board_id, item=list_obj)
         old_board_id = list_obj.board_id
         old_position = list_obj.position
 
         # Validar y obtener posición
-        new_position = validate_position(List, "board_id", old_board_id, new_position)
+        new_position = validate_position(
+            List, "board_id", old_board_id, new_position, item=list_obj
+        )
 
         # Solo reordenar si realmente cambia la posición
-        if new_position != old_position:
+        if position_changed(old_board_id, old_position, old_board_id, new_position):
             reorder_on_move(
                 List,
                 "board_id",
@@ -331,10 +448,12 @@ class ListPosition(Resource):
                 old_board_id,
                 new_position,
             )
+            # Después de reorder_on_move (ver assign_rank)
+            assign_rank(List, "board_id", list_obj, old_board_id, new_position)
             list_obj.position = new_position
 
         db.session.commit()
-        return list_obj.to_dict(), 200
+        return list_obj.to_dict(), 200, etag_header(row_etag(list_obj))
 
 
 @lists_ns.route("/<int:list_id>/move")
@@ -350,7 +469,9 @@ class ListMove(Resource):
     @lists_ns.response(400, "Datos inválidos", error_model)
     @lists_ns.response(401, "No autorizado", error_model)
     @lists_ns.response(404, "Lista o tablero no encontrado", error_model)
+    @lists_ns.response(412, "La lista cambió desde el ETag de If-Match")
     @jwt_required()
+    @retry_on_conflict
     @require_board_access
     def put(self, list_id):
         """Mover una lista a otro board y/o posición"""
@@ -359,6 +480,10 @@ class ListMove(Resource):
         if not list_obj:
             lists_ns.abort(404, "List not found")
 
+        etag = row_etag(list_obj)
+        if is_precondition_failed(etag):
+            return precondition_failed(etag, list_obj.to_dict())
+
         data = request.get_json()
         new_board_id = data.get("board_id")
         new_position = data.get("position")
@@ -366,23 +491,29 @@ class ListMove(Resource):
         if new_board_id is None and new_position is None:
             lists_ns.abort(400, "board_id or position is required")
 
+        if new_board_id is not None:
+            # Verificar que el nuevo board existe
+            new_board = Board.query.get(new_board_id)
+            if not new_board:
+                lists_ns.abort(404, "New board not found")
+            if new_board_id != list_obj.board_id:
+                authorize_board(current_user_id, new_board_id)
+
+        lock_positions(list_obj.board_id, new_board_id, item=list_obj)
         old_board_id = list_obj.board_id
         old_position = list_obj.position
 
         # Usar board_id actual si no se proporciona uno nuevo
         if new_board_id is None:
             new_board_id = old_board_id
-        else:
-            # Verificar que el nuevo board existe
-            new_board = Board.query.get(new_board_id)
-            if not new_board:
-                lists_ns.abort(404, "New board not found")
 
         # Validar y obtener posición
-        new_position = validate_position(List, "board_id", new_board_id, new_position)
+        new_position = validate_position(
+            List, "board_id", new_board_id, new_position, item=list_obj
+        )
 
         # Solo reordenar si realmente cambia algo
-        if new_board_id != old_board_id or new_position != old_position:
+        if position_changed(old_board_id, old_position, new_board_id, new_position):
             reorder_on_move(
                 List,
                 "board_id",
@@ -392,8 +523,68 @@ class ListMove(Resource):
                 new_board_id,
                 new_position,
             )
+            # Después de reorder_on_move (ver assign_rank)
+            assign_rank(List, "board_id", list_obj, new_board_id, new_position)
             list_obj.board_id = new_board_id
             list_obj.position = new_position
 
         db.session.commit()
-        return list_obj.to_dict(), 200
+        return list_obj.to_dict(), 200, etag_header(row_etag(list_obj))
+
+
+@lists_ns.route("/<int:list_id>/clone")
+@lists_ns.param("list_id", "ID de la lista a copiar")
+class ListClone(Resource):
+    @lists_ns.doc(
+        "clone_list",
+        description=(
+            "Copiar una lista con sus tarjetas en el mismo tablero o en otro; "
+            "las copias grandes siguen en segundo plano"
+        ),
+        security="Bearer",
+    )
+    @lists_ns.expect(list_clone_model)
+    @lists_ns.response(201, "Lista copiada")
+    @lists_ns.response(202, "Lista creada; las tarjetas se copian en segundo plano")
+    @lists_ns.response(400, "Datos inválidos", error_model)
+    @lists_ns.response(401, "No autorizado", error_model)
+    @lists_ns.response(403, "Sin acceso a la lista o al tablero destino", error_model)
+    @lists_ns.response(404, "Lista o tablero no encontrado", error_model)
+    @lists_ns.response(500, "La copia falló", error_model)
+    @jwt_required()
+    @retry_on_conflict
+    @require_board_access
+    def post(self, list_id):
+        """Copiar una lista con INSERT ... SELECT"""
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True) or {}
+        options = parse_clone_options(data)
+        list_obj = List.query.get(list_id)
+        if not list_obj:
+            lists_ns.abort(404, "List not found")
+
+        # El decorador autorizó el board de la lista (origen); un board_id en el
+        # cuerpo es el destino y se autoriza aparte
+        board_id = data.get("board_id") or list_obj.board_id
+        if board_id != list_obj.board_id:
+            authorize_board(current_user_id, board_id)
+
+        lock_positions(board_id)
+        position = validate_position(List, "board_id", board_id, data.get("position"))
+        new_list = List(
+            title=data.get("title") or list_obj.title,
+            board_id=board_id,
+            position=position,
+        )
+        assign_rank(List, "board_id", new_list, board_id, position)
+        adjust_positions_on_insert(List, "board_id", board_id, position)
+        job = schedule_clone(list_obj, new_list, current_user_id, **options)
+        db.session.commit()
+
+        if start_clone(job):
+            body = {"list": new_list.to_dict(), "clone": job.to_dict()}
+            return body, 202, {"Location": f"/clones/{job.id}"}
+        if job.status == "failed":
+            lists_ns.abort(500, "Clone failed")
+        body = {"list": new_list.to_dict(), "clone": job.to_dict()}
+        return body, 201, etag_header(row_etag(new_list))
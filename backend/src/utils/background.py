@@ -0,0 +1,60 @@
+"""
+Pool de hilos del proceso para trabajos largos que no deben correr dentro de un
+request (purgado de borrados y clonado de boards grandes).
+
+Cada trabajo recibe el id de su registro en la base y corre en su propio app
+context, así que usa una sesión aparte. Con BACKGROUND_WORKER_THREADS = 0 no se
+encola nada y cada llamador decide qué hacer (ver deletions.py y clones.py).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def submit_job(function, job_id):
+    """
+    Encola function(job_id) en el pool de hilos del proceso.
+
+    Returns:
+        bool: False si el pool está desactivado (BACKGROUND_WORKER_THREADS = 0)
+    """
+    threads = current_app.config["BACKGROUND_WORKER_THREADS"]
+    if threads <= 0:
+        return False
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=threads, thread_name_prefix="background"
+            )
+    _executor.submit(_run_in_app, current_app._get_current_object(), function, job_id)
+    return True
+
+
+def _run_in_app(app, function, job_id):
+    with app.app_context():
+        try:
+            function(job_id)
+        except Exception:
+            app.logger.exception(
+                "Background job %s(%s) failed", function.__name__, job_id
+            )
+
+
+def shutdown_background_jobs():
+    """
+    Cierra el pool al apagar el proceso: descarta los trabajos que no empezaron
+    (su job queda pendiente para los comandos `flask deletions run` y
+    `flask clones run`) y espera a los que están corriendo.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,217 @@
+"""
+Aplicación de una secuencia de movimientos de cards y listas en una transacción.
+
+Cada movimiento calcula la clave rank del elemento movido a partir de sus dos
+vecinos y escribe solo esa fila, así que el costo depende de la cantidad de
+movimientos y no del tamaño de las listas. Al final las posiciones densas de
+los padres afectados se renumeran con un único UPDATE por modelo. Son UPDATE de
+Core: el log de cambios y la versión del board se registran explícitamente.
+"""
+
+from sqlalchemy import bindparam, select
+from werkzeug.exceptions import BadRequest, NotFound
+
+from src.db import db
+from src.models import Card, List
+from src.utils.board_versions import mark_boards_changed
+from src.utils.change_tracking import record_bulk_updates
+from src.utils.position_helpers import (
+    lock_positions,
+    rank_at,
+    renumber_positions,
+    uses_rank_ordering,
+)
+
+MAX_MOVES = 500
+
+MOVE_TYPES = ("card", "list")
+
+
+def parse_moves(data):
+    """
+    Valida el cuerpo {"moves": [...]} y normaliza cada movimiento.
+
+    Cada movimiento es {"type": "card", "id", "list_id"?, "position"?} o
+    {"type": "list", "id", "position"}. Sin position la card va al final.
+
+    Returns:
+        list[dict]: Movimientos con type, id, list_id y position
+
+    Raises:
+        BadRequest: Si algún movimiento no es válido
+    """
+    moves = (data or {}).get("moves")
+    if not isinstance(moves, list) or not moves:
+        raise BadRequest("moves must be a non-empty list")
+    if len(moves) > MAX_MOVES:
+        raise BadRequest(f"At most {MAX_MOVES} moves per request")
+
+    parsed = []
+    for index, move in enumerate(moves):
+        if not isinstance(move, dict) or move.get("type") not in MOVE_TYPES:
+            raise BadRequest(f"moves[{index}]: type must be 'card' or 'list'")
+        for key in ("id", "list_id", "position"):
+            value = move.get(key)
+            if value is not None and (
+                not isinstance(value, int) or isinstance(value, bool)
+            ):
+                raise BadRequest(f"moves[{index}]: {key} must be an integer")
+        if move.get("id") is None:
+            raise BadRequest(f"moves[{index}]: id is required")
+        if move["type"] == "list" and move.get("position") is None:
+            raise BadRequest(f"moves[{index}]: position is required for lists")
+        parsed.append(
+            {
+                "type": move["type"],
+                "id": move["id"],
+                "list_id": move.get("list_id") if move["type"] == "card" else None,
+                "position": move.get("position"),
+            }
+        )
+    return parsed
+
+
+def _write_move(model, item_id, rank, **values):
+    """Escribe la clave rank (y el padre) de un elemento movido."""
+    table = model.__table__
+    db.session.execute(
+        table.update()
+        .where(table.c.id == item_id)
+        .values(rank=rank, version=table.c.version + 1, **values)
+    )
+
+
+def _final_order(model, parent_id_field, parent_ids):
+    """
+    Orden final de los hijos de los padres dados, con su índice como position.
+
+    Returns:
+        list[dict]: id, el campo del padre (solo cards), position y rank
+    """
+    parent = getattr(model, parent_id_field)
+    rows = db.session.execute(
+        select(model.id, parent, model.rank)
+        .where(parent.in_(parent_ids))
+        .order_by(parent, model.rank, model.id)
+    )
+    order = []
+    index, current = 0, None
+    for item_id, parent_id, rank in rows:
+        index = index + 1 if parent_id == current else 0
+        current = parent_id
+        entry = {"id": item_id, "position": index, "rank": rank}
+        if model is Card:
+            entry["list_id"] = parent_id
+        order.append(entry)
+    return order
+
+
+def _store_rank_positions(model, order, moved):
+    """
+    En modo rank no se renumera: solo los elementos movidos guardan su índice
+    final, con un UPDATE en lote.
+    """
+    table = model.__table__
+    rows = [
+        {"item_id": entry["id"], "new_position": entry["position"]}
+        for entry in order
+        if entry["id"] in moved
+    ]
+    if rows:
+        db.session.execute(
+            table.update()
+            .where(table.c.id == bindparam("item_id"))
+            .values(position=bindparam("new_position")),
+            rows,
+        )
+
+
+def apply_moves(board_id, moves):
+    """
+    Aplica los movimientos en orden dentro del board y deja los cambios en la
+    sesión sin confirmar.
+
+    Args:
+        board_id: ID del board (ya autorizado)
+        moves: Movimientos normalizados por parse_moves
+
+    Returns:
+        dict: Orden final de los padres afectados:
+            {"lists": [...], "cards": [...]} con id, position y rank (y list_id)
+
+    Raises:
+        NotFound: Si una card o lista no pertenece al board
+    """
+    lock_positions(board_id)
+    list_ids = {move["id"] for move in moves if move["type"] == "list"}
+    target_list_ids = {
+        move["list_id"]
+        for move in moves
+        if move["type"] == "card" and move["list_id"] is not None
+    }
+    card_ids = {move["id"] for move in moves if move["type"] == "card"}
+
+    board_list_ids = set(
+        db.session.scalars(
+            select(List.id).where(
+                List.id.in_(list_ids | target_list_ids), List.board_id == board_id
+            )
+        )
+    )
+    for move in moves:
+        list_id = move["id"] if move["type"] == "list" else move["list_id"]
+        if list_id is not None and list_id not in board_list_ids:
+            raise NotFound(f"List {list_id} not found in board")
+
+    # Padre actual de cada card, que se actualiza con cada movimiento
+    card_parent = {}
+    if card_ids:
+        card_parent = dict(
+            db.session.execute(
+                select(Card.id, Card.list_id).where(
+                    Card.id.in_(card_ids), Card.board_id == board_id
+                )
+            ).all()
+        )
+        missing = card_ids - card_parent.keys()
+        if missing:
+            raise NotFound(f"Card {min(missing)} not found in board")
+    affected_list_ids = set(card_parent.values()) | target_list_ids
+
+    for move in moves:
+        if move["type"] == "list":
+            rank = rank_at(
+                List, "board_id", board_id, move["position"], exclude_id=move["id"]
+            )
+            _write_move(List, move["id"], rank)
+        else:
+            target = move["list_id"] or card_parent[move["id"]]
+            rank = rank_at(
+                Card, "list_id", target, move["position"], exclude_id=move["id"]
+            )
+            _write_move(Card, move["id"], rank, list_id=target)
+            card_parent[move["id"]] = target
+
+    # Los UPDATE de Core no pasan por el flush
+    for obj in list(db.session.identity_map.values()):
+        if (isinstance(obj, List) and obj.id in list_ids) or (
+            isinstance(obj, Card) and obj.id in card_ids
+        ):
+            db.session.expire(obj)
+    if list_ids:
+        record_bulk_updates(List, List.id.in_(list_ids))
+        renumber_positions(List, "board_id", [board_id])
+    if card_ids:
+        record_bulk_updates(Card, Card.id.in_(card_ids))
+        renumber_positions(Card, "list_id", sorted(affected_list_ids))
+    mark_boards_changed(db.session, {board_id})
+
+    result = {"lists": [], "cards": []}
+    if list_ids:
+        result["lists"] = _final_order(List, "board_id", [board_id])
+    if card_ids:
+        result["cards"] = _final_order(Card, "list_id", sorted(affected_list_ids))
+    if uses_rank_ordering():
+        _store_rank_positions(List, result["lists"], list_ids)
+        _store_rank_positions(Card, result["cards"], card_ids)
+    return result
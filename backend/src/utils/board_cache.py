@@ -0,0 +1,179 @@
+"""
+Cache en proceso de payloads de board ya serializados.
+
+Las entradas se indexan por (board_id, versión, variante), así que una versión
+nueva nunca devuelve datos viejos. Además, al confirmar una transacción que tocó
+un board se descartan sus entradas para liberar memoria enseguida. Los chequeos
+de permisos siguen corriendo en cada request: el cache solo evita serializar.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.utils.board_versions import PENDING_BOARD_IDS_KEY
+from src.utils.http_cache import etag_header
+
+
+class BoardSnapshotCache:
+    """LRU acotado por cantidad de entradas, bytes totales y TTL."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._board_bytes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Funciones observer(hit) que reciben cada acierto o fallo
+        self.observers = []
+
+    def configure(self, max_entries, max_bytes, ttl):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.ttl = ttl
+            self._evict()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, board_id, version, variant):
+        """Retorna el cuerpo JSON cacheado o None."""
+        key = (board_id, version, variant)
+        body = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+            elif entry is not None:
+                body = entry[0]
+                self._entries.move_to_end(key)
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        for observer in self.observers:
+            observer(body is not None)
+        return body
+
+    def put(self, board_id, version, variant, payload):
+        """Serializa payload, lo guarda si entra en los límites y retorna el cuerpo."""
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        if not self.enabled or len(body) > self.max_bytes:
+            return body
+
+        key = (board_id, version, variant)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, time.monotonic() + self.ttl)
+            self._board_bytes[board_id] = self._board_bytes.get(board_id, 0) + len(
+                body
+            )
+            self._total_bytes += len(body)
+            self._evict()
+        return body
+
+    def invalidate(self, board_ids):
+        """Descarta todas las entradas de los boards indicados."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in board_ids]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._board_bytes.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        """Contadores y uso de memoria para exportar como métricas."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "boards": len(self._board_bytes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def board_bytes(self, board_id):
+        """Bytes ocupados por las entradas de un board."""
+        with self._lock:
+            return self._board_bytes.get(board_id, 0)
+
+    def _remove(self, key):
+        body, _ = self._entries.pop(key)
+        board_id = key[0]
+        remaining = self._board_bytes[board_id] - len(body)
+        if remaining:
+            self._board_bytes[board_id] = remaining
+        else:
+            del self._board_bytes[board_id]
+        self._total_bytes -= len(body)
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+
+board_cache = BoardSnapshotCache()
+
+
+def cached_board_response(board, variant, build_payload, etag):
+    """
+    Responde con el payload cacheado del board o lo construye y lo guarda.
+
+    Args:
+        board: El board ya autorizado
+        variant: Identifica la representación (endpoint y parámetros)
+        build_payload: Función sin argumentos que arma el payload
+        etag: ETag a incluir en la respuesta
+    """
+    body = board_cache.get(board.id, board.version, variant)
+    if body is None:
+        body = board_cache.put(board.id, board.version, variant, build_payload())
+    return Response(
+        body, status=200, mimetype="application/json", headers=etag_header(etag)
+    )
+
+
+def _after_commit(session):
+    board_ids = session.info.pop(PENDING_BOARD_IDS_KEY, None)
+    if board_ids:
+        board_cache.invalidate(board_ids)
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_BOARD_IDS_KEY, None)
+
+
+def init_board_cache(app):
+    """Configura el cache desde app.config y registra la invalidación por commit."""
+    board_cache.configure(
+        max_entries=app.config["BOARD_CACHE_MAX_ENTRIES"],
+        max_bytes=app.config["BOARD_CACHE_MAX_BYTES"],
+        ttl=app.config["BOARD_CACHE_TTL"],
+    )
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,115 @@
+"""
+Camino de lectura sin ORM para payloads grandes de boards.
+
+Las lecturas de listas y cards usan selects de Core que devuelven tuplas planas:
+no se crean instancias de modelo, no pasan por el identity map y no hay tracking
+de cambios. Un serializador precompilado por (modelo, campos) arma los dicts y
+formatea las fechas columna por columna.
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+
+from sqlalchemy import DateTime, select
+
+from src.db import db
+from src.models import Card, List
+from src.utils.soft_delete import visible_cards, visible_lists
+
+
+@lru_cache(maxsize=None)
+def row_serializer(model, fields):
+    """
+    Compila una función que convierte filas (tuplas) en dicts con los campos dados.
+    Las filas pueden traer columnas extra al final: se ignoran.
+
+    Args:
+        model: El modelo cuyas columnas se leyeron
+        fields: Tupla de nombres de campo en el orden del select
+    """
+    columns = model.__table__.c
+    datetime_positions = [
+        i for i, name in enumerate(fields) if isinstance(columns[name].type, DateTime)
+    ]
+
+    def serialize_rows(rows):
+        if datetime_positions:
+            rows = [list(row) for row in rows]
+            for i in datetime_positions:
+                for row in rows:
+                    if row[i] is not None:
+                        row[i] = row[i].isoformat()
+        return [dict(zip(fields, row)) for row in rows]
+
+    return serialize_rows
+
+
+def select_fields(model, fields, *extra):
+    """select() de las columnas de fields seguidas de las columnas extra."""
+    columns = model.__table__.c
+    return select(*[columns[name] for name in fields], *extra)
+
+
+def read_board_lists(board_id, list_fields=None, card_fields=None):
+    """
+    Lee las listas de un board con sus cards ordenadas en 2 queries.
+
+    Args:
+        board_id: ID del board
+        list_fields: Campos de lista a devolver (None para todos)
+        card_fields: Campos de card a devolver (None para todos)
+
+    Returns:
+        list[dict]: Listas ordenadas por rank, cada una con su clave "cards"
+    """
+    list_fields = list_fields or List.FIELDS
+    card_fields = card_fields or Card.FIELDS
+    lists = List.__table__
+    cards = Card.__table__
+
+    list_rows = db.session.execute(
+        select_fields(List, list_fields, lists.c.id)
+        .where(lists.c.board_id == board_id, visible_lists())
+        .order_by(lists.c.rank, lists.c.id)
+    ).all()
+
+    card_rows = db.session.execute(
+        select_fields(Card, card_fields, cards.c.list_id)
+        .where(cards.c.board_id == board_id, visible_cards())
+        .order_by(cards.c.list_id, cards.c.rank, cards.c.id)
+    ).all()
+
+    cards_by_list = defaultdict(list)
+    for row, card in zip(card_rows, row_serializer(Card, card_fields)(card_rows)):
+        cards_by_list[row[-1]].append(card)
+
+    result = row_serializer(List, list_fields)(list_rows)
+    for row, list_data in zip(list_rows, result):
+        list_data["cards"] = cards_by_list.get(row[-1], [])
+    return result
+
+
+def read_cards(*criteria, fields=None, limit=None):
+    """
+    Lee cards ordenadas por (rank, id) que cumplen los criterios.
+
+    Args:
+        *criteria: Condiciones sobre columnas de cards
+        fields: Campos a devolver (None para todos)
+        limit: Cantidad máxima de filas
+
+    Returns:
+        tuple: (cards serializadas, filas crudas con rank e id al final)
+    """
+    fields = fields or Card.FIELDS
+    cards = Card.__table__
+    statement = (
+        select_fields(Card, fields, cards.c.rank, cards.c.id)
+        .where(*criteria, visible_cards())
+        .order_by(cards.c.rank, cards.c.id)
+    )
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    rows = db.session.execute(statement).all()
+    return row_serializer(Card, fields)(rows), rows
@@ -0,0 +1,138 @@
+"""
+Versión monotónica por board.
+
+Cada flush que crea, modifica o elimina un Board, List, Card o BoardMember
+incrementa boards.version de los boards afectados. Los endpoints de lectura la
+exponen como ETag para responder 304 sin cargar listas ni cards.
+"""
+
+from collections import namedtuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from src.models import Board, BoardMember, Card, List
+
+# Claves de session.info con lo modificado en la transacción en curso
+PENDING_BOARD_IDS_KEY = "pending_board_ids"
+PENDING_CHANGES_KEY = "pending_entity_changes"
+
+ENTITY_TYPES = {Board: "board", List: "list", Card: "card", BoardMember: "member"}
+
+# Un cambio pendiente sobre una entidad. board_ids son los boards a los que
+# pertenece ahora y previous_board_ids los que dejó (movimientos entre boards).
+EntityChange = namedtuple(
+    "EntityChange",
+    ["obj", "entity_type", "action", "board_ids", "previous_board_ids"],
+)
+
+
+def _current_and_previous(obj, field):
+    """Retorna el valor actual de field y los anteriores si cambió en este flush."""
+    current = getattr(obj, field)
+    history = inspect(obj).attrs[field].history
+    previous = set(history.deleted or ()) - {current, None}
+    return current, previous
+
+
+def collect_changes(session):
+    """
+    Lista los cambios pendientes de la sesión sobre boards, listas, cards y miembros.
+
+    Args:
+        session: La sesión a inspeccionar (antes del flush)
+
+    Returns:
+        list[EntityChange]: Un elemento por entidad modificada
+    """
+    pending = [(obj, "upsert") for obj in session.new]
+    pending += [(obj, "upsert") for obj in session.dirty if session.is_modified(obj)]
+    pending += [(obj, "delete") for obj in session.deleted]
+
+    changes = []
+    for obj, action in pending:
+        entity_type = ENTITY_TYPES.get(type(obj))
+        if entity_type is None:
+            continue
+        if entity_type == "board":
+            board_ids = {obj.id} if obj.id is not None else set()
+            changes.append(EntityChange(obj, entity_type, action, board_ids, set()))
+        else:
+            # Listas, cards (board_id desnormalizado) y miembros
+            board_id, previous = _current_and_previous(obj, "board_id")
+            changes.append(
+                EntityChange(obj, entity_type, action, {board_id} - {None}, previous)
+            )
+
+    return changes
+
+
+def collect_board_ids(changes):
+    """IDs de todos los boards afectados por una lista de EntityChange."""
+    board_ids = set()
+    for change in changes:
+        board_ids.update(change.board_ids)
+        board_ids.update(change.previous_board_ids)
+    return board_ids
+
+
+def bump_board_versions(session, board_ids):
+    """
+    Incrementa la versión de los boards indicados con un único UPDATE.
+
+    Args:
+        session: La sesión activa
+        board_ids: IDs de los boards a incrementar
+    """
+    if not board_ids:
+        return
+
+    boards = Board.__table__
+    session.execute(
+        boards.update()
+        .where(boards.c.id.in_(board_ids))
+        .values(version=boards.c.version + 1)
+    )
+
+    # Los boards ya cargados deben releer la versión nueva
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Board) and obj.id in board_ids:
+            session.expire(obj, ["version", "updated_at"])
+
+
+def mark_boards_changed(session, board_ids):
+    """
+    Incrementa la versión de los boards y los deja pendientes de invalidar en
+    el cache al confirmar la transacción.
+
+    Los INSERT, UPDATE y DELETE de Core no pasan por el flush: quien los
+    ejecuta sobre listas, cards o miembros debe llamar a esta función.
+
+    Args:
+        session: La sesión activa
+        board_ids: IDs de los boards modificados
+    """
+    bump_board_versions(session, board_ids)
+    session.info.setdefault(PENDING_BOARD_IDS_KEY, set()).update(board_ids)
+
+
+def _before_flush(session, flush_context, instances):
+    changes = collect_changes(session)
+    mark_boards_changed(session, collect_board_ids(changes))
+    session.info.setdefault(PENDING_CHANGES_KEY, []).extend(changes)
+
+
+def init_board_versions():
+    """Registra el listener que mantiene boards.version (idempotente)."""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+
+
+def board_etag(board):
+    """ETag fuerte (sin comillas) que identifica la versión actual de un board."""
+    return f"board-{board.id}-v{board.version}"
+
+
+def row_etag(obj):
+    """ETag fuerte de una card o lista: cambia con cada UPDATE de su fila."""
+    return f"{ENTITY_TYPES[type(obj)]}-{obj.id}-v{obj.version}"
@@ -0,0 +1,239 @@
+"""
+Operaciones en bloque sobre cards (POST /cards/bulk).
+
+Las cards se eligen por ids o con un filtro (por ejemplo todas las de una
+lista) y se archivan, desarchivan, borran o mueven al final de otra lista con
+una sentencia por acción, sin cargarlas en la sesión. Los permisos se resuelven
+una vez por board distinto, los boards afectados se bloquean como en cualquier
+cambio de orden y cada lista afectada se renumera una sola vez al final.
+"""
+
+from sqlalchemy import bindparam, func, select
+from werkzeug.exceptions import BadRequest, Forbidden, NotFound
+
+from src.db import db
+from src.decorators import resolve_board_role
+from src.models import Card, List
+from src.utils.board_versions import mark_boards_changed
+from src.utils.change_tracking import record_bulk_updates
+from src.utils.position_helpers import (
+    lock_positions,
+    rebalance_ranks,
+    renumber_positions,
+)
+from src.utils.ranks import RANK_MAX_LENGTH, spread_ranks
+from src.utils.soft_delete import visible_cards
+
+MAX_BULK_IDS = 1000
+
+BULK_ACTIONS = ("archive", "unarchive", "delete", "move")
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_bulk_request(data):
+    """
+    Valida el cuerpo de POST /cards/bulk.
+
+    El cuerpo es {"action", "ids": [...]} o {"action", "filter": {"list_id",
+    "archived"?}}. La acción move pide además list_id, la lista destino.
+
+    Returns:
+        dict: action, ids (ordenados y sin repetir), filter y list_id
+
+    Raises:
+        BadRequest: Si la acción o la selección no son válidas
+    """
+    data = data or {}
+    action = data.get("action")
+    if action not in BULK_ACTIONS:
+        raise BadRequest(f"action must be one of: {', '.join(BULK_ACTIONS)}")
+
+    ids = data.get("ids")
+    selector = data.get("filter")
+    if (ids is None) == (selector is None):
+        raise BadRequest("Exactly one of ids or filter is required")
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(map(_is_int, ids)):
+            raise BadRequest("ids must be a non-empty list of integers")
+        if len(ids) > MAX_BULK_IDS:
+            raise BadRequest(f"At most {MAX_BULK_IDS} ids per request")
+        ids = sorted(set(ids))
+    else:
+        if not isinstance(selector, dict) or not _is_int(selector.get("list_id")):
+            raise BadRequest("filter.list_id must be an integer")
+        archived = selector.get("archived")
+        if archived is not None and not isinstance(archived, bool):
+            raise BadRequest("filter.archived must be a boolean")
+        selector = {"list_id": selector["list_id"], "archived": archived}
+
+    target_list_id = data.get("list_id")
+    if action != "move":
+        target_list_id = None
+    elif not _is_int(target_list_id):
+        raise BadRequest("list_id is required for move")
+
+    return {
+        "action": action,
+        "ids": ids,
+        "filter": selector,
+        "list_id": target_list_id,
+    }
+
+
+def _selection_criteria(bulk):
+    """Condiciones sobre cards que eligen las cards de la operación."""
+    if bulk["ids"] is not None:
+        return [Card.id.in_(bulk["ids"])]
+    criteria = [Card.list_id == bulk["filter"]["list_id"]]
+    if bulk["filter"]["archived"] is not None:
+        criteria.append(Card.archived.is_(bulk["filter"]["archived"]))
+    return criteria
+
+
+def _list_board_id(list_id, message):
+    board_id = db.session.scalar(select(List.board_id).where(List.id == list_id))
+    if board_id is None:
+        raise NotFound(message)
+    return board_id
+
+
+def _selected_board_ids(bulk):
+    """
+    Boards de las cards elegidas, sin leer las cards filtradas por lista.
+
+    Raises:
+        NotFound: Si alguna card o la lista del filtro no existe
+    """
+    if bulk["ids"] is None:
+        return {_list_board_id(bulk["filter"]["list_id"], "List not found")}
+
+    rows = db.session.execute(
+        select(Card.id, Card.board_id).where(Card.id.in_(bulk["ids"]))
+    ).all()
+    missing = set(bulk["ids"]) - {row.id for row in rows}
+    if missing:
+        raise NotFound(f"Card {min(missing)} not found")
+    return {row.board_id for row in rows}
+
+
+def _move_cards(criteria, target_list_id, target_board_id, card_ids):
+    """
+    Mueve las cards elegidas al final de la lista destino, en el orden dado.
+    Los ranks nuevos extienden el mayor rank de la lista con claves
+    equiespaciadas; si quedan demasiado largas se redistribuye la lista.
+    """
+    cards = Card.__table__
+    selected = select(Card.id).where(*criteria)
+    before = db.session.scalar(
+        select(func.max(cards.c.rank)).where(
+            cards.c.list_id == target_list_id, cards.c.id.not_in(selected)
+        )
+    )
+    ranks = [(before or "") + rank for rank in spread_ranks(len(card_ids))]
+
+    # El board de origen tiene que ver salir las cards que cambian de board
+    record_bulk_updates(Card, *criteria, Card.board_id != target_board_id)
+    db.session.execute(
+        cards.update()
+        .where(cards.c.id == bindparam("card_id"))
+        .values(
+            list_id=target_list_id,
+            board_id=target_board_id,
+            rank=bindparam("new_rank"),
+            version=cards.c.version + 1,
+        ),
+        [
+            {"card_id": card_id, "new_rank": rank}
+            for card_id, rank in zip(card_ids, ranks)
+        ],
+    )
+
+    if max(map(len, ranks)) > RANK_MAX_LENGTH:
+        rebalance_ranks(Card, "list_id", target_list_id)
+    else:
+        moved = [Card.list_id == target_list_id]
+        if before is not None:
+            moved.append(Card.rank > before)
+        record_bulk_updates(Card, *moved)
+
+
+def apply_bulk_action(user_id, bulk):
+    """
+    Aplica una operación en bloque y deja los cambios en la sesión sin confirmar.
+
+    Args:
+        user_id: ID del usuario autenticado
+        bulk: Operación normalizada por parse_bulk_request
+
+    Returns:
+        dict: action, count, ids de las cards afectadas y boards afectados
+
+    Raises:
+        NotFound: Si alguna card, la lista del filtro o la lista destino no existe
+        Forbidden: Si el usuario no tiene acceso a alguno de los boards
+    """
+    board_ids = _selected_board_ids(bulk)
+    target_board_id = None
+    if bulk["action"] == "move":
+        target_board_id = _list_board_id(bulk["list_id"], "Target list not found")
+        board_ids.add(target_board_id)
+
+    # Un solo chequeo de permisos por board, no por card
+    for board_id in sorted(board_ids):
+        if resolve_board_role(user_id, board_id) is None:
+            raise Forbidden("You do not have permission to access this board")
+
+    lock_positions(*board_ids)
+    criteria = _selection_criteria(bulk)
+    # Con el lock tomado: descartar cards que pasaron a otros boards
+    criteria += [Card.board_id.in_(board_ids), visible_cards()]
+    if bulk["action"] in ("archive", "unarchive"):
+        criteria.append(Card.archived.is_(bulk["action"] == "unarchive"))
+
+    rows = db.session.execute(
+        select(Card.id, Card.list_id)
+        .where(*criteria)
+        .order_by(Card.list_id, Card.rank, Card.id)
+    ).all()
+    card_ids = [row.id for row in rows]
+    list_ids = {row.list_id for row in rows}
+
+    cards = Card.__table__
+    if card_ids and bulk["action"] in ("archive", "unarchive"):
+        record_bulk_updates(Card, *criteria)
+        db.session.execute(
+            cards.update()
+            .where(*criteria)
+            .values(
+                archived=bulk["action"] == "archive",
+                version=cards.c.version + 1,
+            )
+        )
+        # Las archivadas conservan su lugar: no hay que renumerar
+        list_ids = set()
+    elif card_ids and bulk["action"] == "delete":
+        record_bulk_updates(Card, *criteria, action="delete")
+        db.session.execute(cards.delete().where(*criteria))
+    elif card_ids:
+        _move_cards(criteria, bulk["list_id"], target_board_id, card_ids)
+        list_ids.add(bulk["list_id"])
+
+    if card_ids:
+        renumber_positions(Card, "list_id", sorted(list_ids))
+        # Los UPDATE y DELETE de Core no pasan por el flush
+        selected = set(card_ids)
+        for obj in list(db.session.identity_map.values()):
+            if isinstance(obj, Card) and obj.id in selected:
+                db.session.expire(obj)
+        mark_boards_changed(db.session, board_ids)
+
+    return {
+        "action": bulk["action"],
+        "count": len(card_ids),
+        "ids": card_ids,
+        "board_ids": sorted(board_ids),
+    }
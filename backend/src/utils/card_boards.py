@@ -0,0 +1,139 @@
+"""
+Mantiene cards.board_id igual al board de la lista de cada card.
+
+cards.board_id es una copia de lists.board_id para que autorizar una card o
+recorrer las cards de un board sea una búsqueda indexada sin pasar por lists.
+Antes de cada flush se completa en las cards nuevas o que cambiaron de lista, y
+cuando una lista se mueve de board se actualizan sus cards con un UPDATE en
+bloque. `flask card-boards check|repair` detecta y corrige desvíos.
+"""
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.db import db
+from src.models import Card, List
+from src.utils.board_versions import mark_boards_changed
+from src.utils.change_tracking import record_bulk_updates
+
+
+def _list_board_ids(session, list_ids):
+    """Board de cada lista, priorizando el estado en memoria de la sesión."""
+    boards = {
+        obj.id: obj.board_id
+        for obj in session.identity_map.values()
+        if isinstance(obj, List) and obj.id in list_ids
+    }
+    missing = list_ids - boards.keys()
+    if missing:
+        rows = session.query(List.id, List.board_id).filter(List.id.in_(missing))
+        boards.update(rows)
+    return boards
+
+
+def sync_card_board_ids(session):
+    """
+    Completa board_id en las cards pendientes de la sesión.
+
+    Args:
+        session: La sesión a inspeccionar (antes del flush)
+    """
+    cards = [obj for obj in session.new if isinstance(obj, Card)]
+    cards += [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, Card) and inspect(obj).attrs.list_id.history.has_changes()
+    ]
+    moved_lists = [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, List) and inspect(obj).attrs.board_id.history.has_changes()
+    ]
+
+    # Las cards que cambian de lista en este flush se resuelven una por una abajo
+    moving_ids = {card.id for card in cards if card.id is not None}
+    for list_obj in moved_lists:
+        criteria = [Card.list_id == list_obj.id]
+        if moving_ids:
+            criteria.append(Card.id.notin_(moving_ids))
+        session.execute(
+            Card.__table__.update().where(*criteria).values(board_id=list_obj.board_id)
+        )
+        record_bulk_updates(Card, *criteria)
+        for obj in list(session.identity_map.values()):
+            if (
+                isinstance(obj, Card)
+                and obj.id not in moving_ids
+                and obj.list_id == list_obj.id
+            ):
+                set_committed_value(obj, "board_id", list_obj.board_id)
+
+    list_ids = {card.list_id for card in cards if card.list_id is not None}
+    boards = _list_board_ids(session, list_ids) if list_ids else {}
+    for card in cards:
+        if card.list_id is not None:
+            board_id = boards.get(card.list_id)
+        else:
+            # Card asignada a una lista nueva por la relación (sin id todavía)
+            list_obj = card.__dict__.get("list")
+            board_id = list_obj.board_id if list_obj is not None else None
+        if board_id is not None and card.board_id != board_id:
+            card.board_id = board_id
+
+
+def find_inconsistent_cards(limit=None):
+    """
+    Lista las cards cuyo board_id no coincide con el de su lista.
+
+    Returns:
+        list[tuple]: (card_id, board_id guardado, board_id de la lista)
+    """
+    statement = (
+        select(Card.id, Card.board_id, List.board_id)
+        .join(List, Card.list_id == List.id)
+        .where(Card.board_id != List.board_id)
+        .order_by(Card.id)
+    )
+    if limit is not None:
+        statement = statement.limit(limit)
+    return db.session.execute(statement).all()
+
+
+def repair_card_board_ids():
+    """
+    Corrige board_id de las cards inconsistentes con un único UPDATE.
+
+    Returns:
+        int: Cantidad de cards corregidas
+    """
+    list_board = (
+        select(List.board_id).where(List.id == Card.list_id).scalar_subquery()
+    )
+    # Las cards cambian de board: versionar el que dejan y el que las recibe
+    board_ids = set()
+    for previous, current in db.session.execute(
+        select(Card.board_id, list_board).where(Card.board_id != list_board).distinct()
+    ):
+        board_ids.update({previous, current} - {None})
+    result = db.session.execute(
+        Card.__table__.update()
+        .where(Card.board_id != list_board)
+        .values(board_id=list_board)
+    )
+    mark_boards_changed(db.session, board_ids)
+    db.session.commit()
+    return result.rowcount
+
+
+def _before_flush(session, flush_context, instances):
+    sync_card_board_ids(session)
+
+
+def init_card_board_sync():
+    """
+    Registra el listener (idempotente). Se inserta primero para que los demás
+    listeners de before_flush ya vean board_id completo.
+    """
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush, insert=True)
@@ -0,0 +1,280 @@
+"""
+Log de cambios por board para sincronización incremental.
+
+Cada flush que crea, modifica o elimina un board, una lista o una card agrega
+una fila a board_changes (ver src/utils/board_versions.py, que junta los cambios
+antes del flush); los UPDATE en bloque de posiciones y ranks se registran con
+record_bulk_updates, y dar de baja una lista registra también la baja de sus
+cards. GET /boards/<id>/changes?since=<cursor> devuelve el estado
+actual de las entidades que cambiaron desde el cursor y las que se eliminaron o
+salieron del board, así un cliente conectado no vuelve a bajar el board entero.
+
+Los ids escritos en el flush quedan ordenados por commit dentro de cada board:
+el UPDATE de boards.version bloquea la fila del board hasta el commit, así que
+dos transacciones que tocan el mismo board no intercalan sus cambios.
+
+Los cambios viejos se purgan con `flask changes prune`. Un cursor emitido hace
+más de BOARD_CHANGES_RETENTION_HOURS puede apuntar a cambios ya purgados y se
+rechaza con 410 para que el cliente recargue el snapshot completo.
+"""
+
+import base64
+import binascii
+import calendar
+import json
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event, func, inspect, literal, select
+from sqlalchemy.orm import Session
+from werkzeug.exceptions import BadRequest
+
+from src.db import db
+from src.models import BoardChange, Card, List
+from src.utils.board_reader import read_cards, row_serializer, select_fields
+from src.utils.board_versions import PENDING_CHANGES_KEY
+from src.utils.soft_delete import visible_lists
+
+# Tipos de entidad que se registran en el log (los miembros no cambian el
+# contenido del board)
+TRACKED_TYPES = ("board", "list", "card")
+
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 5000
+
+
+def encode_changes_cursor(change_id, issued_at=None):
+    """
+    Codifica la posición en el log y el momento de emisión en un cursor opaco.
+
+    Args:
+        change_id: ID del último cambio que el cliente ya tiene
+        issued_at: Timestamp UTC (segundos) desde el que el cursor es válido
+    """
+    if issued_at is None:
+        issued_at = int(time.time())
+    raw = json.dumps([change_id, issued_at], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_changes_cursor(cursor):
+    """
+    Decodifica un cursor generado por encode_changes_cursor.
+
+    Raises:
+        BadRequest: Si el cursor no es válido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        change_id, issued_at = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequest("Invalid cursor")
+    if not isinstance(change_id, int) or not isinstance(issued_at, int):
+        raise BadRequest("Invalid cursor")
+    return change_id, issued_at
+
+
+def cursor_expired(issued_at):
+    """True si los cambios posteriores al cursor pueden haberse purgado."""
+    retention = current_app.config["BOARD_CHANGES_RETENTION_HOURS"] * 3600
+    return time.time() - issued_at > retention
+
+
+def current_changes_cursor(board_id):
+    """Cursor que apunta al último cambio registrado del board."""
+    last_id = db.session.execute(
+        select(func.max(BoardChange.id)).where(BoardChange.board_id == board_id)
+    ).scalar()
+    return encode_changes_cursor(last_id or 0)
+
+
+def read_changes(board, since_id, limit, list_fields=None, card_fields=None):
+    """
+    Lee los cambios de un board posteriores a since_id.
+
+    Cada entidad aparece una sola vez con su estado actual, sin importar cuántas
+    veces cambió. Las listas y cards que ya no existen o que se movieron a otro
+    board se devuelven en "deleted".
+
+    Args:
+        board: El board ya autorizado
+        since_id: ID del último cambio que tiene el cliente
+        limit: Cantidad máxima de cambios del log a procesar
+        list_fields: Campos de lista a devolver (None para todos)
+        card_fields: Campos de card a devolver (None para todos)
+
+    Returns:
+        dict: cursor, has_more, board, lists, cards y deleted
+    """
+    rows = db.session.execute(
+        select(
+            BoardChange.id,
+            BoardChange.entity_type,
+            BoardChange.entity_id,
+            BoardChange.created_at,
+        )
+        .where(BoardChange.board_id == board.id, BoardChange.id > since_id)
+        .order_by(BoardChange.id)
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if not rows:
+        cursor = encode_changes_cursor(since_id)
+    elif has_more:
+        # Los cambios pendientes son posteriores al último devuelto
+        last = rows[-1]
+        cursor = encode_changes_cursor(
+            last.id, calendar.timegm(last.created_at.utctimetuple())
+        )
+    else:
+        cursor = encode_changes_cursor(rows[-1].id)
+
+    changed = {entity_type: set() for entity_type in TRACKED_TYPES}
+    for row in rows:
+        changed[row.entity_type].add(row.entity_id)
+
+    deleted = []
+
+    lists = []
+    if changed["list"]:
+        list_fields = list_fields or List.FIELDS
+        list_rows = db.session.execute(
+            select_fields(List, list_fields, List.id).where(
+                List.id.in_(changed["list"]), List.board_id == board.id, visible_lists()
+            )
+        ).all()
+        lists = row_serializer(List, list_fields)(list_rows)
+        present = {row[-1] for row in list_rows}
+        deleted += [
+            {"type": "list", "id": list_id}
+            for list_id in sorted(changed["list"] - present)
+        ]
+
+    cards = []
+    if changed["card"]:
+        cards, card_rows = read_cards(
+            Card.id.in_(changed["card"]), Card.board_id == board.id, fields=card_fields
+        )
+        present = {row[-1] for row in card_rows}
+        deleted += [
+            {"type": "card", "id": card_id}
+            for card_id in sorted(changed["card"] - present)
+        ]
+
+    return {
+        "cursor": cursor,
+        "has_more": has_more,
+        "board": board.to_dict() if changed["board"] else None,
+        "lists": lists,
+        "cards": cards,
+        "deleted": deleted,
+    }
+
+
+def record_bulk_updates(model, *criteria, action="upsert"):
+    """
+    Registra como modificadas las filas que va a tocar un UPDATE en bloque.
+
+    Los UPDATE en bloque (por ejemplo el corrimiento de posiciones de hermanos)
+    no pasan por el flush, así que se registran con un único INSERT ... SELECT
+    sobre los mismos criterios. Debe llamarse antes del UPDATE o DELETE.
+
+    Args:
+        model: Card o List
+        *criteria: Los mismos filtros del UPDATE
+        action: "upsert", o "delete" antes de un DELETE en bloque
+    """
+    entity_type = "card" if model is Card else "list"
+    statement = select(
+        model.board_id,
+        literal(entity_type),
+        model.id,
+        literal(action),
+        literal(datetime.utcnow()),
+    ).where(*criteria)
+
+    changes = BoardChange.__table__
+    db.session.execute(
+        changes.insert().from_select(
+            ["board_id", "entity_type", "entity_id", "action", "created_at"],
+            statement,
+        )
+    )
+
+
+def prune_board_changes(retention_hours=None):
+    """
+    Elimina los cambios más viejos que la retención configurada.
+
+    Returns:
+        int: Cantidad de filas eliminadas
+    """
+    if retention_hours is None:
+        retention_hours = current_app.config["BOARD_CHANGES_RETENTION_HOURS"]
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    result = db.session.execute(
+        BoardChange.__table__.delete().where(BoardChange.created_at < cutoff)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _soft_deleted(obj):
+    """True si el flush en curso completó deleted_at de la lista."""
+    added = inspect(obj).attrs.deleted_at.history.added
+    return bool(added) and added[0] is not None
+
+
+def _after_flush(session, flush_context):
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if not changes:
+        return
+
+    records = []
+    deleted_list_ids = []
+    for change in changes:
+        if change.entity_type not in TRACKED_TYPES:
+            continue
+        if change.entity_type == "list" and _soft_deleted(change.obj):
+            deleted_list_ids.append(change.obj.id)
+        entity_id = change.obj.id
+        # Un board nuevo recién tiene id después del flush
+        board_ids = {entity_id} if change.entity_type == "board" else change.board_ids
+        for board_id in board_ids:
+            records.append((board_id, change.entity_type, entity_id, change.action))
+        for board_id in change.previous_board_ids:
+            records.append((board_id, change.entity_type, entity_id, "delete"))
+
+    if records:
+        session.execute(
+            BoardChange.__table__.insert(),
+            [
+                {
+                    "board_id": board_id,
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "action": action,
+                }
+                for board_id, entity_type, entity_id, action in records
+            ],
+        )
+
+    if deleted_list_ids:
+        # Las cards de una lista dada de baja quedan ocultas sin que cambie su
+        # fila: registrarlas como eliminadas para que los clientes las borren
+        record_bulk_updates(Card, Card.list_id.in_(deleted_list_ids), action="delete")
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_CHANGES_KEY, None)
+
+
+def init_change_tracking():
+    """Registra los listeners que escriben board_changes (idempotente)."""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,315 @@
+"""
+Copia de boards y listas (plantillas) con INSERT ... SELECT.
+
+Pedir una copia crea enseguida el board o la lista destino y un CloneJob. Las
+listas de un board se copian con un INSERT ... SELECT ... RETURNING, que
+devuelve el id y la posición de cada copia, y todas las cards se copian con un
+único INSERT ... SELECT que traduce cada list_id al de su copia y recalcula las
+posiciones densas según (rank, id). Los ranks se copian tal cual, así que el
+orden se conserva aunque se salteen cards archivadas.
+
+El destino ya es visible mientras corre una copia en segundo plano y puede
+recibir listas o cards nuevas: las copias se agregan después de lo que haya,
+con posiciones a partir de la última y ranks prefijados con el mayor existente.
+
+La copia entera es una sola transacción: si falla no deja filas a medias y
+`flask clones run` la puede repetir. Las copias de hasta CLONE_SYNC_MAX_CARDS
+cards corren dentro del request; las más grandes, en el pool de hilos del
+proceso (ver background.py), y su avance se consulta en GET /clones/<id>.
+"""
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import case, func, literal, null, select
+from werkzeug.exceptions import BadRequest
+
+from src.db import db
+from src.models import Board, Card, CloneJob, List
+from src.utils.background import submit_job
+from src.utils.board_versions import mark_boards_changed
+from src.utils.change_tracking import record_bulk_updates
+from src.utils.position_helpers import lock_positions, rebalance_ranks
+from src.utils.ranks import RANK_MAX_LENGTH
+from src.utils.soft_delete import visible_cards, visible_lists
+
+UNFINISHED_STATUSES = ("pending", "running", "failed")
+
+# Opciones del cuerpo de POST .../clone (todas true por defecto)
+CLONE_OPTIONS = ("include_archived", "include_descriptions")
+
+# Columnas de cards que se escriben en la copia (el resto toma sus defaults)
+CARD_COPY_COLUMNS = (
+    "title",
+    "description",
+    "list_id",
+    "board_id",
+    "position",
+    "rank",
+    "due_date",
+    "archived",
+)
+
+
+def parse_clone_options(data):
+    """
+    Lee las opciones de copia del cuerpo del request.
+
+    Returns:
+        dict: include_archived e include_descriptions
+
+    Raises:
+        BadRequest: Si alguna opción no es booleana
+    """
+    options = {}
+    for name in CLONE_OPTIONS:
+        value = (data or {}).get(name, True)
+        if not isinstance(value, bool):
+            raise BadRequest(f"{name} must be a boolean")
+        options[name] = value
+    return options
+
+
+def schedule_clone(
+    source, target, user_id, include_archived=True, include_descriptions=True
+):
+    """
+    Agrega a la sesión el board o la lista destino y el job que la completa.
+    No hace commit: el destino y el job se confirman con el resto del request.
+
+    Args:
+        source: El Board o la List a copiar
+        target: El Board o la List nuevos, sin cards
+        user_id: ID del usuario que pidió la copia
+        include_archived: Copiar también las cards archivadas
+        include_descriptions: Copiar las descripciones de las cards
+
+    Returns:
+        CloneJob: El job pendiente
+    """
+    db.session.add(target)
+    db.session.flush()
+    job = CloneJob(
+        entity_type="board" if isinstance(source, Board) else "list",
+        source_id=source.id,
+        target_id=target.id,
+        board_id=target.id if isinstance(target, Board) else target.board_id,
+        requested_by=user_id,
+        include_archived=include_archived,
+        include_descriptions=include_descriptions,
+    )
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+def _source_criteria(job):
+    """Condiciones sobre cards que seleccionan las cards a copiar."""
+    cards = Card.__table__
+    parent = cards.c.board_id if job.entity_type == "board" else cards.c.list_id
+    criteria = [parent == job.source_id, visible_cards()]
+    if not job.include_archived:
+        criteria.append(cards.c.archived.is_(False))
+    return criteria
+
+
+def start_clone(job):
+    """
+    Corre la copia de un job ya confirmado: dentro del request si el origen es
+    chico o si el pool está desactivado, o en segundo plano si no.
+
+    Returns:
+        bool: True si la copia quedó encolada en segundo plano
+    """
+    card_count = db.session.scalar(
+        select(func.count()).select_from(Card.__table__).where(*_source_criteria(job))
+    )
+    if card_count > current_app.config["CLONE_SYNC_MAX_CARDS"] and submit_job(
+        run_clone, job.id
+    ):
+        return True
+
+    try:
+        run_clone(job.id)
+    except Exception:
+        # El error queda en el job; el llamador lo informa según job.status
+        current_app.logger.exception("Clone job %s failed", job.id)
+    return False
+
+
+def unfinished_clone_ids():
+    """IDs de los jobs pendientes, cortados o fallidos, en orden de creación."""
+    return db.session.scalars(
+        select(CloneJob.id)
+        .where(CloneJob.status.in_(UNFINISHED_STATUSES))
+        .order_by(CloneJob.id)
+    ).all()
+
+
+def _append_point(model, parent_id_field, parent_id):
+    """
+    Primera posición libre y mayor rank de los hijos de un padre, para agregar
+    las copias al final. Cuenta también las filas dadas de baja, que conservan
+    su posición hasta que se purgan.
+
+    Returns:
+        tuple[int, str]: (posición inicial, prefijo de rank; "" si está vacío)
+    """
+    table = model.__table__
+    last_position, last_rank = db.session.execute(
+        select(func.max(table.c.position), func.max(table.c.rank)).where(
+            table.c[parent_id_field] == parent_id
+        )
+    ).one()
+    start = 0 if last_position is None else last_position + 1
+    return start, last_rank or ""
+
+
+def _rebalance_long_ranks(model, parent_id_field, parent_id):
+    """Redistribuye las claves del padre si el prefijo las dejó muy largas."""
+    table = model.__table__
+    longest = db.session.scalar(
+        select(func.max(func.length(table.c.rank))).where(
+            table.c[parent_id_field] == parent_id
+        )
+    )
+    if longest is not None and longest > RANK_MAX_LENGTH:
+        rebalance_ranks(model, parent_id_field, parent_id)
+
+
+def _copy_lists(job):
+    """
+    Copia las listas del board origen al final del board destino con un
+    INSERT ... SELECT y retorna {id origen: id copia}. RETURNING devuelve solo
+    las filas insertadas, con la posición que les tocó según (rank, id) en el
+    origen, así que el mapeo no se mezcla con otras listas del destino. El
+    board origen está bloqueado: su orden no cambia entre las dos queries.
+    """
+    lists = List.__table__
+    order = (lists.c.rank, lists.c.id)
+    source = (lists.c.board_id == job.source_id, visible_lists())
+    start, prefix = _append_point(List, "board_id", job.target_id)
+    position = func.row_number().over(order_by=order) - 1 + start
+    rank = literal(prefix) + lists.c.rank if prefix else lists.c.rank
+    copies = db.session.execute(
+        lists.insert()
+        .from_select(
+            ("title", "board_id", "position", "rank"),
+            select(lists.c.title, literal(job.target_id), position, rank).where(
+                *source
+            ),
+        )
+        .returning(lists.c.id, lists.c.position)
+    ).all()
+    if not copies:
+        return {}
+    copy_ids = {row.position - start: row.id for row in copies}
+    source_ids = db.session.scalars(
+        select(lists.c.id).where(*source).order_by(*order)
+    ).all()
+
+    if prefix:
+        _rebalance_long_ranks(List, "board_id", job.target_id)
+    record_bulk_updates(List, List.id.in_(copy_ids.values()))
+    return {source_id: copy_ids[i] for i, source_id in enumerate(source_ids)}
+
+
+def _copy_cards(job, list_ids):
+    """
+    Copia con un único INSERT ... SELECT las cards de las listas origen. En la
+    copia de una lista, las cards van al final de las que ya tenga la lista
+    destino.
+
+    Args:
+        job: El CloneJob en curso
+        list_ids: {id de lista origen: id de lista copia}
+
+    Returns:
+        int: Cantidad de cards copiadas
+    """
+    if not list_ids:
+        return 0
+
+    start, prefix = 0, ""
+    if job.entity_type == "list":
+        start, prefix = _append_point(Card, "list_id", job.target_id)
+
+    cards = Card.__table__
+    criteria = _source_criteria(job)
+    criteria.append(cards.c.list_id.in_(list_ids))
+    position = (
+        func.row_number().over(
+            partition_by=cards.c.list_id, order_by=(cards.c.rank, cards.c.id)
+        )
+        - 1
+        + start
+    )
+    rank = literal(prefix) + cards.c.rank if prefix else cards.c.rank
+    statement = select(
+        cards.c.title,
+        cards.c.description if job.include_descriptions else null(),
+        case(list_ids, value=cards.c.list_id),
+        literal(job.board_id),
+        position,
+        rank,
+        cards.c.due_date,
+        cards.c.archived,
+    ).where(*criteria)
+    result = db.session.execute(
+        cards.insert().from_select(CARD_COPY_COLUMNS, statement)
+    )
+    if prefix:
+        _rebalance_long_ranks(Card, "list_id", job.target_id)
+    return result.rowcount
+
+
+def run_clone(job_id):
+    """
+    Copia las listas y cards de un job en una transacción y lo marca terminado.
+
+    Args:
+        job_id: ID del CloneJob
+
+    Returns:
+        CloneJob: El job con su estado final
+
+    Raises:
+        Exception: El error de la copia, después de guardarlo en el job
+    """
+    job = db.session.get(CloneJob, job_id)
+    if job is None or job.status == "done":
+        return job
+
+    try:
+        job.status = "running"
+        job.error = None
+        db.session.commit()
+
+        # Las copias se agregan al final del destino y siguen el orden del
+        # origen: ningún otro request puede reordenar ninguno de los dos
+        if job.entity_type == "board":
+            lock_positions(job.board_id, job.source_id)
+        else:
+            lock_positions(job.board_id)
+        if job.entity_type == "board":
+            list_ids = _copy_lists(job)
+        else:
+            list_ids = {job.source_id: job.target_id}
+        job.copied_lists = len(list_ids)
+        job.copied_cards = _copy_cards(job, list_ids)
+
+        if job.entity_type == "list":
+            # Los clientes conectados al board destino deben ver las cards nuevas
+            record_bulk_updates(Card, Card.list_id == job.target_id)
+        mark_boards_changed(db.session, {job.board_id})
+
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    except Exception as error:
+        db.session.rollback()
+        job.status = "failed"
+        job.error = str(error)
+        db.session.commit()
+        raise
+    return job
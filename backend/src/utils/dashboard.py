@@ -0,0 +1,121 @@
+"""
+Listado de boards del dashboard en una sola query.
+
+Los boards propios y los compartidos se filtran con un UNION de ids (boards por
+owner_id y board_members por user_id), así que no hay duplicados que limpiar en
+Python. Las
+cantidades de listas, cards y cards vencidas se calculan con subqueries
+agregadas en el mismo SELECT.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import func, select, tuple_, union
+from werkzeug.exceptions import BadRequest
+
+from src.db import db
+from src.models import Board, BoardMember, Card, List
+from src.utils.board_reader import row_serializer, select_fields
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.soft_delete import visible_boards, visible_cards, visible_lists
+
+# Orden por actividad reciente (más nuevo primero) o alfabético por título
+SORT_OPTIONS = ("activity", "title")
+
+COUNT_FIELDS = ("list_count", "card_count", "overdue_count")
+
+
+def _count_subqueries(now):
+    """Subqueries correlacionadas con Board.id para cada contador."""
+    list_count = (
+        select(func.count(List.id))
+        .where(List.board_id == Board.id, visible_lists())
+        .scalar_subquery()
+    )
+    active_cards = select(func.count(Card.id)).where(
+        Card.board_id == Board.id, ~Card.archived, visible_cards()
+    )
+    overdue_cards = active_cards.where(Card.due_date < now)
+    return (
+        list_count,
+        active_cards.scalar_subquery(),
+        overdue_cards.scalar_subquery(),
+    )
+
+
+def read_dashboard_boards(
+    user_id, fields=None, sort="activity", limit=100, cursor=None
+):
+    """
+    Lee una página de boards propios o compartidos con el usuario.
+
+    Args:
+        user_id: ID del usuario autenticado
+        fields: Campos del board a devolver (None para todos)
+        sort: "activity" o "title"
+        limit: Cantidad máxima de boards
+        cursor: Cursor next_cursor de la página anterior o None
+
+    Returns:
+        dict: {"boards": [...], "next_cursor": str o None}. Cada board incluye
+        list_count, card_count y overdue_count.
+
+    Raises:
+        BadRequest: Si el orden o el cursor no son válidos
+    """
+    if sort not in SORT_OPTIONS:
+        raise BadRequest(f"sort must be one of: {', '.join(SORT_OPTIONS)}")
+
+    fields = fields or Board.FIELDS
+    if sort == "activity":
+        sort_key = func.coalesce(Board.updated_at, Board.created_at)
+    else:
+        sort_key = Board.title
+
+    # UNION de ids propios y compartidos: cada rama usa su índice y luego se busca
+    # cada board por clave primaria (un OR con EXISTS recorre toda la tabla)
+    accessible_ids = union(
+        select(Board.id).where(Board.owner_id == user_id),
+        select(BoardMember.board_id).where(BoardMember.user_id == user_id),
+    )
+    statement = select_fields(
+        Board,
+        fields,
+        *_count_subqueries(datetime.utcnow()),
+        sort_key,
+        Board.id,
+    ).where(Board.id.in_(accessible_ids), visible_boards())
+
+    if cursor:
+        key, board_id = decode_cursor(cursor)
+        if sort == "activity":
+            try:
+                key = datetime.fromisoformat(key)
+            except ValueError:
+                raise BadRequest("Invalid cursor")
+            statement = statement.where(tuple_(sort_key, Board.id) < (key, board_id))
+        else:
+            statement = statement.where(tuple_(sort_key, Board.id) > (key, board_id))
+
+    if sort == "activity":
+        statement = statement.order_by(sort_key.desc(), Board.id.desc())
+    else:
+        statement = statement.order_by(sort_key, Board.id)
+
+    rows = db.session.execute(statement.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        # Las dos últimas columnas son la clave de orden y el id
+        key, board_id = rows[-1][-2], rows[-1][-1]
+        if sort == "activity":
+            key = key.isoformat()
+        next_cursor = encode_cursor(key, board_id)
+
+    boards = row_serializer(Board, fields)(rows)
+    count_start = len(fields)
+    for row, board in zip(rows, boards):
+        board.update(zip(COUNT_FIELDS, row[count_start : count_start + 3]))
+
+    return {"boards": boards, "next_cursor": next_cursor}
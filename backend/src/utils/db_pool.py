@@ -0,0 +1,194 @@
+"""
+Opciones del pool de conexiones de SQLAlchemy y métricas de su uso.
+
+SQLALCHEMY_ENGINE_OPTIONS se arma desde las variables DB_* de Config. Solo se
+aplican con Postgres: SQLite usa el pool por defecto de SQLAlchemy.
+
+Los timeouts del servidor (statement_timeout, idle_in_transaction_session_timeout)
+se piden al abrir cada conexión. Detrás de PgBouncer en modo transaction
+(DB_POOLING_MODE = "transaction") la conexión del servidor cambia en cada
+transacción y PgBouncer no acepta esos parámetros de arranque, así que se
+aplican con SET LOCAL al empezar cada transacción. En ese modo también se
+desactivan los prepared statements de psycopg 3 (psycopg2 no los usa).
+
+El pool mide cuánto espera cada checkout por una conexión libre (incluye abrir
+conexiones nuevas) y cuántos agotan DB_POOL_TIMEOUT; pool_stats() lo reporta
+junto con la saturación del pool.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import partial
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from src.db import db
+
+POOLING_MODES = ("session", "transaction")
+
+# Límites superiores (segundos) de los buckets del histograma de espera
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class PoolWaitStats:
+    """Histograma acumulado de esperas de checkout del proceso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Funciones observer(seconds, timed_out) que reciben cada espera
+        self.observers = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.total_seconds = 0.0
+            self.timeouts = 0
+            # Un contador por bucket más el de "mayor al último límite"
+            self.buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def record(self, seconds, timed_out=False):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.buckets[bisect_left(WAIT_BUCKETS, seconds)] += 1
+            if timed_out:
+                self.timeouts += 1
+        for observer in self.observers:
+            observer(seconds, timed_out)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.count,
+                "wait_seconds": self.total_seconds,
+                "timeouts": self.timeouts,
+                "wait_buckets": list(zip(WAIT_BUCKETS + (None,), self.buckets)),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que registra la espera de cada checkout en pool_wait_stats."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+def _server_timeouts(config):
+    """Timeouts del servidor en milisegundos; los 0 se omiten."""
+    timeouts = {
+        "statement_timeout": config["DB_STATEMENT_TIMEOUT_MS"],
+        "idle_in_transaction_session_timeout": config[
+            "DB_IDLE_IN_TRANSACTION_TIMEOUT_MS"
+        ],
+    }
+    return {name: value for name, value in timeouts.items() if value > 0}
+
+
+def _is_postgres(database_uri):
+    return make_url(database_uri).get_backend_name() == "postgresql"
+
+
+def engine_options(config):
+    """
+    Arma SQLALCHEMY_ENGINE_OPTIONS desde las variables DB_* de la config.
+
+    Returns:
+        dict: Opciones para create_engine (vacío si la base no es Postgres)
+
+    Raises:
+        ValueError: Si DB_POOLING_MODE no es válido
+    """
+    mode = config["DB_POOLING_MODE"]
+    if mode not in POOLING_MODES:
+        raise ValueError(f"DB_POOLING_MODE must be one of: {POOLING_MODES}")
+
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() != "postgresql":
+        return {}
+
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+    connect_args = {}
+    if mode == "transaction":
+        if url.get_driver_name() == "psycopg":
+            connect_args["prepare_threshold"] = None
+    else:
+        timeouts = _server_timeouts(config)
+        if timeouts:
+            connect_args["options"] = " ".join(
+                f"-c {name}={value}" for name, value in timeouts.items()
+            )
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _set_local_timeouts(timeouts, connection):
+    for name, value in timeouts.items():
+        connection.exec_driver_sql(f"SET LOCAL {name} = {int(value)}")
+
+
+def init_db_pool(app):
+    """
+    En modo transaction, registra el SET LOCAL de los timeouts al empezar cada
+    transacción. Se llama después de db.init_app.
+    """
+    timeouts = _server_timeouts(app.config)
+    if (
+        app.config["DB_POOLING_MODE"] != "transaction"
+        or not timeouts
+        or not _is_postgres(app.config["SQLALCHEMY_DATABASE_URI"])
+    ):
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "begin", partial(_set_local_timeouts, timeouts))
+
+
+def pool_stats(engine=None):
+    """
+    Estado del pool de un engine y esperas de checkout acumuladas del proceso,
+    para exportar como métricas (ver src/utils/metrics.py).
+
+    Args:
+        engine: Engine a inspeccionar; por defecto el principal (necesita app
+            context)
+
+    Returns:
+        dict: Las esperas de pool_wait_stats y, con un QueuePool, size,
+            max_overflow, capacity, checked_out, idle y saturation
+    """
+    pool = (engine or db.engine).pool
+    stats = pool_wait_stats.snapshot()
+    if isinstance(pool, QueuePool):
+        # max_overflow = -1 es overflow sin límite: la saturación mira solo size
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            capacity=capacity,
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            saturation=pool.checkedout() / capacity if capacity else 0.0,
+        )
+    return stats
@@ -0,0 +1,162 @@
+"""
+Borrado diferido y por lotes de boards y listas.
+
+DELETE /boards/<id> y DELETE /lists/<id> solo completan deleted_at (la fila y
+todo su contenido quedan ocultos, ver src/utils/soft_delete.py) y registran un
+DeletionJob. El purgado corre después en un pool de hilos del proceso: borra las
+cards, luego las listas y por último la fila marcada con DELETE por lotes de
+DELETION_BATCH_SIZE ids, cada uno en su propia transacción, así que ningún
+lock dura más que un lote y el progreso queda en el job.
+
+Cada lote es idempotente: si el proceso se corta, `flask deletions run` retoma
+los jobs sin terminar. Con BACKGROUND_WORKER_THREADS = 0 solo purga ese comando.
+"""
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from src.db import db
+from src.models import Board, BoardMember, Card, DeletionJob, List
+from src.utils.background import submit_job
+
+UNFINISHED_STATUSES = ("pending", "running", "failed")
+
+
+def schedule_deletion(item, user_id):
+    """
+    Da de baja un board o una lista y registra el job que lo purga.
+    No hace commit: la baja y el job se confirman junto con el resto del request.
+
+    Args:
+        item: El Board o la List a eliminar
+        user_id: ID del usuario que pidió la baja
+
+    Returns:
+        DeletionJob: El job pendiente
+    """
+    if isinstance(item, Board):
+        entity_type, board_id = "board", item.id
+    else:
+        entity_type, board_id = "list", item.board_id
+
+    item.deleted_at = datetime.utcnow()
+    job = DeletionJob(
+        entity_type=entity_type,
+        entity_id=item.id,
+        board_id=board_id,
+        requested_by=user_id,
+    )
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+def start_deletion(job_id):
+    """
+    Encola el purgado de un job ya confirmado en el pool de hilos del proceso.
+
+    Returns:
+        bool: False si el pool está desactivado; el job queda pendiente para
+            `flask deletions run`
+    """
+    return submit_job(run_deletion, job_id)
+
+
+def unfinished_job_ids():
+    """IDs de los jobs pendientes, cortados o fallidos, en orden de creación."""
+    return db.session.scalars(
+        select(DeletionJob.id)
+        .where(DeletionJob.status.in_(UNFINISHED_STATUSES))
+        .order_by(DeletionJob.id)
+    ).all()
+
+
+def _delete_in_batches(job, table, column, counter, batch_size):
+    """
+    Borra las filas de table con column = job.entity_id de a batch_size,
+    confirmando cada lote junto con el avance del job.
+    """
+    while True:
+        ids = db.session.scalars(
+            select(table.c.id)
+            .where(table.c[column] == job.entity_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return
+        db.session.execute(table.delete().where(table.c.id.in_(ids)))
+        setattr(job, counter, getattr(job, counter) + len(ids))
+        db.session.commit()
+
+
+def _count(table, column, value):
+    return db.session.scalar(
+        select(func.count()).select_from(table).where(table.c[column] == value)
+    )
+
+
+def run_deletion(job_id, batch_size=None):
+    """
+    Purga las filas de un job por lotes y lo marca como terminado.
+
+    Args:
+        job_id: ID del DeletionJob
+        batch_size: Filas por lote (por defecto DELETION_BATCH_SIZE)
+
+    Returns:
+        DeletionJob: El job con su estado final
+
+    Raises:
+        Exception: El error del lote que falló, después de guardarlo en el job
+    """
+    batch_size = batch_size or current_app.config["DELETION_BATCH_SIZE"]
+    job = db.session.get(DeletionJob, job_id)
+    if job is None or job.status == "done":
+        return job
+
+    cards = Card.__table__
+    lists = List.__table__
+    parent = "board_id" if job.entity_type == "board" else "list_id"
+    try:
+        if job.status == "pending":
+            job.total_cards = _count(cards, parent, job.entity_id)
+            job.total_lists = (
+                _count(lists, "board_id", job.entity_id)
+                if job.entity_type == "board"
+                else 1
+            )
+        job.status = "running"
+        job.error = None
+        db.session.commit()
+
+        _delete_in_batches(job, cards, parent, "deleted_cards", batch_size)
+        if job.entity_type == "board":
+            _delete_in_batches(job, lists, "board_id", "deleted_lists", batch_size)
+            db.session.execute(
+                BoardMember.__table__.delete().where(
+                    BoardMember.__table__.c.board_id == job.entity_id
+                )
+            )
+            table = Board.__table__
+        else:
+            table = lists
+        result = db.session.execute(
+            table.delete().where(
+                table.c.id == job.entity_id, table.c.deleted_at.is_not(None)
+            )
+        )
+        if job.entity_type == "list":
+            job.deleted_lists += result.rowcount
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    except Exception as error:
+        db.session.rollback()
+        job.status = "failed"
+        job.error = str(error)
+        db.session.commit()
+        raise
+    return job
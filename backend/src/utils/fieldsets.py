@@ -0,0 +1,77 @@
+"""
+Sparse fieldsets: ?fields=title,position o ?fields[cards]=title,position
+
+`fields` aplica al recurso principal del endpoint y `fields[<tipo>]` a cada tipo
+(boards, lists, cards) de respuestas anidadas. El id siempre se incluye. Las
+columnas que no se piden se difieren en el SELECT con load_only.
+"""
+
+from flask import request
+from sqlalchemy.orm import load_only, selectinload
+from werkzeug.exceptions import BadRequest
+
+from src.models import Board, Card, List
+
+RESOURCE_MODELS = {"boards": Board, "lists": List, "cards": Card}
+
+
+def parse_fields(resource, primary=False):
+    """
+    Lee los campos pedidos para un tipo de recurso.
+
+    Args:
+        resource: "boards", "lists" o "cards"
+        primary: Si es el recurso principal del endpoint (acepta ?fields=)
+
+    Returns:
+        tuple[str] o None: Campos en el orden del modelo, o None si no se pidió
+
+    Raises:
+        BadRequest: Si se pide un campo desconocido
+    """
+    raw = request.args.get(f"fields[{resource}]")
+    if raw is None and primary:
+        raw = request.args.get("fields")
+    if raw is None:
+        return None
+
+    model = RESOURCE_MODELS[resource]
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(model.FIELDS)
+    if unknown:
+        raise BadRequest(f"Unknown {resource} fields: {', '.join(sorted(unknown))}")
+
+    requested.add("id")
+    return tuple(name for name in model.FIELDS if name in requested)
+
+
+def load_only_columns(model, fields, extra=()):
+    """
+    Argumentos para load_only() con los campos pedidos más los extra necesarios
+    (por ejemplo rank para armar el cursor). Retorna None si no hay proyección.
+    """
+    if fields is None:
+        return None
+    return [getattr(model, name) for name in dict.fromkeys(fields + tuple(extra))]
+
+
+def project(query, model, fields, extra=()):
+    """Aplica load_only a la query si se pidió un subconjunto de campos."""
+    columns = load_only_columns(model, fields, extra)
+    if columns is None:
+        return query
+    return query.options(load_only(*columns))
+
+
+def list_cards_loader(card_fields):
+    """selectinload de List.cards que solo lee los campos de card pedidos."""
+    loader = selectinload(List.cards)
+    columns = load_only_columns(Card, card_fields)
+    if columns is None:
+        return loader
+    return loader.load_only(*columns)
+
+
+def fields_variant(*fieldsets):
+    """Fragmento de clave de cache que identifica los fieldsets pedidos."""
+    return "|".join(",".join(fields) if fields else "*" for fields in fieldsets)
@@ -0,0 +1,33 @@
+"""
+Helpers para requests condicionales: GET con If-None-Match y escrituras con
+If-Match
+"""
+
+from flask import Response, request
+from werkzeug.http import quote_etag
+
+
+def is_not_modified(etag):
+    """Indica si el If-None-Match del request coincide con el ETag dado."""
+    return request.if_none_match.contains(etag)
+
+
+def not_modified(etag):
+    """Respuesta 304 sin cuerpo con el ETag actual."""
+    return Response(status=304, headers={"ETag": quote_etag(etag)})
+
+
+def is_precondition_failed(etag):
+    """Indica si el request trae If-Match y no coincide con el ETag actual."""
+    return bool(request.if_match) and not request.if_match.contains(etag)
+
+
+def precondition_failed(etag, current):
+    """Respuesta 412 con la representación actual, para releer solo esa entidad."""
+    body = {"message": "Resource was modified by another request", "current": current}
+    return body, 412, etag_header(etag)
+
+
+def etag_header(etag):
+    """Headers a agregar a una respuesta 200 para exponer el ETag."""
+    return {"ETag": quote_etag(etag)}
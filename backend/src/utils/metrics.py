@@ -0,0 +1,273 @@
+"""
+Métricas en formato Prometheus servidas en GET /metrics.
+
+Por cada ruta (la regla de URL, que identifica al recurso de flask-restx) y
+método se registran la latencia, el tamaño de la respuesta, los códigos de
+estado y cuántas sentencias SQL ejecutó el request y cuánto tardaron (eventos
+before/after_cursor_execute de SQLAlchemy). Además se exportan el estado del
+pool de conexiones y los contadores de los caches de boards y de permisos.
+
+Con varios workers de gunicorn hay que definir PROMETHEUS_MULTIPROC_DIR: cada
+proceso escribe sus valores en ese directorio y /metrics los agrega (ver
+gunicorn.conf.py). Los aciertos y fallos de los caches son counters que se
+incrementan en cada consulta, así que no bajan cuando gunicorn recicla un
+worker. El tamaño de los caches y la saturación de cada pool (pool_stats) se
+copian a gauges como mucho una vez por segundo.
+
+/metrics está desactivado por defecto (METRICS_ENABLED). Con METRICS_TOKEN
+exige el header Authorization: Bearer <token>.
+"""
+
+import hmac
+import os
+import time
+
+from flask import Response, current_app, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.db import db
+from src.utils.board_cache import board_cache
+from src.utils.db_pool import WAIT_BUCKETS, pool_stats, pool_wait_stats
+from src.utils.permissions import permission_cache
+
+# Segundos entre copias de los contadores de los caches a sus gauges
+SAMPLED_GAUGES_INTERVAL = 1.0
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUEST_LABELS = ("route", "method")
+
+REQUESTS = Counter(
+    "http_requests", "Requests respondidos", REQUEST_LABELS + ("status",)
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latencia de los requests", REQUEST_LABELS
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Tamaño del cuerpo de las respuestas",
+    REQUEST_LABELS,
+    buckets=SIZE_BUCKETS,
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Sentencias SQL ejecutadas por request",
+    REQUEST_LABELS,
+    buckets=STATEMENT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Counter(
+    "http_request_db_seconds", "Tiempo total en sentencias SQL", REQUEST_LABELS
+)
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Conexiones del pool en uso",
+    ("bind",),
+    multiprocess_mode="livesum",
+)
+POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Conexiones que puede abrir el pool (pool_size + max_overflow)",
+    ("bind",),
+    multiprocess_mode="livesum",
+)
+POOL_SATURATION = Gauge(
+    "db_pool_saturation",
+    "Conexiones en uso sobre la capacidad del pool (máximo entre procesos)",
+    ("bind",),
+    multiprocess_mode="livemax",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera por una conexión libre del pool",
+    buckets=WAIT_BUCKETS,
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts", "Checkouts que agotaron DB_POOL_TIMEOUT"
+)
+
+CACHE_EVENTS = Counter(
+    "cache_events", "Aciertos y fallos de los caches en memoria", ("cache", "result")
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entradas en los caches en memoria",
+    ("cache",),
+    multiprocess_mode="livesum",
+)
+BOARD_CACHE_BYTES = Gauge(
+    "board_cache_bytes",
+    "Bytes ocupados por el cache de boards",
+    multiprocess_mode="livesum",
+)
+
+_sampled_gauges_updated_at = 0.0
+# Engines con los gauges del pool, por bind
+_watched_engines = {}
+
+
+def _multiprocess():
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("metrics_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = conn.info["metrics_started_at"].pop()
+    if has_request_context() and "metrics_started_at" in g:
+        g.metrics_statements += 1
+        g.metrics_db_seconds += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    # La sentencia falló: descartar su inicio para no desalinear la pila
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_started_at"):
+        connection.info["metrics_started_at"].pop()
+
+
+def _bind_name(bind_key):
+    return "primary" if bind_key is None else bind_key
+
+
+def _watch_pool(bind, engine):
+    """Mantiene los gauges del pool de un engine con sus eventos."""
+    checked_out = POOL_CHECKED_OUT.labels(bind)
+    _watched_engines[bind] = engine
+
+    def set_capacity(*args):
+        # Al conectar y no al iniciar: con preload_app cada worker debe publicar
+        # su propio valor
+        stats = pool_stats(engine)
+        if "capacity" in stats:
+            POOL_CAPACITY.labels(bind).set(stats["capacity"])
+
+    event.listen(engine, "connect", set_capacity)
+    # El evento checkin llega antes de que el pool descuente la conexión, así
+    # que se cuenta aparte en vez de leer pool.checkedout()
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+
+
+def _observe_pool_wait(seconds, timed_out):
+    POOL_CHECKOUT_WAIT.observe(seconds)
+    if timed_out:
+        POOL_CHECKOUT_TIMEOUTS.inc()
+
+
+def _cache_observer(name):
+    """Observer de un cache que cuenta cada acierto o fallo en CACHE_EVENTS."""
+    hit, miss = CACHE_EVENTS.labels(name, "hit"), CACHE_EVENTS.labels(name, "miss")
+    return lambda is_hit: (hit if is_hit else miss).inc()
+
+
+_CACHE_OBSERVERS = (
+    (board_cache, _cache_observer("board")),
+    (permission_cache, _cache_observer("permission")),
+)
+
+
+def _update_sampled_gauges(force=False):
+    """
+    Copia el tamaño de los caches y la saturación de cada pool a sus gauges
+    (como mucho 1 vez/s).
+    """
+    global _sampled_gauges_updated_at
+    now = time.monotonic()
+    if not force and now - _sampled_gauges_updated_at < SAMPLED_GAUGES_INTERVAL:
+        return
+    _sampled_gauges_updated_at = now
+
+    for name, stats in (
+        ("board", board_cache.stats()),
+        ("permission", permission_cache.stats()),
+    ):
+        CACHE_ENTRIES.labels(name).set(stats["entries"])
+    BOARD_CACHE_BYTES.set(board_cache.stats()["bytes"])
+
+    for bind, engine in _watched_engines.items():
+        stats = pool_stats(engine)
+        if "saturation" in stats:
+            POOL_SATURATION.labels(bind).set(stats["saturation"])
+
+
+def _start_request():
+    if request.endpoint == "metrics":
+        return
+    g.metrics_started_at = time.perf_counter()
+    g.metrics_statements = 0
+    g.metrics_db_seconds = 0.0
+
+
+def _finish_request(response):
+    if "metrics_started_at" not in g:
+        return response
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    labels = (route, request.method)
+    REQUEST_LATENCY.labels(*labels).observe(
+        time.perf_counter() - g.metrics_started_at
+    )
+    REQUESTS.labels(*labels, str(response.status_code)).inc()
+    if response.content_length is not None:
+        RESPONSE_SIZE.labels(*labels).observe(response.content_length)
+    REQUEST_STATEMENTS.labels(*labels).observe(g.metrics_statements)
+    REQUEST_DB_SECONDS.labels(*labels).inc(g.metrics_db_seconds)
+    _update_sampled_gauges()
+    return response
+
+
+def metrics_response():
+    """Cuerpo de GET /metrics con las métricas de todos los procesos."""
+    token = current_app.config["METRICS_TOKEN"]
+    authorization = request.headers.get("Authorization", "")
+    if token and not hmac.compare_digest(authorization, f"Bearer {token}"):
+        return Response(
+            "Unauthorized", status=401, headers={"WWW-Authenticate": "Bearer"}
+        )
+    _update_sampled_gauges(force=True)
+    if _multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """
+    Registra la medición de requests y SQL y la ruta /metrics (si
+    METRICS_ENABLED). Se llama después de db.init_app.
+    """
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+    if _observe_pool_wait not in pool_wait_stats.observers:
+        pool_wait_stats.observers.append(_observe_pool_wait)
+    for cache, observer in _CACHE_OBSERVERS:
+        if observer not in cache.observers:
+            cache.observers.append(observer)
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            _watch_pool(_bind_name(bind_key), engine)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule("/metrics", "metrics", metrics_response, methods=["GET"])
@@ -0,0 +1,119 @@
+"""
+Paginación por cursor (keyset) para colecciones de cards.
+
+El orden es (rank, id): es total y no cambia cuando se mueven otras cards, así
+que cada página continúa exactamente donde terminó la anterior sin OFFSET.
+"""
+
+import base64
+import binascii
+import json
+
+from flask import request
+from sqlalchemy import tuple_
+from werkzeug.exceptions import BadRequest
+
+from src.models import Card
+from src.utils.board_reader import read_cards
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(rank, item_id):
+    """
+    Codifica la clave (rank, id) del último elemento en un cursor opaco. Sirve
+    para cualquier orden por (clave de texto, id), por ejemplo el título.
+    """
+    raw = json.dumps([rank, item_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Raises:
+        BadRequest: Si el cursor no es válido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, item_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequest("Invalid cursor")
+    if not isinstance(rank, str) or not isinstance(item_id, int):
+        raise BadRequest("Invalid cursor")
+    return rank, item_id
+
+
+def parse_limit():
+    """
+    Lee el tamaño de página de ?limit=, acotado a MAX_PAGE_SIZE.
+
+    Raises:
+        BadRequest: Si el límite no es positivo
+    """
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    if limit < 1:
+        raise BadRequest("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_card_page_args():
+    """
+    Lee limit, cursor y archived de los query params.
+
+    Returns:
+        dict: limit (int), cursor (str o None) y archived (True, False o None)
+    """
+    limit = parse_limit()
+
+    archived = request.args.get("archived")
+    if archived is not None:
+        if archived.lower() not in ("true", "false"):
+            raise BadRequest("archived must be true or false")
+        archived = archived.lower() == "true"
+
+    return {
+        "limit": limit,
+        "cursor": request.args.get("cursor") or None,
+        "archived": archived,
+    }
+
+
+def page_variant(prefix, page):
+    """Clave de cache que identifica la página pedida."""
+    return f"{prefix}:{page['archived']}:{page['limit']}:{page['cursor']}"
+
+
+def paginate_cards(*criteria, limit, cursor=None, archived=None, fields=None):
+    """
+    Lee una página de cards por keyset aplicando el filtro de archivado en SQL.
+
+    Args:
+        *criteria: Condiciones que acotan las cards (lista o board)
+        limit: Cantidad máxima de cards
+        cursor: Cursor de la página anterior o None
+        archived: True/False para filtrar por archivado, None para todas
+        fields: Campos a devolver (ver src/utils/fieldsets.py) o None para todos
+
+    Returns:
+        dict: {"cards": [...], "next_cursor": str o None}
+    """
+    criteria = list(criteria)
+    if archived is not None:
+        # Misma forma que el predicado del índice parcial de cards activas
+        criteria.append(Card.archived if archived else ~Card.archived)
+    if cursor:
+        rank, item_id = decode_cursor(cursor)
+        criteria.append(tuple_(Card.rank, Card.id) > tuple_(rank, item_id))
+
+    cards, rows = read_cards(*criteria, fields=fields, limit=limit + 1)
+
+    next_cursor = None
+    if len(cards) > limit:
+        cards = cards[:limit]
+        # read_cards deja rank e id como últimas columnas de cada fila
+        next_cursor = encode_cursor(rows[limit - 1][-2], rows[limit - 1][-1])
+
+    return {"cards": cards, "next_cursor": next_cursor}
@@ -0,0 +1,88 @@
+"""
+Cache en proceso de permisos por (usuario, board).
+
+Guarda el rol ("owner", "member" o None si no tiene acceso) que resolvió
+require_board_access para no repetir la query en requests seguidos del mismo
+usuario. Solo se usa cuando el board_id viene directo en el request: si hay que
+resolverlo desde una lista o card se consulta siempre, porque pueden moverse de
+board. El TTL es corto porque cada proceso tiene su propio cache y la
+invalidación por cambios de miembros solo llega al proceso que los hizo.
+"""
+
+import threading
+import time
+
+
+class PermissionCache:
+    """Roles por usuario con vencimiento (PERMISSION_CACHE_TTL, 0 lo desactiva)."""
+
+    MISSING = object()
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._roles = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Funciones observer(hit) que reciben cada acierto o fallo
+        self.observers = []
+
+    def get(self, user_id, board_id):
+        """Retorna el rol cacheado o PermissionCache.MISSING."""
+        role = self.MISSING
+        with self._lock:
+            entry = self._roles.get(user_id, {}).get(board_id)
+            if entry is not None and entry[1] < time.monotonic():
+                del self._roles[user_id][board_id]
+            elif entry is not None:
+                role = entry[0]
+            if role is self.MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        for observer in self.observers:
+            observer(role is not self.MISSING)
+        return role
+
+    def put(self, user_id, board_id, role):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._roles.setdefault(user_id, {})[board_id] = (
+                role,
+                time.monotonic() + self.ttl,
+            )
+
+    def invalidate(self, board_id, user_ids=None):
+        """
+        Descarta los roles cacheados de un board.
+
+        Args:
+            board_id: ID del board
+            user_ids: Usuarios afectados (None para todos)
+        """
+        with self._lock:
+            users = self._roles.keys() if user_ids is None else user_ids
+            for user_id in list(users):
+                self._roles.get(user_id, {}).pop(board_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._roles.clear()
+
+    def stats(self):
+        """Contadores y tamaño para exportar como métricas."""
+        with self._lock:
+            return {
+                "entries": sum(len(roles) for roles in self._roles.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+permission_cache = PermissionCache()
+
+
+def init_permission_cache(app):
+    """Configura el TTL del cache desde app.config."""
+    permission_cache.ttl = app.config["PERMISSION_CACHE_TTL"]
@@ -2,8 +2,101 @@
 Funciones auxiliares para manejar posiciones de cards y lists
 """
 
+from flask import current_app
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.exc import InvalidRequestError
+from werkzeug.exceptions import NotFound
 from src.db import db
-from src.models import Card, List
+from src.models import Board, Card
+from src.utils.change_tracking import record_bulk_updates
+from src.utils.ranks import RANK_MAX_LENGTH, rank_between, spread_ranks
+from src.utils.soft_delete import visible_cards, visible_lists
+
+# UNIQUE (list_id, position) diferible de la migración e5b2c8a41f07 (Postgres)
+POSITION_CONSTRAINT = "uq_cards_list_id_position"
+
+
+def uses_rank_ordering():
+    """
+    Indica si el orden se mantiene solo con claves rank (POSITION_MODE = "rank").
+    En ese modo no se renumeran los hermanos y cada movimiento escribe una sola fila.
+    """
+    return current_app.config.get("POSITION_MODE", "dense") == "rank"
+
+
+class PositionConflict(Exception):
+    """El elemento cambió de board mientras se esperaba el lock de posiciones."""
+
+
+def lock_positions(*board_ids, item=None):
+    """
+    Serializa los cambios de orden dentro de los boards dados. Se llama antes de
+    leer posiciones o ranks, y el lock dura hasta el commit o rollback.
+
+    Bloquea las filas de los boards en orden de id para no provocar deadlocks.
+    Cada cambio de orden ya actualiza boards.version en el flush, así que esto
+    solo adelanta al principio de la transacción un lock que se tomaba igual.
+    En Postgres usa SELECT ... FOR UPDATE. SQLite no lo soporta, así que ahí
+    un UPDATE sin efecto toma el lock de escritura de la base.
+
+    Args:
+        *board_ids: IDs de los boards afectados (los None se ignoran)
+        item: Card o List que se va a mover; se recargan su padre y su posición
+            con el lock ya tomado
+
+    Raises:
+        PositionConflict: Si otro request movió item a un board no bloqueado
+        NotFound: Si otro request borró item
+    """
+    ids = sorted({board_id for board_id in board_ids if board_id is not None})
+    if not ids:
+        return
+
+    if db.session.get_bind().dialect.name == "sqlite":
+        db.session.execute(
+            Board.__table__.update()
+            .where(Board.id.in_(ids))
+            .values(updated_at=Board.updated_at)
+        )
+    else:
+        db.session.execute(
+            select(Board.id)
+            .where(Board.id.in_(ids))
+            .order_by(Board.id)
+            .with_for_update()
+        )
+
+    if item is not None and item.id is not None:
+        fields = ["board_id", "position", "rank"]
+        if isinstance(item, Card):
+            fields.append("list_id")
+        try:
+            db.session.refresh(item, fields)
+        except InvalidRequestError:
+            # Otro request lo borró mientras se esperaba el lock
+            raise NotFound(f"{type(item).__name__} not found")
+        if item.board_id not in ids:
+            raise PositionConflict(f"{item!r} moved to another board")
+
+
+def _shift_positions(model, parent_id_field, parent_id, delta, *criteria):
+    """
+    Desplaza en bloque las posiciones de los hermanos que cumplen los criterios.
+    Ejecuta un único UPDATE ... SET position = position + delta sin cargar filas;
+    los objetos ya cargados en la sesión se sincronizan evaluando el filtro en Python.
+
+    Args:
+        model: El modelo (Card o List)
+        parent_id_field: El campo que relaciona con el padre ('list_id' o 'board_id')
+        parent_id: El ID del padre
+        delta: Cantidad a sumar a la posición (+1 o -1)
+        *criteria: Filtros adicionales sobre las filas a desplazar
+    """
+    criteria = (getattr(model, parent_id_field) == parent_id, *criteria)
+    record_bulk_updates(model, *criteria)
+    model.query.filter(*criteria).update(
+        {model.position: model.position + delta}, synchronize_session="evaluate"
+    )
 
 
 def adjust_positions_on_insert(model, parent_id_field, parent_id, position):
@@ -17,16 +110,9 @@ def adjust_positions_on_insert(model, parent_id_field, parent_id, position):
         parent_id: El ID del padre
         position: La posición donde se insertará el nuevo elemento
     """
-    # Obtener todos los elementos con posición >= a la nueva
-    items_to_move = (
-        model.query.filter_by(**{parent_id_field: parent_id})
-        .filter(model.position >= position)
-        .all()
-    )
-
-    # Incrementar la posición de cada uno
-    for item in items_to_move:
-        item.position += 1
+    if uses_rank_ordering():
+        return
+    _shift_positions(model, parent_id_field, parent_id, 1, model.position >= position)
 
 
 def compact_positions_on_delete(model, parent_id_field, parent_id, deleted_position):
@@ -40,17 +126,12 @@ def compact_positions_on_delete(model, parent_id_field, parent_id, deleted_posit
         parent_id: El ID del padre
         deleted_position: La posición del elemento eliminado
     """
-    # Obtener todos los elementos con posición > a la eliminada
-    items_to_move = (
-        model.query.filter_by(**{parent_id_field: parent_id})
-        .filter(model.position > deleted_position)
-        .all()
+    if uses_rank_ordering():
+        return
+    _shift_positions(
+        model, parent_id_field, parent_id, -1, model.position > deleted_position
     )
 
-    # Decrementar la posición de cada uno
-    for item in items_to_move:
-        item.position -= 1
-
 
 def reorder_on_move(
     model,
@@ -74,30 +155,34 @@ def reorder_on_move(
         new_parent_id: ID del padre destino
         new_position: Posición destino
     """
+    if uses_rank_ordering():
+        # Solo cambia el rank del elemento movido (ver assign_rank)
+        return
+
     if old_parent_id == new_parent_id:
         # Movimiento dentro del mismo padre
         if new_position > old_position:
             # Moviendo hacia adelante: decrementar posiciones entre old y new
-            items_to_move = (
-                model.query.filter_by(**{parent_id_field: new_parent_id})
-                .filter(model.id != item.id)
-                .filter(model.position > old_position)
-                .filter(model.position <= new_position)
-                .all()
+            _shift_positions(
+                model,
+                parent_id_field,
+                new_parent_id,
+                -1,
+                model.id != item.id,
+                model.position > old_position,
+                model.position <= new_position,
             )
-            for i in items_to_move:
-                i.position -= 1
         else:
             # Moviendo hacia atrás: incrementar posiciones entre new y old
-            items_to_move = (
-                model.query.filter_by(**{parent_id_field: new_parent_id})
-                .filter(model.id != item.id)
-                .filter(model.position >= new_position)
-                .filter(model.position < old_position)
-                .all()
+            _shift_positions(
+                model,
+                parent_id_field,
+                new_parent_id,
+                1,
+                model.id != item.id,
+                model.position >= new_position,
+                model.position < old_position,
             )
-            for i in items_to_move:
-                i.position += 1
     else:
         # Movimiento entre padres diferentes
         # 1. Compactar posiciones en el padre origen
@@ -107,6 +192,28 @@ def reorder_on_move(
         adjust_positions_on_insert(model, parent_id_field, new_parent_id, new_position)
 
 
+def position_changed(old_parent_id, old_position, new_parent_id, new_position):
+    """
+    Indica si un movimiento pedido cambia algo y hay que reordenar.
+    En modo rank la posición guardada no se mantiene densa, así que cualquier
+    posición pedida se trata como un cambio.
+
+    Args:
+        old_parent_id: ID del padre original
+        old_position: Posición original
+        new_parent_id: ID del padre destino
+        new_position: Posición destino (None si no se pidió)
+
+    Returns:
+        bool: True si hay que reordenar
+    """
+    if new_parent_id != old_parent_id:
+        return True
+    if new_position is None:
+        return False
+    return uses_rank_ordering() or new_position != old_position
+
+
 def get_next_position(model, parent_id_field, parent_id):
     """
     Obtiene la siguiente posición disponible para un nuevo elemento.
@@ -119,33 +226,199 @@ def get_next_position(model, parent_id_field, parent_id):
     Returns:
         int: La siguiente posición disponible
     """
+    if uses_rank_ordering():
+        # Las posiciones guardadas no son densas: el final es la cantidad de hermanos
+        return (
+            db.session.query(db.func.count(model.id))
+            .filter_by(**{parent_id_field: parent_id})
+            .scalar()
+        )
+
     max_position = (
         db.session.query(db.func.max(model.position))
         .filter_by(**{parent_id_field: parent_id})
         .scalar()
     )
-    return (max_position or -1) + 1
+    return 0 if max_position is None else max_position + 1
 
 
-def validate_position(model, parent_id_field, parent_id, position):
+def validate_position(model, parent_id_field, parent_id, position, item=None):
     """
     Valida que la posición sea válida.
     Si es None, retorna la siguiente posición disponible.
     Si es negativa, retorna 0.
+    Si pasa del final, retorna la última posición para que el orden quede denso.
 
     Args:
         model: El modelo (Card o List)
         parent_id_field: El campo que relaciona con el padre ('list_id' o 'board_id')
         parent_id: El ID del padre
         position: La posición a validar
+        item: El elemento que se mueve (no se cuenta entre los hermanos)
 
     Returns:
         int: La posición validada
     """
-    if position is None:
+    if position is None and item is None:
         return get_next_position(model, parent_id_field, parent_id)
 
-    if position < 0:
+    if position is not None and position <= 0:
         return 0
 
-    return position
+    siblings = db.session.query(db.func.count(model.id)).filter_by(
+        **{parent_id_field: parent_id}
+    )
+    if item is not None and item.id is not None:
+        siblings = siblings.filter(model.id != item.id)
+    last = siblings.scalar()
+    return last if position is None else min(position, last)
+
+
+def rank_at(model, parent_id_field, parent_id, position, exclude_id=None):
+    """
+    Calcula la clave rank que ubica un elemento en el índice position entre los
+    hijos del padre. Solo lee los dos vecinos; si la clave resultante es
+    demasiado larga redistribuye las claves del padre.
+
+    Args:
+        model: El modelo (Card o List)
+        parent_id_field: El campo que relaciona con el padre ('list_id' o 'board_id')
+        parent_id: El ID del padre destino
+        position: El índice destino dentro del padre (None para el final)
+        exclude_id: ID del elemento que se mueve (no se cuenta entre los hermanos)
+
+    Returns:
+        str: La clave rank
+    """
+    siblings = db.session.query(model.rank).filter_by(**{parent_id_field: parent_id})
+    if exclude_id is not None:
+        siblings = siblings.filter(model.id != exclude_id)
+
+    for _ in range(2):
+        ordered = siblings.order_by(model.rank, model.id)
+        if position is not None and position > 0:
+            neighbours = [rank for (rank,) in ordered.offset(position - 1).limit(2)]
+        else:
+            neighbours = []
+        if neighbours:
+            before = neighbours[0]
+            after = neighbours[1] if len(neighbours) > 1 else None
+        elif position is None or position > 0:
+            # Posición más allá del final: agregar después del último
+            before = siblings.with_entities(db.func.max(model.rank)).scalar()
+            after = None
+        else:
+            before = None
+            after = ordered.limit(1).scalar()
+
+        if after is None or (before or "") < after:
+            rank = rank_between(before, after)
+            if len(rank) <= RANK_MAX_LENGTH:
+                return rank
+
+        # Claves agotadas o duplicadas: redistribuir el padre y reintentar
+        rebalance_ranks(model, parent_id_field, parent_id, exclude_id=exclude_id)
+
+    return rank_between(before, after)
+
+
+def assign_rank(model, parent_id_field, item, parent_id, position):
+    """
+    Asigna a item una clave rank que lo ubica en el índice position entre sus
+    hermanos del padre destino (ver rank_at). Solo escribe el propio item.
+
+    En un movimiento se llama después de reorder_on_move: con el rank pendiente,
+    el UPDATE en bloque de los hermanos dispararía un autoflush y la fila (y la
+    versión del board) se escribiría dos veces.
+
+    Args:
+        model: El modelo (Card o List)
+        parent_id_field: El campo que relaciona con el padre ('list_id' o 'board_id')
+        item: El elemento que se inserta o mueve
+        parent_id: El ID del padre destino
+        position: El índice destino dentro del padre
+    """
+    item.rank = rank_at(model, parent_id_field, parent_id, position, exclude_id=item.id)
+
+
+def rebalance_ranks(model, parent_id_field, parent_id, exclude_id=None):
+    """
+    Reasigna claves rank cortas y equiespaciadas a todos los hijos de un padre,
+    respetando el orden actual.
+
+    Args:
+        model: El modelo (Card o List)
+        parent_id_field: El campo que relaciona con el padre ('list_id' o 'board_id')
+        parent_id: El ID del padre
+        exclude_id: ID de un elemento a ignorar (el que se está moviendo)
+    """
+    query = db.session.query(model.id).filter_by(**{parent_id_field: parent_id})
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+    ids = [item_id for (item_id,) in query.order_by(model.rank, model.id)]
+    if not ids:
+        return
+
+    record_bulk_updates(model, model.id.in_(ids))
+    # UPDATE de Core (no el bulk del ORM) para no exigir ni tocar la versión de fila
+    table = model.__table__
+    db.session.execute(
+        table.update()
+        .where(table.c.id == bindparam("item_id"))
+        .values(rank=bindparam("new_rank")),
+        [
+            {"item_id": item_id, "new_rank": rank}
+            for item_id, rank in zip(ids, spread_ranks(len(ids)))
+        ],
+    )
+
+    # El UPDATE por clave primaria no sincroniza la sesión: expirar los ranks cargados
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, model):
+            db.session.expire(obj, ["rank"])
+
+
+def renumber_positions(model, parent_id_field, parent_ids):
+    """
+    Reescribe con un único UPDATE las posiciones densas de los hijos de varios
+    padres según (rank, id), sin cargar filas. Solo escribe las filas cuya
+    posición cambia. En modo rank no hace nada.
+
+    Args:
+        model: El modelo (Card o List)
+        parent_id_field: El campo que relaciona con el padre ('list_id' o 'board_id')
+        parent_ids: IDs de los padres a renumerar
+
+    Returns:
+        int: Cantidad de filas cuya posición se reescribió
+    """
+    if not parent_ids or uses_rank_ordering():
+        return 0
+
+    table = model.__table__
+    parent = table.c[parent_id_field]
+    # El UPDATE es de Core: el filtro de bajas del ORM no aplica a la subquery
+    visible = visible_cards() if model is Card else visible_lists()
+    ordered = (
+        select(
+            table.c.id,
+            (
+                func.row_number().over(
+                    partition_by=parent, order_by=(table.c.rank, table.c.id)
+                )
+                - 1
+            ).label("expected"),
+        )
+        .where(parent.in_(parent_ids), visible)
+        .subquery()
+    )
+    criteria = (table.c.id == ordered.c.id, table.c.position != ordered.c.expected)
+    record_bulk_updates(model, *criteria)
+    result = db.session.execute(
+        table.update().where(*criteria).values(position=ordered.c.expected)
+    )
+
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, model):
+            db.session.expire(obj, ["position"])
+    return result.rowcount
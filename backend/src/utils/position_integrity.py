@@ -0,0 +1,244 @@
+"""
+Detección y reparación de posiciones inconsistentes (`flask positions`).
+
+Las posiciones se revisan por lotes de padres (listas para las cards, boards
+para las listas) en orden de id. Cada lote se analiza con una sola query con
+funciones de ventana que devuelve una fila por padre con problemas, así que
+nunca se cargan los hijos en memoria.
+
+El orden de referencia es (rank, id), el mismo que usan las lecturas: reparar
+reescribe position con ese orden y redistribuye los ranks repetidos.
+
+En Postgres la restricción UNIQUE (list_id, position) de las cards solo vale en
+modo dense; check_position_constraint verifica al arrancar el servidor que
+coincida con POSITION_MODE.
+"""
+
+from sqlalchemy import and_, case, distinct, func, inspect, not_, or_, select
+from sqlalchemy.exc import NoSuchTableError
+
+from src.db import db
+from src.models import Board, Card, List
+from src.utils.board_versions import mark_boards_changed
+from src.utils.position_helpers import (
+    POSITION_CONSTRAINT,
+    lock_positions,
+    rebalance_ranks,
+    renumber_positions,
+    uses_rank_ordering,
+)
+
+DEFAULT_BATCH_SIZE = 500
+
+# tipo -> (modelo, campo del padre, modelo del padre)
+POSITION_KINDS = {
+    "cards": (Card, "list_id", List),
+    "lists": (List, "board_id", Board),
+}
+
+
+def parent_batches(kind, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Genera los IDs de los padres del tipo dado en orden, de a batch_size.
+
+    Args:
+        kind: "cards" (padres: listas) o "lists" (padres: boards)
+        batch_size: Cantidad de IDs por lote
+    """
+    parent_model = POSITION_KINDS[kind][2]
+    after_id = 0
+    while True:
+        ids = db.session.scalars(
+            select(parent_model.id)
+            .where(parent_model.id > after_id)
+            .order_by(parent_model.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return
+        yield ids
+        after_id = ids[-1]
+
+
+def _ordered(model, parent_id_field, parent_ids):
+    """
+    Subquery con cada hijo de los padres dados, su posición esperada según
+    (rank, id) y cuántos hermanos comparten su posición o su rank.
+    """
+    parent = getattr(model, parent_id_field)
+    return (
+        select(
+            model.id,
+            parent.label("parent_id"),
+            model.position,
+            (
+                func.row_number().over(
+                    partition_by=parent, order_by=(model.rank, model.id)
+                )
+                - 1
+            ).label("expected"),
+            func.count().over(partition_by=parent).label("total"),
+            func.count()
+            .over(partition_by=(parent, model.position))
+            .label("same_position"),
+            func.count().over(partition_by=(parent, model.rank)).label("same_rank"),
+        )
+        .where(parent.in_(parent_ids))
+        .subquery()
+    )
+
+
+def _issues_query(ordered, rank_mode):
+    """Agrega los problemas por padre y devuelve solo los padres con alguno."""
+    o = ordered.c
+    in_range = and_(o.position >= 0, o.position < o.total)
+    duplicate_ranks = func.sum(case((o.same_rank > 1, 1), else_=0))
+    misplaced = func.sum(case((o.position != o.expected, 1), else_=0))
+    return (
+        select(
+            o.parent_id,
+            func.max(o.total).label("count"),
+            func.sum(case((o.same_position > 1, 1), else_=0)).label("duplicates"),
+            (
+                func.max(o.total) - func.count(distinct(case((in_range, o.position))))
+            ).label("gaps"),
+            func.sum(case((not_(in_range), 1), else_=0)).label("out_of_range"),
+            duplicate_ranks.label("duplicate_ranks"),
+            misplaced.label("misplaced"),
+        )
+        .group_by(o.parent_id)
+        # En modo rank las posiciones no se mantienen: solo importan los ranks
+        .having(
+            duplicate_ranks > 0
+            if rank_mode
+            else or_(duplicate_ranks > 0, misplaced > 0)
+        )
+        .order_by(o.parent_id)
+    )
+
+
+def find_position_issues(kind, parent_ids):
+    """
+    Analiza los hijos de un lote de padres con una sola query.
+
+    Args:
+        kind: "cards" o "lists"
+        parent_ids: IDs de los padres a revisar
+
+    Returns:
+        list[dict]: Un reporte por padre con problemas: kind, parent_id, count,
+            duplicates, gaps, out_of_range, duplicate_ranks y misplaced (hijos
+            fuera de su posición esperada)
+    """
+    model, parent_id_field, _ = POSITION_KINDS[kind]
+    ordered = _ordered(model, parent_id_field, parent_ids)
+    rows = db.session.execute(_issues_query(ordered, uses_rank_ordering()))
+    issues = [{"kind": kind, **row._asdict()} for row in rows]
+    # No mantener abierta la transacción de lectura entre lotes
+    db.session.rollback()
+    return issues
+
+
+def repair_position_issues(kind, issues):
+    """
+    Repara los padres reportados por find_position_issues en una transacción.
+
+    Redistribuye los ranks repetidos y, en modo dense, asigna a cada hijo su
+    índice según (rank, id) con un único UPDATE. Bloquea los boards afectados
+    como cualquier otro cambio de orden.
+
+    Args:
+        kind: "cards" o "lists"
+        issues: Reportes de un lote
+
+    Returns:
+        int: Cantidad de filas cuya posición se reescribió
+    """
+    model, parent_id_field, _ = POSITION_KINDS[kind]
+    parent_ids = [issue["parent_id"] for issue in issues]
+    if not parent_ids:
+        return 0
+
+    if model is Card:
+        board_ids = set(
+            db.session.scalars(
+                select(List.board_id).where(List.id.in_(parent_ids)).distinct()
+            )
+        )
+    else:
+        board_ids = set(parent_ids)
+    lock_positions(*board_ids)
+
+    for issue in issues:
+        if issue["duplicate_ranks"]:
+            rebalance_ranks(model, parent_id_field, issue["parent_id"])
+
+    updated = renumber_positions(model, parent_id_field, parent_ids)
+    mark_boards_changed(db.session, board_ids)
+    db.session.commit()
+    return updated
+
+
+def position_constraint_exists():
+    """
+    Indica si cards tiene la restricción UNIQUE (list_id, position).
+
+    Returns:
+        bool | None: None si la base no es Postgres o todavía no tiene la tabla
+            cards
+    """
+    if db.engine.dialect.name != "postgresql":
+        return None
+    try:
+        constraints = inspect(db.engine).get_unique_constraints("cards")
+    except NoSuchTableError:
+        return None
+    return any(constraint["name"] == POSITION_CONSTRAINT for constraint in constraints)
+
+
+def drop_position_constraint():
+    """Elimina la restricción UNIQUE (list_id, position), para el modo rank."""
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            f"ALTER TABLE cards DROP CONSTRAINT IF EXISTS {POSITION_CONSTRAINT}"
+        )
+
+
+def create_position_constraint():
+    """
+    Vuelve a crear la restricción UNIQUE (list_id, position) al volver al modo
+    dense. Las posiciones tienen que estar densas: reparar las cards antes.
+    """
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            f"ALTER TABLE cards ADD CONSTRAINT {POSITION_CONSTRAINT} "
+            "UNIQUE (list_id, position) DEFERRABLE INITIALLY DEFERRED"
+        )
+
+
+def check_position_constraint(app):
+    """
+    Verifica que la restricción de posiciones coincida con POSITION_MODE. Se
+    llama antes de atender requests, no en create_app, para que `flask db` y
+    `flask positions` funcionen con cualquier modo.
+
+    Raises:
+        RuntimeError: Si POSITION_MODE es "rank" y la restricción existe: cada
+            movimiento deja posiciones repetidas y fallaría
+    """
+    with app.app_context():
+        exists = position_constraint_exists()
+        if exists is None:
+            return
+        if uses_rank_ordering() and exists:
+            raise RuntimeError(
+                f"POSITION_MODE=rank requires dropping {POSITION_CONSTRAINT}: "
+                "run `flask positions constraint --drop`"
+            )
+        if not uses_rank_ordering() and not exists:
+            app.logger.warning(
+                "%s is missing: dense positions are not enforced by the database "
+                "(run `flask positions repair --kind cards`, then "
+                "`flask positions constraint --create`)",
+                POSITION_CONSTRAINT,
+            )
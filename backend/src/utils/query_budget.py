@@ -0,0 +1,202 @@
+"""
+Conteo de sentencias SQL por bloque o por request y detección de N+1.
+
+Dos sentencias tienen la misma forma si solo difieren en sus parámetros y
+literales (statement_shape). Una forma que se repite muchas veces en un mismo
+request suele ser un N+1: una query por lista, un lazy load por miembro, etc.
+
+- QueryCounter: cuenta las sentencias ejecutadas dentro de un bloque with.
+- query_budget: igual, pero falla si se excede un presupuesto de sentencias o
+  de repeticiones de una misma forma. Sirve como context manager o decorador
+  (ver scripts/check_query_budgets.py).
+- init_query_debug: en desarrollo (QUERY_DEBUG), agrega el header X-Query-Count
+  a cada respuesta y registra un warning con las formas repetidas.
+"""
+
+import re
+import threading
+from collections import Counter
+from contextlib import ContextDecorator
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+# Grupos de parámetros: IN (?, ?, ?) y VALUES (?, ?), (?, ?)
+_GROUP = r"\(\s*\?(?:\s*,\s*\?)*\s*\)"
+_PARAMETER_GROUPS = re.compile(rf"{_GROUP}(?:\s*,\s*{_GROUP})*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement):
+    """
+    Normaliza una sentencia SQL quitando parámetros y literales.
+
+    Args:
+        statement: SQL tal como llega al cursor
+
+    Returns:
+        str: La sentencia con cada parámetro como ? y cada lista de parámetros
+            como (...)
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PARAMETER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PARAMETER_GROUPS.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def repeated_shapes(statements, threshold):
+    """
+    Formas que aparecen al menos threshold veces, de la más repetida a la menos.
+
+    Returns:
+        list[tuple[str, int]]: (forma, cantidad)
+    """
+    counts = Counter(statement_shape(statement) for statement in statements)
+    return [
+        (shape, count) for shape, count in counts.most_common() if count >= threshold
+    ]
+
+
+class QueryCounter:
+    """
+    Registra las sentencias SQL que ejecuta el hilo actual dentro de un bloque
+    with, en cualquier engine. Un executemany cuenta como una sentencia.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self._thread_id = None
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread_id:
+            self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        self._thread_id = threading.get_ident()
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        event.remove(Engine, "before_cursor_execute", self._record)
+        return False
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def repeated(self, threshold=2):
+        """Formas ejecutadas al menos threshold veces (ver repeated_shapes)."""
+        return repeated_shapes(self.statements, threshold)
+
+    def report(self):
+        """Resumen legible: cantidad total y cada forma con sus repeticiones."""
+        lines = [f"{self.count} queries"]
+        for shape, count in repeated_shapes(self.statements, 1):
+            lines.append(f"  {count}x {shape[:160]}")
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Un bloque ejecutó más sentencias (o repeticiones) que su presupuesto."""
+
+
+class query_budget(QueryCounter, ContextDecorator):
+    """
+    Falla con QueryBudgetExceeded si el bloque ejecuta más de max_queries
+    sentencias o repite alguna forma más de max_repeats veces.
+
+    Uso:
+        with query_budget(3):
+            client.get(f"/boards/{board_id}/snapshot")
+
+        @query_budget(5, max_repeats=1)
+        def test_dashboard(): ...
+
+    El presupuesto no debe depender del volumen de datos: comprobarlo con un
+    board chico y uno grande detecta los N+1.
+
+    Args:
+        max_queries: Sentencias permitidas (None para no limitar)
+        max_repeats: Veces que puede repetirse una misma forma (None para no
+            limitar)
+    """
+
+    def __init__(self, max_queries=None, max_repeats=None):
+        super().__init__()
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+
+    def violations(self):
+        """
+        Returns:
+            list[str]: Motivos por los que se excedió el presupuesto
+        """
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} queries > budget of {self.max_queries}")
+        if self.max_repeats is not None:
+            for shape, count in self.repeated(self.max_repeats + 1):
+                problems.append(f"{count}x (max {self.max_repeats}) {shape[:160]}")
+        return problems
+
+    def __exit__(self, exc_type, exc, traceback):
+        super().__exit__(exc_type, exc, traceback)
+        if exc_type is None:
+            problems = self.violations()
+            if problems:
+                raise QueryBudgetExceeded(
+                    "Query budget exceeded:\n  "
+                    + "\n  ".join(problems)
+                    + "\n"
+                    + self.report()
+                )
+        return False
+
+
+def _record_request_statement(conn, cursor, statement, parameters, context, many):
+    if has_request_context() and "query_debug_statements" in g:
+        g.query_debug_statements.append(statement)
+
+
+def _start_request():
+    g.query_debug_statements = []
+
+
+def _finish_request(response, threshold):
+    statements = g.pop("query_debug_statements", None)
+    if statements is None:
+        return response
+    response.headers[QUERY_COUNT_HEADER] = str(len(statements))
+    repeated = repeated_shapes(statements, threshold)
+    if repeated:
+        current_app.logger.warning(
+            "Possible N+1 in %s %s (%d queries):\n%s",
+            request.method,
+            request.path,
+            len(statements),
+            "\n".join(f"  {count}x {shape[:160]}" for shape, count in repeated),
+        )
+    return response
+
+
+def init_query_debug(app):
+    """
+    Si QUERY_DEBUG está activo, cuenta las sentencias de cada request, las
+    informa en X-Query-Count y avisa en el log cuando una misma forma se repite
+    QUERY_REPEAT_THRESHOLD veces o más. Se llama después de db.init_app.
+    """
+    if not app.config["QUERY_DEBUG"]:
+        return
+    if not event.contains(Engine, "before_cursor_execute", _record_request_statement):
+        event.listen(Engine, "before_cursor_execute", _record_request_statement)
+    threshold = app.config["QUERY_REPEAT_THRESHOLD"]
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(response, threshold))
@@ -0,0 +1,86 @@
+"""
+Claves de orden (rank) lexicográficas para cards y lists.
+
+Cada clave es una fracción en base 36 escrita con dígitos 0-9a-z (sin ceros al
+final), de modo que el orden de strings coincide con el orden numérico y siempre
+existe una clave entre dos claves distintas. Solo se usan minúsculas para que el
+orden no dependa de la collation de la base de datos.
+"""
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Cuando una clave nueva supera este largo se redistribuyen las del padre
+RANK_MAX_LENGTH = 32
+
+
+def _midpoint(before, after):
+    """
+    Calcula una clave estrictamente entre before y after.
+    before puede ser "" (mínimo) y after None (máximo).
+    """
+    if after is not None:
+        # Copiar el prefijo común
+        n = 0
+        while n < len(after) and (before[n] if n < len(before) else "0") == after[n]:
+            n += 1
+        if n > 0:
+            return after[:n] + _midpoint(before[n:], after[n:])
+
+    digit_before = DIGITS.index(before[0]) if before else 0
+    digit_after = DIGITS.index(after[0]) if after is not None else BASE
+
+    if digit_after - digit_before > 1:
+        return DIGITS[(digit_before + digit_after) // 2]
+
+    # Dígitos consecutivos: hay que bajar un nivel
+    if after is not None and len(after) > 1:
+        return after[0]
+    return DIGITS[digit_before] + _midpoint(before[1:], None)
+
+
+def rank_between(before=None, after=None):
+    """
+    Retorna una clave que ordena entre before y after.
+
+    Args:
+        before: Clave anterior o None si se inserta al inicio
+        after: Clave siguiente o None si se inserta al final
+
+    Returns:
+        str: La nueva clave
+
+    Raises:
+        ValueError: Si before no es menor que after
+    """
+    before = before or ""
+    if after is not None and before >= after:
+        raise ValueError(f"Invalid rank interval: {before!r} >= {after!r}")
+    return _midpoint(before, after)
+
+
+def spread_ranks(count):
+    """
+    Genera count claves equiespaciadas y lo más cortas posible.
+    Se usa para el backfill inicial y para redistribuir un padre.
+
+    Args:
+        count: Cantidad de claves
+
+    Returns:
+        list[str]: Claves en orden ascendente
+    """
+    width = 1
+    while BASE**width < (count + 1) * BASE:
+        width += 1
+    step = BASE**width // (count + 1)
+
+    ranks = []
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
@@ -0,0 +1,65 @@
+"""
+Configuración de réplicas de lectura (ver RoutingSession en src/db.py).
+
+Cada URL de DATABASE_REPLICA_URLS se registra como un bind replica_<n> de
+Flask-SQLAlchemy con las mismas opciones de pool que el primario. Las réplicas
+no tienen tablas propias: create_all y las migraciones solo tocan el primario,
+y la replicación queda a cargo de la base.
+
+Para probarlo en local alcanza con dos bases: por ejemplo dos archivos SQLite,
+copiando el primario sobre la réplica cuando se quiera "replicar".
+"""
+
+import math
+import time
+
+from flask import g
+
+from src.db import (
+    PRIMARY_UNTIL_COOKIE,
+    PRIMARY_UNTIL_HEADER,
+    REPLICA_BIND_PREFIX,
+)
+from src.utils.db_pool import engine_options
+
+
+def replica_binds(config):
+    """
+    Arma los binds de las réplicas para SQLALCHEMY_BINDS.
+
+    Returns:
+        dict: {"replica_<n>": opciones del engine con su url}
+    """
+    return {
+        f"{REPLICA_BIND_PREFIX}{index}": {
+            **engine_options({**config, "SQLALCHEMY_DATABASE_URI": url}),
+            "url": url,
+        }
+        for index, url in enumerate(config["SQLALCHEMY_REPLICA_URIS"])
+    }
+
+
+def _pin_to_primary(response, window):
+    if g.get("db_wrote") and response.status_code < 400:
+        until = f"{time.time() + window:.3f}"
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            until,
+            max_age=math.ceil(window),
+            httponly=True,
+            samesite="Lax",
+        )
+        response.headers[PRIMARY_UNTIL_HEADER] = until
+    return response
+
+
+def init_read_replicas(app):
+    """
+    Registra los binds de las réplicas (antes de db.init_app) y el after_request
+    que fija al primario a los clientes que acaban de escribir.
+    """
+    if not app.config["SQLALCHEMY_REPLICA_URIS"]:
+        return
+    app.config.setdefault("SQLALCHEMY_BINDS", {}).update(replica_binds(app.config))
+    window = app.config["REPLICA_STICKY_SECONDS"]
+    app.after_request(lambda response: _pin_to_primary(response, window))
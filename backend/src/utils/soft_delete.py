@@ -0,0 +1,58 @@
+"""
+Ocultamiento de boards y listas dados de baja.
+
+Borrar un board o una lista solo completa deleted_at; las filas se purgan
+después en segundo plano (ver src/utils/deletions.py). Mientras tanto no deben
+aparecer en ninguna lectura: un listener do_orm_execute agrega el filtro a todo
+SELECT del ORM sobre Board, List y Card, incluidas las queries de permisos y las
+de posiciones de hermanos. Las cards no tienen marca propia: se ocultan las de
+las listas con baja pendiente, que son pocas y están en un índice parcial.
+
+Las lecturas de Core (board_reader, dashboard) no pasan por el ORM y usan
+visible_boards, visible_lists y visible_cards explícitamente. Para ver las filas
+ocultas desde el ORM se ejecuta con execution_options(include_deleted=True).
+"""
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, with_loader_criteria
+
+from src.models import Board, Card, List
+
+
+def visible_boards():
+    """Condición sobre boards.deleted_at para excluir boards dados de baja."""
+    return Board.__table__.c.deleted_at.is_(None)
+
+
+def visible_lists():
+    """Condición sobre lists.deleted_at para excluir listas dadas de baja."""
+    return List.__table__.c.deleted_at.is_(None)
+
+
+def visible_cards():
+    """Condición que excluye las cards de listas dadas de baja."""
+    lists = List.__table__
+    deleted_lists = select(lists.c.id).where(lists.c.deleted_at.is_not(None))
+    return Card.__table__.c.list_id.not_in(deleted_lists)
+
+
+def _filter_deleted(execute_state):
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get("include_deleted", False)
+    ):
+        return
+
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(Board, visible_boards(), include_aliases=True),
+        with_loader_criteria(List, visible_lists(), include_aliases=True),
+        with_loader_criteria(Card, visible_cards(), include_aliases=True),
+    )
+
+
+def init_soft_delete():
+    """Registra el listener que oculta las filas dadas de baja (idempotente)."""
+    if not event.contains(Session, "do_orm_execute", _filter_deleted):
+        event.listen(Session, "do_orm_execute", _filter_deleted)
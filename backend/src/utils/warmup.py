@@ -0,0 +1,62 @@
+"""
+Preparación de los procesos de gunicorn (ver gunicorn.conf.py).
+
+Con preload_app la app se crea una sola vez en el proceso maestro y los workers
+la heredan con el fork, compartiendo esa memoria copy-on-write. Antes del fork
+se configuran los mappers de SQLAlchemy y se congelan los objetos ya creados
+para que el recolector de basura no escriba en esas páginas. Las conexiones a
+la base nunca se heredan: cada worker descarta las del maestro y abre las
+suyas antes de aceptar requests.
+"""
+
+import gc
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from src.db import db
+from src.utils.position_integrity import check_position_constraint
+
+
+def prepare_for_fork(app):
+    """
+    Deja la app lista para compartirla con los workers. Se llama en el maestro,
+    con la app ya creada y antes del primer fork.
+
+    Raises:
+        RuntimeError: Si el esquema no admite POSITION_MODE (ver
+            check_position_constraint)
+    """
+    check_position_constraint(app)
+    configure_mappers()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    gc.collect()
+    gc.freeze()
+
+
+def warm_up_worker(app, connections):
+    """
+    Abre de antemano las conexiones del pool de un worker recién creado, así el
+    primer request no paga la conexión a la base.
+
+    Args:
+        app: La app heredada del maestro
+        connections: Conexiones a abrir por engine (se limita al pool_size)
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            # Las conexiones del maestro son del otro proceso: no cerrarlas
+            engine.dispose(close=False)
+            pool_size = getattr(engine.pool, "size", None)
+            count = min(connections, pool_size()) if pool_size else 1
+            opened = []
+            try:
+                for _ in range(count):
+                    connection = engine.connect()
+                    connection.execute(text("SELECT 1"))
+                    opened.append(connection)
+            finally:
+                for connection in opened:
+                    connection.close()
@@ -54,6 +54,10 @@ interface Card {
   created_at: string
 }
 
+interface ListWithCards extends List {
+  cards: Card[]
+}
+
 interface Column {
   id: number
   title: string
@@ -151,46 +155,29 @@ export default function BoardPage() {
       const token = getAccessToken()
       if (!token) return
 
-      // Obtener todas las listas del board
-      const listsResponse = await fetch(`${API_URL}/boards/${boardId}/lists`, {
-        headers: { Authorization: `Bearer ${token}` },
-      })
-
-      if (!listsResponse.ok) {
-        console.error('Error al cargar listas')
-        return
-      }
-
-      const allLists: List[] = await listsResponse.json()
-
-      // Obtener todas las tarjetas del board
-      const cardsResponse = await fetch(`${API_URL}/boards/${boardId}/cards`, {
-        headers: { Authorization: `Bearer ${token}` },
-      })
+      // Obtener board, listas y tarjetas ordenadas en una sola petición
+      const snapshotResponse = await fetch(
+        `${API_URL}/boards/${boardId}/snapshot`,
+        {
+          headers: { Authorization: `Bearer ${token}` },
+        }
+      )
 
-      if (!cardsResponse.ok) {
-        console.error('Error al cargar tarjetas')
+      if (!snapshotResponse.ok) {
+        console.error('Error al cargar listas y tarjetas')
         return
       }
 
-      const allCards: Card[] = await cardsResponse.json()
-
-      // Crear columnas con todas las listas (incluso las vacías)
-      const columnsWithCards = allLists.map((list) => ({
-        id: list.id,
-        title: list.title,
-        cards: allCards
-          .filter((card) => card.list_id === list.id)
-          .sort((a, b) => a.position - b.position),
-      }))
+      const snapshot: { board: Board; lists: ListWithCards[] } =
+        await snapshotResponse.json()
 
-      // Ordenar columnas por posición de lista
+      // El backend ya devuelve listas y tarjetas ordenadas por posición
       setColumns(
-        columnsWithCards.sort((a, b) => {
-          const aList = allLists.find((l) => l.id === a.id)
-          const bList = allLists.find((l) => l.id === b.id)
-          return (aList?.position || 0) - (bList?.position || 0)
-        })
+        snapshot.lists.map((list) => ({
+          id: list.id,
+          title: list.title,
+          cards: list.cards,
+        }))
       )
     } catch (error) {
       console.error('Error fetching lists and cards:', error)
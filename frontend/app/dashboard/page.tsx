@@ -14,6 +14,8 @@ export default function DashboardPage() {
   const [boards, setBoards] = useState<
     Array<{ id: string; title: string; cardCount: number; description: string }>
   >([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [isModalOpen, setIsModalOpen] = useState(false)
   const [isEditModalOpen, setIsEditModalOpen] = useState(false)
   const [editingBoard, setEditingBoard] = useState<{
@@ -27,14 +29,19 @@ export default function DashboardPage() {
     getCurrentUser().then(setUser)
   }, [])
 
-  const fetchBoards = async () => {
+  // El endpoint pagina (next_cursor): sin cursor se pide la primera página y se
+  // reemplaza la lista; con cursor se agrega la página siguiente
+  const fetchBoards = async (cursor: string | null = null) => {
     try {
       const token = localStorage.getItem('access_token')
       if (!token) {
         console.error('No authentication token found')
         return
       }
-      const API_ENDPOINT = API_URL + '/boards'
+      const API_ENDPOINT =
+        API_URL +
+        '/boards' +
+        (cursor ? `?cursor=${encodeURIComponent(cursor)}` : '')
       const response = await fetch(API_ENDPOINT, {
         method: 'GET',
         headers: {
@@ -47,12 +54,24 @@ export default function DashboardPage() {
       }
 
       const data = await response.json()
-      setBoards(data)
+      const page = data.boards.map((board: { card_count: number }) => ({
+        ...board,
+        cardCount: board.card_count,
+      }))
+      setBoards((current) => (cursor ? [...current, ...page] : page))
+      setNextCursor(data.next_cursor ?? null)
     } catch (error) {
       console.error('Error fetching boards:', error)
     }
   }
 
+  const handleLoadMore = async () => {
+    if (!nextCursor || isLoadingMore) return
+    setIsLoadingMore(true)
+    await fetchBoards(nextCursor)
+    setIsLoadingMore(false)
+  }
+
   useEffect(() => {
     fetchBoards()
   }, [])
@@ -163,6 +182,18 @@ export default function DashboardPage() {
               <p className="text-slate-700 font-medium">Create new board</p>
             </button>
           </div>
+
+          {nextCursor && (
+            <div className="mt-8 max-w-6xl flex justify-center">
+              <button
+                onClick={handleLoadMore}
+                disabled={isLoadingMore}
+                className="px-4 py-2 bg-slate-700 text-white rounded-lg hover:bg-slate-800 transition-colors text-sm font-medium disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                {isLoadingMore ? 'Loading...' : 'Load more boards'}
+              </button>
+            </div>
+          )}
         </main>
 
         {/* Create Board Modal */}